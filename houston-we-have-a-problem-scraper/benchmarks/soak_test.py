@@ -0,0 +1,284 @@
+"""
+Load generator and soak test for ErrorHandler.ingest.
+
+Builds a handler from settings.json (archive, rollups and other paths moved
+into --dir; email and webhook replaced by local stub notifiers that take
+--alert-ms per send, so the alert path is exercised without a network) and
+feeds it seeded synthetic events for --duration seconds:
+
+  --rate 0             as fast as possible (closed loop)
+  --rate N             N events/s; latency is the time ingest() took
+  --rate N --open-loop N events/s on a fixed schedule; latency runs from
+                       each event's scheduled time, so time spent queued
+                       behind slow calls counts (no coordinated omission)
+
+Every --interval seconds it prints throughput, p50/p95/p99/max ingest
+latency, read_recent and generate_reports latency, RSS and archive size,
+so growth over a long run shows up as a trend. --preload-rows grows the
+archive first (in batches) to see how a large history behaves.
+
+    python benchmarks/soak_test.py --duration 600 --rate 2000 --open-loop --json soak.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import src.main as houston  # noqa: E402
+from src.logger.formatter import normalize_many  # noqa: E402
+
+SEVERITIES = (("info", 60), ("warning", 25), ("error", 12), ("critical", 3))
+ERROR_TYPES = ["TimeoutError", "ConnectionResetError", "KeyError", "ValueError", "DiskFullError", "AuthError"]
+MESSAGES = [
+    "Timeout after {n} ms calling payments-{k}",
+    "Connection reset by peer 10.0.{k}.{n}",
+    "Missing key 'user_{n}' in session cache",
+    "Invalid value {n} for field quantity",
+    "Disk usage {n}% on /var/lib/node-{k}",
+    "Token expired for account {n}",
+]
+
+class StubNotifier:
+    """Stands in for EmailNotifier and WebhookNotifier: formats the payload, waits `delay` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.sent = 0
+
+    def send(self, subject: str, body: str) -> bool:
+        return self._deliver(subject + body)
+
+    def post(self, payload: Dict[str, Any]) -> bool:
+        return self._deliver(json.dumps(payload, default=str))
+
+    def _deliver(self, text: str) -> bool:
+        if self.delay:
+            time.sleep(self.delay)
+        self.sent += 1
+        return bool(text)
+
+class EventFactory:
+    """Seeded synthetic events with realistic repetition (shared types, templates and traces)."""
+
+    def __init__(self, seed: int, sources: int = 50) -> None:
+        self.rng = random.Random(seed)
+        self.severities = [s for s, _ in SEVERITIES]
+        self.weights = [w for _, w in SEVERITIES]
+        self.sources = [(f"app/module_{i}.py", self.rng.randint(1, 900)) for i in range(sources)]
+        self.traces = [
+            "Traceback (most recent call last):\n"
+            + "".join(f'  File "app/module_{self.rng.randrange(sources)}.py", line {self.rng.randint(1, 900)}, in handler\n' for _ in range(12))
+            + f"{t}: see above"
+            for t in ERROR_TYPES
+        ]
+
+    def make(self) -> Dict[str, Any]:
+        rng = self.rng
+        kind = rng.randrange(len(ERROR_TYPES))
+        source, line = self.sources[rng.randrange(len(self.sources))]
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "severity": rng.choices(self.severities, self.weights)[0],
+            "errorType": ERROR_TYPES[kind],
+            "message": MESSAGES[kind].format(n=rng.randint(0, 99999), k=rng.randint(0, 9)),
+            "sourceFile": source,
+            "lineNumber": line,
+            "environment": rng.choice(("prod", "staging")),
+            "device": f"node-{rng.randint(1, 20)}",
+            "resolved": False,
+            "stackTrace": self.traces[kind] if rng.random() < 0.7 else "",
+        }
+
+class LatencyLog:
+    """Latencies in log-spaced buckets (~2% wide), so hours of samples take constant memory."""
+
+    GROWTH = math.log(1.02)
+
+    def __init__(self) -> None:
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        key = int(math.log(max(seconds, 1e-7)) / self.GROWTH)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= target:
+                return math.exp((key + 0.5) * self.GROWTH)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "p50_ms": round(self.percentile(0.50) * 1000, 4),
+            "p95_ms": round(self.percentile(0.95) * 1000, 4),
+            "p99_ms": round(self.percentile(0.99) * 1000, 4),
+            "max_ms": round(self.max * 1000, 4),
+        }
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def soak_config(base: Dict[str, Any], work_dir: Path, jsonl: bool) -> Dict[str, Any]:
+    cfg = json.loads(json.dumps(base))
+    cfg["archive_csv"] = str(work_dir / "error_history.csv")
+    cfg["jsonl_path"] = str(work_dir / "errors.jsonl") if jsonl else None
+    cfg["ingest_manifest"] = None
+    cfg.setdefault("rollups", {})["path"] = str(work_dir / "rollups.json")
+    cfg.setdefault("trace_store", {})["path"] = str(work_dir / "traces.pack")
+    cfg.setdefault("report", {})["trend_csv"] = str(work_dir / "daily_trends.csv")
+    cfg.setdefault("metrics", {}).update(enabled=False, dump_json=None)
+    cfg.setdefault("email", {})["enabled"] = False
+    cfg.setdefault("webhook", {})["enabled"] = False
+    return cfg
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=str(ROOT_DIR / "src" / "config" / "settings.json"))
+    parser.add_argument("--dir", default=None, help="Work directory (default: a temporary one, removed afterwards)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--rate", type=float, default=0.0, help="Target events/s (0 = as fast as possible)")
+    parser.add_argument("--open-loop", action="store_true", help="Measure latency from each event's scheduled time")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between progress samples")
+    parser.add_argument("--preload-rows", type=int, default=0, help="Rows written to the archive before the run")
+    parser.add_argument("--recent", type=int, default=200, help="read_recent(limit) measured each interval")
+    parser.add_argument("--no-reports", action="store_true", help="Skip timing generate_reports each interval")
+    parser.add_argument("--alert-ms", type=float, default=0.0, help="Simulated notifier latency per send")
+    parser.add_argument("--jsonl", action="store_true", help="Also write the JSONL event log")
+    parser.add_argument("--json", default=None, help="Write samples and the final summary to this file")
+    args = parser.parse_args()
+    if args.open_loop and args.rate <= 0:
+        parser.error("--open-loop needs --rate")
+
+    with contextlib.ExitStack() as stack:
+        work_dir = Path(args.dir) if args.dir else Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        work_dir.mkdir(parents=True, exist_ok=True)
+        cfg = soak_config(houston.load_settings(Path(args.config)), work_dir, args.jsonl)
+        handler = houston.build_handler(cfg)
+        notifier = StubNotifier(args.alert_ms / 1000)
+        handler.email_notifier = handler.webhook_notifier = notifier
+        storage = handler.storage
+        factory = EventFactory(args.seed)
+
+        if args.preload_rows:
+            started = time.perf_counter()
+            for i in range(0, args.preload_rows, 10000):
+                storage.write_many(
+                    normalize_many(factory.make() for _ in range(min(10000, args.preload_rows - i)))
+                )
+            handler.flush()
+            print(f"Preloaded {args.preload_rows} rows in {time.perf_counter() - started:.1f}s")
+
+        samples: List[Dict[str, Any]] = []
+        total, window = LatencyLog(), LatencyLog()
+        rss_start = rss_bytes()
+        size_start = storage.archive_path.stat().st_size if storage.archive_path.exists() else 0
+        print(f"{'t(s)':>7} {'events':>10} {'ev/s':>9} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'maxms':>8} "
+              f"{'recentms':>9} {'reportms':>9} {'rssMB':>8} {'archiveMB':>10}")
+
+        start = time.perf_counter()
+        next_sample = start + args.interval
+        window_start, window_events, sent = start, 0, 0
+        # Time spent taking samples is not load: excluded from the schedule and the totals.
+        paused = 0.0
+        period = 1.0 / args.rate if args.rate > 0 else 0.0
+        while True:
+            now = time.perf_counter()
+            if now - start - paused >= args.duration:
+                break
+            scheduled = start + paused + sent * period
+            if period and scheduled > now:
+                time.sleep(scheduled - now)
+            event = factory.make()
+            began = time.perf_counter()
+            handler.ingest(event)
+            done = time.perf_counter()
+            latency = done - (scheduled if args.open_loop else began)
+            total.add(latency)
+            window.add(latency)
+            sent += 1
+            window_events += 1
+
+            if done >= next_sample:
+                storage.flush()
+                t0 = time.perf_counter()
+                storage.read_recent(limit=args.recent)
+                recent_s = time.perf_counter() - t0
+                report_s = 0.0
+                if not args.no_reports:
+                    t0 = time.perf_counter()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        houston.generate_reports(cfg, storage)
+                    report_s = time.perf_counter() - t0
+                sample = {
+                    "t": round(done - start, 3),
+                    "events": sent,
+                    "events_per_s": round(window_events / (done - window_start), 1),
+                    **window.summary(),
+                    "read_recent_ms": round(recent_s * 1000, 3),
+                    "report_ms": round(report_s * 1000, 3),
+                    "rss_bytes": rss_bytes(),
+                    "archive_bytes": storage.archive_path.stat().st_size if storage.archive_path.exists() else 0,
+                }
+                samples.append(sample)
+                print(f"{sample['t']:7.1f} {sent:10d} {sample['events_per_s']:9.0f} {sample['p50_ms']:8.3f} "
+                      f"{sample['p95_ms']:8.3f} {sample['p99_ms']:8.3f} {sample['max_ms']:8.2f} "
+                      f"{sample['read_recent_ms']:9.2f} {sample['report_ms']:9.1f} "
+                      f"{sample['rss_bytes'] / 2**20:8.1f} {sample['archive_bytes'] / 2**20:10.1f}")
+                window = LatencyLog()
+                window_start, window_events = time.perf_counter(), 0
+                paused += window_start - done
+                next_sample = window_start + args.interval
+
+        elapsed = time.perf_counter() - start - paused
+        handler.flush()
+        archive_bytes = storage.archive_path.stat().st_size if storage.archive_path.exists() else 0
+        summary = {
+            "events": sent,
+            "seconds": round(elapsed, 3),
+            "events_per_s": round(sent / elapsed, 1) if elapsed else 0.0,
+            "latency": total.summary(),
+            "alerts_sent": notifier.sent,
+            "rss_growth_bytes": rss_bytes() - rss_start,
+            "archive_growth_bytes": archive_bytes - size_start,
+            "bytes_per_event": round((archive_bytes - size_start) / sent, 1) if sent else 0.0,
+        }
+        print(json.dumps(summary, indent=2))
+        if args.json:
+            Path(args.json).write_text(
+                json.dumps({"args": vars(args), "samples": samples, "summary": summary}, indent=2),
+                encoding="utf-8",
+            )
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""
+Cold-start benchmark for the scraper CLI based on `python -X importtime`.
+
+Runs a fresh interpreter that imports src.main and builds the handler from
+settings.json (what every cron invocation pays before doing any work),
+several times, and reports the median cumulative import time plus the
+modules with the largest self time.
+
+Exits non-zero when the median exceeds --budget-ms or when a module listed
+in --forbid is imported with the given settings, so it can gate CI:
+
+    python benchmarks/startup_importtime.py --budget-ms 60
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import sys
+import src.main as m
+cfg = m.load_settings(m.Path(sys.argv[1]))
+m.build_handler(cfg)
+print("\\n".join(sys.modules))
+"""
+
+DEFAULT_FORBID = ["requests", "smtplib", "email.mime.text", "dateutil", "concurrent.futures"]
+
+def run_once(config: Path) -> tuple[dict[str, tuple[int, int]], set[str]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, str(config)],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times, set(proc.stdout.split())
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=str(ROOT_DIR / "src" / "config" / "settings.json"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBID)
+    args = parser.parse_args()
+
+    totals = []
+    last_times: dict[str, tuple[int, int]] = {}
+    modules: set[str] = set()
+    for _ in range(args.runs):
+        last_times, modules = run_once(Path(args.config))
+        totals.append(last_times.get("src.main", (0, 0))[1] / 1000)
+
+    median_ms = statistics.median(totals)
+    print(f"src.main cumulative import: median {median_ms:.1f} ms over {args.runs} runs (min {min(totals):.1f} ms)")
+    print(f"Top {args.top} modules by self time (last run):")
+    for name, (self_us, cum_us) in sorted(last_times.items(), key=lambda kv: -kv[1][0])[: args.top]:
+        print(f"  {self_us / 1000:8.2f} ms self {cum_us / 1000:8.2f} ms cumulative  {name}")
+
+    failed = False
+    imported = sorted(m for m in args.forbid if m in modules)
+    if imported:
+        print(f"FAIL: imported at startup: {', '.join(imported)}")
+        failed = True
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"FAIL: median {median_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,11 @@
-import smtplib
-from email.mime.text import MIMEText
+import time
 from typing import Optional
 
+from ..utils.metrics import METRICS
+
+_SENT = METRICS.counter("houston_alert_sends_total", "Alert deliveries attempted", ("channel", "outcome"))
+_LATENCY = METRICS.histogram("houston_alert_send_seconds", "Alert delivery latency", ("channel",))
+
 class EmailNotifier:
     def __init__(
         self,
@@ -26,6 +30,22 @@ class EmailNotifier:
     def send(self, subject: str, body: str) -> bool:
         if not self.enabled:
             return False
+        started = time.perf_counter()
+        try:
+            self._send(subject, body)
+        except Exception:
+            _SENT.labels("email", "failed").inc()
+            raise
+        finally:
+            _LATENCY.labels("email").observe(time.perf_counter() - started)
+        _SENT.labels("email", "ok").inc()
+        return True
+
+    def _send(self, subject: str, body: str) -> None:
+        # Imported here so runs with email disabled skip smtplib/email at startup.
+        import smtplib
+        from email.mime.text import MIMEText
+
         msg = MIMEText(body, "plain", "utf-8")
         msg["Subject"] = subject
         msg["From"] = self.from_addr
@@ -41,7 +61,6 @@ class EmailNotifier:
             if self.username and self.password:
                 server.login(self.username, self.password)
             server.sendmail(self.from_addr, [self.to_addr], msg.as_string())
-            return True
         finally:
             try:
                 server.quit()
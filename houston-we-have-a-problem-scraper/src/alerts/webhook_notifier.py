@@ -1,5 +1,10 @@
+import time
 from typing import Any, Dict
-import requests
+
+from ..utils.metrics import METRICS
+
+_SENT = METRICS.counter("houston_alert_sends_total", "Alert deliveries attempted", ("channel", "outcome"))
+_LATENCY = METRICS.histogram("houston_alert_send_seconds", "Alert delivery latency", ("channel",))
 
 class WebhookNotifier:
     def __init__(self, url: str, enabled: bool = False, timeout: int = 8) -> None:
@@ -10,8 +15,15 @@ class WebhookNotifier:
     def post(self, payload: Dict[str, Any]) -> bool:
         if not self.enabled or not self.url:
             return False
+        started = time.perf_counter()
         try:
+            # Imported here so runs with the webhook disabled never load requests.
+            import requests
+
             resp = requests.post(self.url, json=payload, timeout=self.timeout)
-            return 200 <= resp.status_code < 300
+            ok = 200 <= resp.status_code < 300
         except Exception:
-            return False
\ No newline at end of file
+            ok = False
+        _LATENCY.labels("webhook").observe(time.perf_counter() - started)
+        _SENT.labels("webhook", "ok" if ok else "failed").inc()
+        return ok
\ No newline at end of file
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Iterator
+from urllib.parse import urlsplit
+
+from .error_logger import ErrorLogger
+from .fetch_cache import FetchCache
+from .pattern_detector import PatternDetector
+from .validation_rules import ValidationRules
+
+logger = logging.getLogger(__name__)
+
+class BulkChecker:
+    """
+    Fetches many URLs concurrently and runs ValidationRules on each page.
+
+    At most `concurrency` fetches run at once and at most `per_host` of
+    them against any one host. URLs waiting on a busy host do not hold a
+    worker: they stay queued while other hosts are served. All fetches go
+    through one requests.Session whose connection pool keeps up to
+    `per_host` keep-alive connections per host. Input URLs are read lazily
+    (at most `concurrency * 4` queued ahead), and results are yielded,
+    logged and validated in completion order, so thousands of URLs never
+    have to be held in memory at once.
+
+    With a FetchCache (passed in, or built from settings "fetch_cache":
+    {"path", "max_entries"}), requests are conditional and pages that come
+    back 304 or with unchanged content reuse their previous issues instead
+    of being validated again; the cache is saved after each `check`.
+
+    Settings: concurrency (16), per_host (4), timeout (10 s, connect and
+    read), user_agent, fetch_cache, plus the "rules" read by ValidationRules.
+    """
+
+    def __init__(
+        self,
+        settings: Dict[str, Any],
+        rules: ValidationRules | None = None,
+        error_logger: ErrorLogger | None = None,
+        cache: FetchCache | None = None,
+    ) -> None:
+        self.settings = settings
+        self.concurrency = int(settings.get("concurrency", 16))
+        self.per_host = int(settings.get("per_host", 4))
+        self.rules = rules or ValidationRules(settings)
+        self.error_logger = error_logger
+        cache_cfg = settings.get("fetch_cache")
+        if cache is None and cache_cfg:
+            cache = FetchCache(
+                cache_cfg["path"],
+                max_entries=int(cache_cfg.get("max_entries", 10000)),
+                fingerprint=self.rules_fingerprint(self.rules),
+            )
+        self.cache = cache
+        self.stats = Counter()
+
+    @staticmethod
+    def rules_fingerprint(rules: ValidationRules) -> str:
+        """Hash of the rule settings, so cached issues are dropped when rules change."""
+        return hashlib.sha256(json.dumps(rules.rules, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _session(self):
+        import requests  # deferred: only needed when pages are fetched
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.per_host)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _fetch(
+        detector: PatternDetector,
+        url: str,
+        validators: Dict[str, str] | None,
+        needs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            data = detector.fetch_data(url, validators, needs)
+            error = None
+        except Exception as e:
+            data, error = None, f"{type(e).__name__}: {e}"
+        return {"url": url, "data": data, "error": error, "cached": False, "elapsed": time.perf_counter() - started}
+
+    def _finish(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        url = result["url"]
+        if result["error"] is not None:
+            self.stats["failed"] += 1
+            result["issues"] = []
+            if self.error_logger is not None:
+                self.error_logger.log_error(url, result["error"])
+            return result
+        self.stats["fetched"] += 1
+        page = result["data"]
+        issues = self.cache.reuse(url, page) if self.cache is not None else None
+        if issues is not None:
+            now = int(time.time())
+            issues = [dict(issue, timestamp=now) for issue in issues]
+            result["cached"] = True
+        elif page.get("status") == 304:
+            # Not modified, but the cached page is gone (evicted): fetch again next pass.
+            self.stats["failed"] += 1
+            result["error"] = "304 Not Modified without a cached result"
+            result["issues"] = []
+            return result
+        else:
+            issues = self.rules.check(page)
+            if self.cache is not None:
+                self.cache.store(url, page, issues)
+        self.stats["issues"] += len(issues)
+        if self.error_logger is not None:
+            for issue in issues:
+                self.error_logger.log_issue(url, issue)
+        result["issues"] = issues
+        return result
+
+    def check(self, urls: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield {"url", "data", "error", "issues", "cached", "elapsed"} per URL
+        as fetches complete (not in input order).
+        """
+        source = iter(urls)
+        exhausted = False
+        queued: Dict[str, Deque[str]] = defaultdict(deque)
+        queued_total = 0
+        active: Counter = Counter()
+        in_flight: Dict[Future, str] = {}
+        lookahead = self.concurrency * 4
+
+        session = self._session()
+        detector = PatternDetector(self.settings, session=session)
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="houston-fetch") as pool:
+                while True:
+                    while not exhausted and queued_total < lookahead:
+                        url = next(source, None)
+                        if url is None:
+                            exhausted = True
+                            break
+                        queued[urlsplit(url).netloc.lower()].append(url)
+                        queued_total += 1
+
+                    # Start fetches, round-robin over hosts that have capacity left.
+                    progress = True
+                    while progress and len(in_flight) < self.concurrency:
+                        progress = False
+                        for host in list(queued):
+                            if len(in_flight) >= self.concurrency:
+                                break
+                            if active[host] >= self.per_host:
+                                continue
+                            url = queued[host].popleft()
+                            if not queued[host]:
+                                del queued[host]
+                            queued_total -= 1
+                            active[host] += 1
+                            validators = self.cache.validators(url) if self.cache is not None else None
+                            in_flight[pool.submit(self._fetch, detector, url, validators, self.rules.needs)] = host
+                            progress = True
+
+                    if not in_flight:
+                        if exhausted and not queued_total:
+                            break
+                        continue
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        active[in_flight.pop(future)] -= 1
+                        yield self._finish(future.result())
+        finally:
+            session.close()
+            if self.cache is not None:
+                self.cache.save()
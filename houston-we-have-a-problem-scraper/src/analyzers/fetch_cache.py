@@ -0,0 +1,86 @@
+import json
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..utils.file_utils import atomic_write, read_json
+
+class FetchCache:
+    """
+    Persistent per-URL record of the last successful page check:
+    {etag, lastModified, sha256, issues}.
+
+    - `validators(url)` gives the If-None-Match / If-Modified-Since headers
+      for a conditional request;
+    - `reuse(url, page)` returns the stored issues when the server answered
+      304 or the page content hashes the same as last time, so
+      ValidationRules.check can be skipped; otherwise None;
+    - `store(url, page, issues)` records a fresh check.
+
+    At most `max_entries` URLs are kept; the least recently used are evicted
+    first. `fingerprint` identifies the rules the issues were computed with:
+    a cache saved under different rules is discarded on load.
+    `stats` counts requests, not_modified, hash_hits, misses and evictions.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 10000, fingerprint: str = "") -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats = Counter()
+        if self.path.exists():
+            data = read_json(self.path)
+            if data.get("fingerprint") == fingerprint:
+                self.entries.update(data.get("entries", {}))
+
+    def validators(self, url: str) -> Dict[str, str]:
+        entry = self.entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("lastModified"):
+                headers["If-Modified-Since"] = entry["lastModified"]
+        return headers
+
+    def reuse(self, url: str, page: Dict[str, Any]) -> List[Dict[str, Any]] | None:
+        self.stats["requests"] += 1
+        entry = self.entries.get(url)
+        if entry is not None:
+            if page.get("status") == 304:
+                self.stats["not_modified"] += 1
+            elif page.get("sha256") == entry["sha256"]:
+                self.stats["hash_hits"] += 1
+                # Keep the newest validators for the next conditional request.
+                entry["etag"] = page.get("etag")
+                entry["lastModified"] = page.get("lastModified")
+            else:
+                entry = None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.entries.move_to_end(url)
+        return entry["issues"]
+
+    def store(self, url: str, page: Dict[str, Any], issues: List[Dict[str, Any]]) -> None:
+        self.entries[url] = {
+            "etag": page.get("etag"),
+            "lastModified": page.get("lastModified"),
+            "sha256": page.get("sha256"),
+            "issues": issues,
+        }
+        self.entries.move_to_end(url)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def hit_rate(self) -> float:
+        hits = self.stats["not_modified"] + self.stats["hash_hits"]
+        return hits / self.stats["requests"] if self.stats["requests"] else 0.0
+
+    def save(self) -> None:
+        atomic_write(
+            self.path,
+            json.dumps({"fingerprint": self.fingerprint, "entries": self.entries}, ensure_ascii=False),
+        )
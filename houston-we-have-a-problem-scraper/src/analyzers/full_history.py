@@ -0,0 +1,220 @@
+import csv
+import io
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ..logger.columnar import ColumnarArchive
+from ..logger.storage import BASE_COLUMNS, CSV_HEADER
+from ..utils.file_utils import atomic_write, read_json
+from ..utils.manifest import tail_sha256
+from .template_miner import TemplateMiner, mask_message
+
+DEFAULT_PARTITION_BYTES = 64 * 1024 * 1024
+CACHE_VERSION = 2
+
+_COLUMNS = ("timestamp", "severity", "errorType", "message", "sourceFile", "lineNumber", "occurrences")
+_INDEX = {name: CSV_HEADER.index(name) for name in _COLUMNS}
+
+def _empty_partial() -> Dict[str, Any]:
+    return {"rows": 0, "severity": {}, "days": {}, "errorType": {}, "source": {}, "messages": {}}
+
+def _accumulate(rows: Iterable[Tuple[str, str, str, str, str, Any, int]]) -> Dict[str, Any]:
+    """
+    One pass over (timestamp, severity, errorType, message, sourceFile,
+    lineNumber, occurrences) rows, counting what severity_breakdown,
+    daily_trends and top_patterns need. Messages are counted by masked text
+    (with the first raw example) so partials from different partitions add
+    up exactly. "rows" is the number of events, deduplicated ones included.
+    """
+    part = _empty_partial()
+    severity, days, types, sources, messages = (
+        part["severity"], part["days"], part["errorType"], part["source"], part["messages"],
+    )
+    n = 0
+    for ts, sev, error_type, message, source_file, line, count in rows:
+        n += count
+        severity[sev] = severity.get(sev, 0) + count
+        day = ts[:10] if len(ts) >= 10 else "unknown"
+        by_sev = days.setdefault(day, {})
+        low = sev.lower()
+        by_sev[low] = by_sev.get(low, 0) + count
+        types[error_type] = types.get(error_type, 0) + count
+        src = f"{source_file}:{line}"
+        sources[src] = sources.get(src, 0) + count
+        key = mask_message(message)
+        seen = messages.get(key)
+        if seen is None:
+            messages[key] = [count, message]
+        else:
+            seen[0] += count
+    part["rows"] = n
+    return part
+
+def _csv_partial(path: str, start: int, end: int) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    idx = [_INDEX[name] for name in _COLUMNS[:-1]]
+    count_at = _INDEX["occurrences"]
+
+    def rows():
+        for row in csv.reader(io.StringIO(data.decode("utf-8"), newline="")):
+            if len(row) < BASE_COLUMNS or row[0] == "timestamp":
+                continue
+            # Rows from before dedup have no occurrences column.
+            count = int(row[count_at] or 1) if len(row) > count_at else 1
+            yield tuple(row[i] for i in idx) + (count,)
+
+    return _accumulate(rows())
+
+def _columnar_partial(path: str, payload: int, header: Dict[str, Any]) -> Dict[str, Any]:
+    cols = ColumnarArchive(Path(path)).read_block(payload, header, _COLUMNS)
+    return _accumulate(zip(*(cols[name] for name in _COLUMNS)))
+
+def _compute(task: Tuple[str, str, int, Any]) -> Dict[str, Any]:
+    kind, path, start, extra = task
+    if kind == "csv":
+        return _csv_partial(path, start, extra)
+    return _columnar_partial(path, start, extra)
+
+def csv_partitions(path: Path, partition_bytes: int = DEFAULT_PARTITION_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split a CSV archive into byte ranges of about `partition_bytes`, each
+    starting on a line boundary. Boundaries depend only on the bytes before
+    them, so every range but the last stays the same as the archive grows.
+    """
+    size = path.stat().st_size
+    bounds = [0]
+    with open(path, "rb") as f:
+        pos = partition_bytes
+        while pos < size:
+            f.seek(pos - 1)
+            skip = 0
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    skip = -1
+                    break
+                nl = chunk.find(b"\n")
+                if nl >= 0:
+                    skip += nl
+                    break
+                skip += len(chunk)
+            if skip < 0:
+                break
+            boundary = pos + skip
+            if boundary >= size:
+                break
+            bounds.append(boundary)
+            pos = boundary + partition_bytes
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+def _plan(path: Path, partition_bytes: int) -> List[Tuple[str, Tuple[str, str, int, Any]]]:
+    """(cache key, task) per partition, oldest first."""
+    plan = []
+    if path.suffix == ".hcol":
+        for payload, header in ColumnarArchive(path).blocks():
+            end = payload + header["payloadBytes"]
+            key = f"hcol:{payload}:{end}:{tail_sha256(path, end)}"
+            plan.append((key, ("hcol", str(path), payload, header)))
+    else:
+        for start, end in csv_partitions(path, partition_bytes):
+            key = f"csv:{start}:{end}:{tail_sha256(path, end)}"
+            plan.append((key, ("csv", str(path), start, end)))
+    return plan
+
+def merge_partials(partials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Add partials together, in order (first message example wins)."""
+    total = _empty_partial()
+    for part in partials:
+        total["rows"] += part["rows"]
+        for field in ("severity", "errorType", "source"):
+            acc = total[field]
+            for k, v in part[field].items():
+                acc[k] = acc.get(k, 0) + v
+        for day, by_sev in part["days"].items():
+            acc = total["days"].setdefault(day, {})
+            for sev, v in by_sev.items():
+                acc[sev] = acc.get(sev, 0) + v
+        for key, (count, example) in part["messages"].items():
+            seen = total["messages"].get(key)
+            if seen is None:
+                total["messages"][key] = [count, example]
+            else:
+                seen[0] += count
+    return total
+
+def summarize(total: Dict[str, Any], top_n: int = 5, miner: TemplateMiner | None = None) -> Dict[str, Any]:
+    """Turn merged partials into severity_breakdown / daily_trends / top_patterns shaped results."""
+    miner = miner or TemplateMiner()
+    for _, (count, example) in total["messages"].items():
+        miner.add(example, count)
+    templates = miner.top(top_n)
+    trends = [
+        {"date": day, "severity": sev, "count": count}
+        for day, by_sev in total["days"].items()
+        for sev, count in by_sev.items()
+    ]
+    trends.sort(key=lambda r: (r["date"], r["severity"]))
+    return {
+        "rows": total["rows"],
+        "severity": dict(total["severity"]),
+        "trends": trends,
+        "patterns": {
+            "errorType": Counter(total["errorType"]).most_common(top_n),
+            "message": [(t["template"], t["count"]) for t in templates],
+            "source": Counter(total["source"]).most_common(top_n),
+            "messageTemplates": templates,
+        },
+    }
+
+def full_history_report(
+    archive_path: Path,
+    cache_path: Path | None = None,
+    workers: int | None = None,
+    partition_bytes: int = DEFAULT_PARTITION_BYTES,
+    top_n: int = 5,
+) -> Dict[str, Any]:
+    """
+    severity_breakdown, daily_trends and top_patterns over the whole archive
+    (CSV or columnar .hcol), computed map-reduce style.
+
+    The archive is split into partitions (line-aligned byte ranges for CSV,
+    blocks for .hcol) whose partial counts are computed in a process pool
+    when workers > 1 and then merged. Partials are cached in `cache_path`
+    keyed by partition range and a hash of its last bytes, so a re-run only
+    recomputes partitions that changed (normally just the newest one).
+    """
+    archive_path = Path(archive_path)
+    if not archive_path.exists():
+        return {**summarize(_empty_partial(), top_n), "partitions": 0, "cached": 0}
+
+    cache: Dict[str, Any] = {}
+    if cache_path is not None and Path(cache_path).exists():
+        data = read_json(cache_path)
+        if data.get("version") == CACHE_VERSION:
+            cache = data.get("partitions", {})
+
+    plan = _plan(archive_path, partition_bytes)
+    missing = [(key, task) for key, task in plan if key not in cache]
+    if workers and workers > 1 and len(missing) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_compute, [task for _, task in missing]))
+    else:
+        computed = [_compute(task) for _, task in missing]
+    fresh = {key: part for (key, _), part in zip(missing, computed)}
+
+    partials = {key: cache.get(key) or fresh[key] for key, _ in plan}
+    if cache_path is not None and fresh:
+        # Only partitions still in the archive are kept.
+        atomic_write(cache_path, json.dumps({"version": CACHE_VERSION, "partitions": partials}, ensure_ascii=False))
+
+    result = summarize(merge_partials(partials[key] for key, _ in plan), top_n)
+    result["partitions"] = len(plan)
+    result["cached"] = len(plan) - len(missing)
+    return result
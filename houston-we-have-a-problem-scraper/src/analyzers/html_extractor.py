@@ -0,0 +1,147 @@
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List
+
+# What a rule can ask the extractor to collect:
+#   "title": True       -> page <title> text
+#   "text": True        -> visible text (script/style/comments dropped)
+#   "meta": {names}     -> <meta name|property|http-equiv=... content=...>
+#   "attrs": {tag: {attribute, ...}} -> one dict per matching element
+#   "text_of": {tags}   -> text inside each matching element
+DEFAULT_NEEDS: Dict[str, Any] = {"title": True, "text": True}
+
+_INVISIBLE = frozenset({"script", "style", "template", "noscript"})
+# Elements whose <title> children are tooltips, not the page title.
+_FOREIGN = frozenset({"svg", "math"})
+_SPACE = re.compile(r"\s+")
+
+def merge_needs(*needs: Dict[str, Any]) -> Dict[str, Any]:
+    """Union of several needs specs."""
+    merged: Dict[str, Any] = {"title": False, "text": False, "meta": set(), "attrs": {}, "text_of": set()}
+    for need in needs:
+        merged["title"] = merged["title"] or bool(need.get("title"))
+        merged["text"] = merged["text"] or bool(need.get("text"))
+        merged["meta"] |= {m.lower() for m in need.get("meta", ())}
+        for tag, attrs in need.get("attrs", {}).items():
+            merged["attrs"].setdefault(tag.lower(), set()).update(a.lower() for a in attrs)
+        merged["text_of"] |= {t.lower() for t in need.get("text_of", ())}
+    return merged
+
+class PageExtractor(HTMLParser):
+    """
+    Single-pass, DOM-free extraction of only what `needs` asks for.
+
+    Feed the page in chunks with `feed()` (or use `extract`), then call
+    `result()`. Memory grows with what is collected, not with the page:
+    unrequested text, tags and attributes are dropped as they stream by.
+    """
+
+    def __init__(self, needs: Dict[str, Any] | None = None) -> None:
+        super().__init__(convert_charrefs=True)
+        self.needs = merge_needs(needs if needs is not None else DEFAULT_NEEDS)
+        self._hidden = 0
+        self._foreign = 0
+        self._in_title = False
+        self._collect_title = False
+        self._title: List[str] | None = None
+        self._text: List[str] = []
+        self.meta: Dict[str, str] = {}
+        self.elements: Dict[str, List[Dict[str, Any]]] = {tag: [] for tag in self.needs["attrs"]}
+        self.text_of: Dict[str, List[str]] = {tag: [] for tag in self.needs["text_of"]}
+        self._open: List[tuple[str, List[str]]] = []
+
+    def _boundary(self) -> None:
+        # Tags separate words; text inside one node may arrive in several chunks.
+        if self.needs["text"] and self._text and self._text[-1] != " ":
+            self._text.append(" ")
+        for _, parts in self._open:
+            parts.append(" ")
+
+    def handle_starttag(self, tag: str, attrs: List[tuple[str, str | None]]) -> None:
+        self._boundary()
+        wanted = self.needs["attrs"].get(tag)
+        if wanted is not None:
+            # Before the _INVISIBLE check: <script src> is an element even
+            # though its text is not page content.
+            values = dict(attrs)
+            element = {a: values.get(a) for a in wanted}
+            element["line"] = self.getpos()[0]
+            self.elements[tag].append(element)
+        if tag in _INVISIBLE:
+            self._hidden += 1
+            return
+        if tag in _FOREIGN:
+            self._foreign += 1
+        if tag == "title":
+            # Title text is never part of the page content; only the first
+            # <title> outside svg/math is the page title.
+            self._in_title = True
+            if self._title is None and not self._foreign:
+                self._title = []
+                self._collect_title = True
+        elif tag == "meta" and self.needs["meta"]:
+            values = dict(attrs)
+            name = (values.get("name") or values.get("property") or values.get("http-equiv") or "").lower()
+            if name and (name in self.needs["meta"] or "*" in self.needs["meta"]):
+                self.meta.setdefault(name, values.get("content") or "")
+        if tag in self.text_of:
+            self._open.append((tag, []))
+
+    def handle_endtag(self, tag: str) -> None:
+        self._boundary()
+        if tag in _INVISIBLE:
+            self._hidden = max(0, self._hidden - 1)
+            return
+        if tag in _FOREIGN:
+            self._foreign = max(0, self._foreign - 1)
+        if tag == "title":
+            self._in_title = False
+            self._collect_title = False
+        if tag in self.text_of:
+            for i in range(len(self._open) - 1, -1, -1):
+                if self._open[i][0] == tag:
+                    _, parts = self._open.pop(i)
+                    self.text_of[tag].append(_SPACE.sub(" ", "".join(parts)).strip())
+                    break
+
+    def handle_data(self, data: str) -> None:
+        if self._hidden:
+            return
+        if self._in_title:
+            if self._collect_title:
+                self._title.append(data)
+            return
+        if self.needs["text"]:
+            self._text.append(data)
+        for _, parts in self._open:
+            parts.append(data)
+
+    def result(self) -> Dict[str, Any]:
+        self.close()
+        for tag, parts in self._open:
+            # Unclosed elements at end of document.
+            self.text_of[tag].append(_SPACE.sub(" ", "".join(parts)).strip())
+        self._open = []
+        out: Dict[str, Any] = {}
+        if self.needs["title"]:
+            title = _SPACE.sub(" ", "".join(self._title)).strip() if self._title is not None else ""
+            out["title"] = title or None
+        if self.needs["text"]:
+            out["content"] = _SPACE.sub(" ", "".join(self._text)).strip()
+        if self.needs["meta"]:
+            out["meta"] = self.meta
+        if self.needs["attrs"]:
+            out["elements"] = self.elements
+        if self.needs["text_of"]:
+            out["text_of"] = self.text_of
+        return out
+
+def extract(chunks: Iterable[str] | str, needs: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Parse a page (a string or an iterable of text chunks) once and return what `needs` asks for."""
+    parser = PageExtractor(needs)
+    if isinstance(chunks, str):
+        parser.feed(chunks)
+    else:
+        for chunk in chunks:
+            parser.feed(chunk)
+    return parser.result()
@@ -1,32 +1,135 @@
+import codecs
+import hashlib
+import json
 from collections import Counter, defaultdict
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List
 
-def top_patterns(events: List[Dict[str, Any]], top_n: int = 5) -> Dict[str, list[tuple[str, int]]]:
+from ..logger.storage import occurrences
+from .html_extractor import DEFAULT_NEEDS, extract, merge_needs
+from .template_miner import TemplateMiner
+
+# Event fields each analyzer reads, so columnar archives decode only these.
+TOP_PATTERNS_COLUMNS = ("errorType", "message", "sourceFile", "lineNumber", "occurrences")
+SEVERITY_COLUMNS = ("severity", "occurrences")
+
+def top_patterns(
+    events: Iterable[Dict[str, Any]],
+    top_n: int = 5,
+    miner: TemplateMiner | None = None,
+) -> Dict[str, list]:
     """
     Return top patterns by:
       - errorType
-      - message (exact)
+      - message (grouped by mined template, so variable IDs/numbers collapse)
       - source (sourceFile:lineNumber)
+    plus "messageTemplates": the top templates with IDs, counts and examples.
+
+    Pass a long-lived `miner` to keep template IDs stable across calls.
+    Deduplicated rows count once per occurrence they stand for.
     """
     by_type = Counter()
-    by_message = Counter()
     by_source = Counter()
+    miner = miner or TemplateMiner()
 
     for e in events:
-        by_type[e.get("errorType", "")] += 1
-        by_message[e.get("message", "")] += 1
+        n = occurrences(e)
+        by_type[e.get("errorType", "")] += n
+        miner.add(str(e.get("message", "")), n)
         src = f"{e.get('sourceFile', '')}:{e.get('lineNumber', '')}"
-        by_source[src] += 1
+        by_source[src] += n
 
+    templates = miner.top(top_n)
     return {
         "errorType": by_type.most_common(top_n),
-        "message": by_message.most_common(top_n),
+        "message": [(t["template"], t["count"]) for t in templates],
         "source": by_source.most_common(top_n),
+        "messageTemplates": templates,
     }
 
-def severity_breakdown(events: List[Dict[str, Any]]) -> Dict[str, int]:
+top_patterns.columns = TOP_PATTERNS_COLUMNS
+
+def severity_breakdown(events: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     counts = defaultdict(int)
     for e in events:
         sev = e.get("severity", "info")
-        counts[sev] += 1
-    return dict(counts)
\ No newline at end of file
+        counts[sev] += occurrences(e)
+    return dict(counts)
+
+severity_breakdown.columns = SEVERITY_COLUMNS
+
+def parse_page(url: str, text: Iterable[str] | str, needs: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Extract, in one parse, the page title, visible text and whatever else
+    `needs` asks for (see html_extractor), in the shape ValidationRules.check
+    expects. `text` may be the whole page or an iterable of chunks.
+    """
+    data = extract(text, merge_needs(DEFAULT_NEEDS, needs or {}))
+    data["url"] = url
+    return data
+
+class PatternDetector:
+    """
+    Fetches a page and returns {"url", "title", "content", "status", "etag",
+    "lastModified", "sha256"}, plus the structural data `needs` asks for
+    (ValidationRules.needs). "sha256" hashes everything extracted, i.e.
+    exactly what ValidationRules looks at.
+
+    Pass a shared requests.Session to reuse pooled keep-alive connections
+    across many fetches (see bulk_checker.BulkChecker); without one each
+    fetch goes through requests.get. Session fetches are streamed into the
+    extractor chunk by chunk, so large pages are never held whole. With
+    `validators` (If-None-Match / If-Modified-Since headers from an earlier
+    fetch) an unchanged page comes back as {"url", "status": 304, ...}
+    without title or content.
+    """
+
+    def __init__(self, settings: Dict[str, Any], session: Any = None) -> None:
+        self.settings = settings
+        self.timeout = settings.get("timeout", 10)
+        self.headers = {"User-Agent": settings.get("user_agent", "houston-scraper/1.0")}
+        self.session = session
+
+    def fetch_data(
+        self,
+        url: str,
+        validators: Dict[str, str] | None = None,
+        needs: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
+        headers = {**self.headers, **validators} if validators else self.headers
+        if self.session is not None:
+            response = self.session.get(url, timeout=self.timeout, headers=headers, stream=True)
+        else:
+            import requests  # deferred: only needed when pages are fetched
+
+            response = requests.get(url, timeout=self.timeout, headers=headers)
+        try:
+            return self._read(url, response, needs)
+        finally:
+            if self.session is not None:
+                response.close()
+
+    @staticmethod
+    def _chunks(response: Any) -> Iterable[str]:
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        except LookupError:
+            # Unknown charset in Content-Type.
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    def _read(self, url: str, response: Any, needs: Dict[str, Any] | None) -> Dict[str, Any]:
+        response.raise_for_status()
+        meta = {
+            "status": response.status_code,
+            "etag": response.headers.get("ETag"),
+            "lastModified": response.headers.get("Last-Modified"),
+        }
+        if response.status_code == 304:
+            return {"url": url, **meta}
+        body = self._chunks(response) if self.session is not None else response.text
+        data = parse_page(url, body, needs)
+        extracted = json.dumps({k: v for k, v in data.items() if k != "url"}, sort_keys=True)
+        data.update(meta, sha256=hashlib.sha256(extracted.encode("utf-8")).hexdigest())
+        return data
@@ -0,0 +1,100 @@
+import re
+from typing import Dict, Iterable, List, Tuple
+
+def _build_trie(words: Iterable[str]) -> dict:
+    root: dict = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return root
+
+def _trie_regex(node: dict) -> str:
+    """
+    Turn a trie into a regex that walks it character by character. A word
+    that is a prefix of another becomes an optional tail, and the greedy
+    optional makes the regex return the longest word starting at a position.
+    """
+    alternatives = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch]
+    if not alternatives:
+        return ""
+    body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+class RuleMatcher:
+    """
+    Matches many forbidden-content rules against a text.
+
+    Literal rules are compiled once into a single case-insensitive trie regex
+    scanned with a lookahead at every offset. That reports the longest literal
+    starting at each offset; shorter literals starting there are necessarily
+    its prefixes and are looked up in a precomputed table. Every occurrence of
+    every literal is therefore found in one pass whose cost depends on the
+    text length, not on the number of literals.
+
+    Regex rules cannot be merged that way without losing overlapping hits, so
+    each is compiled once and searched on its own; keep them to the few rules
+    that really need regex syntax.
+    """
+
+    def __init__(
+        self,
+        literals: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        max_positions: int = 50,
+    ) -> None:
+        self.literals = list(dict.fromkeys(w for w in literals if w))
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self.max_positions = max_positions
+
+        lowered = {w.lower() for w in self.literals}
+        # lowered literal -> every rule literal that is a prefix of it (itself included)
+        self._prefixes: Dict[str, List[str]] = {
+            w: [w[:i] for i in range(1, len(w) + 1) if w[:i] in lowered] for w in lowered
+        }
+        self._by_lower: Dict[str, List[str]] = {}
+        for w in self.literals:
+            self._by_lower.setdefault(w.lower(), []).append(w)
+
+        trie = _trie_regex(_build_trie(lowered)) if lowered else ""
+        self._literal_re = re.compile(f"(?=({trie}))", re.IGNORECASE) if trie else None
+        self._pattern_res = [(p, re.compile(p, re.IGNORECASE)) for p in self.patterns]
+
+    def scan(self, text: str) -> List[Dict[str, object]]:
+        """
+        Return one hit per matching rule, in rule order:
+            {"rule": str, "kind": "literal" | "regex", "count": int,
+             "positions": [(start, end), ...]}  (at most max_positions)
+        """
+        literal_hits: Dict[str, List] = {}
+        if self._literal_re is not None and text:
+            for m in self._literal_re.finditer(text):
+                start = m.start()
+                longest = m.group(1).lower()
+                for w in self._prefixes.get(longest, ()):
+                    hit = literal_hits.get(w)
+                    if hit is None:
+                        hit = literal_hits[w] = [0, []]
+                    hit[0] += 1
+                    if len(hit[1]) < self.max_positions:
+                        hit[1].append((start, start + len(w)))
+
+        results: List[Dict[str, object]] = []
+        for w in self.literals:
+            hit = literal_hits.get(w.lower())
+            if hit:
+                results.append({"rule": w, "kind": "literal", "count": hit[0], "positions": list(hit[1])})
+
+        for p, regex in self._pattern_res:
+            count = 0
+            positions: List[Tuple[int, int]] = []
+            for m in regex.finditer(text):
+                count += 1
+                if len(positions) < self.max_positions:
+                    positions.append(m.span())
+            if count:
+                results.append({"rule": p, "kind": "regex", "count": count, "positions": positions})
+        return results
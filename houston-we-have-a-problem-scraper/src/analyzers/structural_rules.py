@@ -0,0 +1,70 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+# Structural checks over what html_extractor collected. Each entry is
+# (needs, check); check(page, option) returns (message, severity, context)
+# findings, where `option` is the rule's value in the "rules" settings.
+Finding = Tuple[str, str, Dict[str, Any]]
+
+def _missing_meta(page: Dict[str, Any], option: Any) -> List[Finding]:
+    names = option if isinstance(option, list) else ["description"]
+    meta = page.get("meta", {})
+    return [
+        (f"Missing meta tag: {name}", "medium", {"meta": name})
+        for name in names
+        if not meta.get(name.lower(), "").strip()
+    ]
+
+def _h1_count(page: Dict[str, Any], option: Any) -> List[Finding]:
+    limit = option if isinstance(option, int) and not isinstance(option, bool) else 1
+    headings = page.get("text_of", {}).get("h1", [])
+    if not headings:
+        return [("Missing h1 heading", "medium", {"count": 0})]
+    if len(headings) > limit:
+        return [(f"Too many h1 headings: {len(headings)}", "low", {"count": len(headings), "headings": headings[:5]})]
+    return []
+
+def _images_without_alt(page: Dict[str, Any], option: Any) -> List[Finding]:
+    missing = [img for img in page.get("elements", {}).get("img", []) if img.get("alt") is None]
+    if not missing:
+        return []
+    return [(
+        f"Images without alt text: {len(missing)}",
+        "low",
+        {"count": len(missing), "examples": [{"src": i.get("src"), "line": i["line"]} for i in missing[:5]]},
+    )]
+
+_LINKING = {"a": "href", "img": "src", "script": "src", "link": "href", "iframe": "src"}
+
+def _insecure_links(page: Dict[str, Any], option: Any) -> List[Finding]:
+    if not str(page.get("url") or "").startswith("https://"):
+        return []
+    elements = page.get("elements", {})
+    insecure = [
+        {"tag": tag, "target": el[attr], "line": el["line"]}
+        for tag, attr in _LINKING.items()
+        for el in elements.get(tag, [])
+        if (el.get(attr) or "").lower().startswith("http://")
+    ]
+    if not insecure:
+        return []
+    return [(f"Insecure (http://) links on https page: {len(insecure)}", "medium", {"count": len(insecure), "examples": insecure[:5]})]
+
+def _empty_links(page: Dict[str, Any], option: Any) -> List[Finding]:
+    empty = [a for a in page.get("elements", {}).get("a", []) if not (a.get("href") or "").strip() or a["href"].strip() == "#"]
+    if not empty:
+        return []
+    return [(f"Links without a target: {len(empty)}", "low", {"count": len(empty), "lines": [a["line"] for a in empty[:10]]})]
+
+STRUCTURAL_RULES: Dict[str, Tuple[Dict[str, Any], Callable[[Dict[str, Any], Any], List[Finding]]]] = {
+    "required_meta": ({"meta": {"description"}}, _missing_meta),
+    "h1_count": ({"text_of": {"h1"}}, _h1_count),
+    "images_without_alt": ({"attrs": {"img": {"alt", "src"}}}, _images_without_alt),
+    "insecure_links": ({"attrs": {tag: {attr} for tag, attr in _LINKING.items()}}, _insecure_links),
+    "empty_links": ({"attrs": {"a": {"href"}}}, _empty_links),
+}
+
+def rule_needs(name: str, option: Any) -> Dict[str, Any]:
+    needs, _ = STRUCTURAL_RULES[name]
+    if name == "required_meta" and isinstance(option, list):
+        return {"meta": set(option)}
+    return needs
@@ -0,0 +1,139 @@
+import re
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List
+
+WILDCARD = "<*>"
+
+# Variable parts masked before clustering; order matters (UUIDs contain hex
+# and digits, IPs contain numbers).
+_MASKS = re.compile(
+    r"""
+    (?P<UUID>\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b)
+    |(?P<IP>\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b)
+    |(?P<HEX>\b0[xX][0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b)
+    |(?P<NUM>(?<![A-Za-z_\d])-?\d+(?:\.\d+)?)
+    """,
+    re.VERBOSE,
+)
+
+def mask_message(message: str) -> str:
+    """Replace numbers, IPs, hex strings and UUIDs with <NUM>, <IP>, <HEX>, <UUID>."""
+    return _MASKS.sub(lambda m: f"<{m.lastgroup}>", message)
+
+class _Cluster:
+    __slots__ = ("id", "tokens", "count", "examples", "leaf")
+
+    def __init__(self, cluster_id: int, tokens: List[str], leaf: List["_Cluster"], max_examples: int) -> None:
+        self.id = cluster_id
+        self.tokens = tokens
+        self.count = 0
+        self.examples: Deque[str] = deque(maxlen=max_examples)
+        self.leaf = leaf
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+class TemplateMiner:
+    """
+    Online log-template miner after Drain (He et al., ICWS 2017).
+
+    Messages are masked, tokenized on whitespace and routed through a
+    fixed-depth prefix tree (token count, then the first `depth - 2` tokens)
+    to a short list of candidate clusters. The message joins the most
+    similar cluster if at least `sim_threshold` of its tokens match, turning
+    differing positions into <*>; otherwise it starts a new cluster. Lookup
+    cost is bounded by the tree depth and the leaf size, not by how many
+    messages were seen.
+
+    Memory is bounded: at most `max_clusters` templates are kept (least
+    recently matched evicted first), each with a count and the last
+    `max_examples` raw messages.
+    """
+
+    def __init__(
+        self,
+        depth: int = 4,
+        sim_threshold: float = 0.4,
+        max_children: int = 100,
+        max_clusters: int = 1000,
+        max_examples: int = 3,
+    ) -> None:
+        self.depth = max(depth, 3)
+        self.sim_threshold = sim_threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.max_examples = max_examples
+        self._root: Dict[int, Dict[str, Any]] = {}
+        self._clusters: "OrderedDict[int, _Cluster]" = OrderedDict()
+        self._next_id = 1
+
+    def _leaf(self, tokens: List[str]) -> List[_Cluster]:
+        node = self._root.setdefault(len(tokens), {"children": {}, "clusters": []})
+        for token in tokens[: self.depth - 2]:
+            children = node["children"]
+            if token not in children:
+                if any(ch.isdigit() for ch in token) or len(children) >= self.max_children:
+                    token = WILDCARD
+                if token not in children:
+                    children[token] = {"children": {}, "clusters": []}
+            node = children[token]
+        return node["clusters"]
+
+    @staticmethod
+    def _similarity(template: List[str], tokens: List[str]) -> tuple[float, int]:
+        if not tokens:
+            return 1.0, 0
+        same = params = 0
+        for t1, t2 in zip(template, tokens):
+            if t1 == WILDCARD:
+                params += 1
+            elif t1 == t2:
+                same += 1
+        return same / len(tokens), params
+
+    def add(self, message: str, count: int = 1) -> int:
+        """
+        Assign `message` to a template and return the template ID. `count`
+        adds that many occurrences at once (for pre-aggregated messages).
+        """
+        tokens = mask_message(message).split()
+        leaf = self._leaf(tokens)
+
+        best = None
+        best_score = (-1.0, -1)
+        for cluster in leaf:
+            score = self._similarity(cluster.tokens, tokens)
+            if score > best_score:
+                best, best_score = cluster, score
+
+        if best is not None and best_score[0] >= self.sim_threshold:
+            best.tokens = [t1 if t1 == t2 else WILDCARD for t1, t2 in zip(best.tokens, tokens)]
+            self._clusters.move_to_end(best.id)
+        else:
+            best = _Cluster(self._next_id, tokens, leaf, self.max_examples)
+            self._next_id += 1
+            leaf.append(best)
+            self._clusters[best.id] = best
+            if len(self._clusters) > self.max_clusters:
+                _, cold = self._clusters.popitem(last=False)
+                cold.leaf.remove(cold)
+
+        best.count += count
+        best.examples.append(message)
+        return best.id
+
+    def template(self, cluster_id: int) -> str | None:
+        cluster = self._clusters.get(cluster_id)
+        return cluster.template if cluster else None
+
+    def top(self, n: int = 5) -> List[Dict[str, Any]]:
+        """Most frequent templates with their counts and example messages."""
+        ranked = sorted(self._clusters.values(), key=lambda c: (-c.count, c.id))[:n]
+        return [
+            {"id": c.id, "template": c.template, "count": c.count, "examples": list(c.examples)}
+            for c in ranked
+        ]
+
+    def __len__(self) -> int:
+        return len(self._clusters)
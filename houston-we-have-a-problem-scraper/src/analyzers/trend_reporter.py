@@ -1,11 +1,16 @@
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List
 from collections import defaultdict
-from ..utils.file_utils import append_csv, ensure_dir
+from ..utils.file_utils import write_csv
+from ..logger.rollups import RollupStore
+from ..logger.storage import occurrences
 
 HEADER = ["date", "severity", "count"]
 
-def daily_trends(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+# Event fields the trend analyzers read, so columnar archives decode only these.
+TREND_COLUMNS = ("timestamp", "severity", "occurrences")
+
+def daily_trends(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Aggregate counts per day and severity.
     Expects event["timestamp"] in ISO 'YYYY-MM-DD...' format.
@@ -15,14 +20,23 @@ def daily_trends(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         ts = str(e.get("timestamp", ""))
         day = ts[:10] if len(ts) >= 10 else "unknown"
         sev = str(e.get("severity", "info")).lower()
-        bucket[(day, sev)] += 1
+        bucket[(day, sev)] += occurrences(e)
     rows = [{"date": k[0], "severity": k[1], "count": v} for k, v in bucket.items()]
     rows.sort(key=lambda r: (r["date"], r["severity"]))
     return rows
 
+daily_trends.columns = TREND_COLUMNS
+
+def rollup_trends(rollups: RollupStore, granularity: str = "day") -> List[Dict[str, Any]]:
+    """
+    Trend rows for the full archived history, read from the incremental
+    rollups ("minute", "hour" or "day") instead of rescanning raw events.
+    """
+    return rollups.rows(granularity)
+
 def write_trend_csv(path: Path, rows: List[Dict[str, Any]]) -> None:
-    ensure_dir(path.parent)
-    append_csv(
+    """Replace the trend CSV with `rows`, so re-running a report never duplicates them."""
+    write_csv(
         path,
         ((r["date"], r["severity"], r["count"]) for r in rows),
         header=HEADER,
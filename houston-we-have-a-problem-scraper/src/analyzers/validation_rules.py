@@ -1,29 +1,65 @@
-import re
 import time
+from .html_extractor import merge_needs
+from .rule_matcher import RuleMatcher
+from .structural_rules import STRUCTURAL_RULES, rule_needs
 
 class ValidationRules:
     def __init__(self, settings):
         self.settings = settings
         self.rules = settings.get("rules", {"missing_title": True, "forbidden_words": ["error", "404", "not found"]})
+        # forbidden_words are matched literally; forbidden_patterns are regexes.
+        self.matcher = RuleMatcher(
+            literals=self.rules.get("forbidden_words", []),
+            patterns=self.rules.get("forbidden_patterns", []),
+        )
+        # Structural rules (see structural_rules.py) enabled in settings.
+        self.structural = {
+            name: option for name, option in self.rules.items()
+            if name in STRUCTURAL_RULES and option not in (False, None)
+        }
+        # What the page extractor has to collect for these rules, in one pass.
+        self.needs = merge_needs(
+            {"title": True, "text": True},
+            *(rule_needs(name, option) for name, option in self.structural.items()),
+        )
 
     def check(self, data):
         issues = []
+        now = int(time.time())
         if self.rules.get("missing_title") and not data.get("title"):
             issues.append({
                 "errorType": "missing_data",
                 "errorMessage": "Missing page title",
-                "timestamp": int(time.time()),
+                "timestamp": now,
                 "severity": "medium",
                 "context": {"url": data.get("url")}
             })
 
-        for word in self.rules.get("forbidden_words", []):
-            if re.search(word, data.get("content", ""), re.IGNORECASE):
+        for hit in self.matcher.scan(data.get("content") or ""):
+            if hit["kind"] == "literal":
+                message = f"Found forbidden word: {hit['rule']}"
+            else:
+                message = f"Found forbidden pattern: {hit['rule']}"
+            issues.append({
+                "errorType": "content_mismatch",
+                "errorMessage": message,
+                "timestamp": now,
+                "severity": "low",
+                "context": {
+                    "url": data.get("url"),
+                    "matches": hit["count"],
+                    "positions": hit["positions"],
+                }
+            })
+
+        for name, option in self.structural.items():
+            _, rule = STRUCTURAL_RULES[name]
+            for message, severity, context in rule(data, option):
                 issues.append({
-                    "errorType": "content_mismatch",
-                    "errorMessage": f"Found forbidden word: {word}",
-                    "timestamp": int(time.time()),
-                    "severity": "low",
-                    "context": {"url": data.get("url")}
+                    "errorType": "structure",
+                    "errorMessage": message,
+                    "timestamp": now,
+                    "severity": severity,
+                    "context": {"url": data.get("url"), "rule": name, **context}
                 })
-        return issues
\ No newline at end of file
+        return issues
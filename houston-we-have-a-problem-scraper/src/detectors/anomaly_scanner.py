@@ -1,9 +1,69 @@
+import json
 import logging
-from collections import Counter
-from typing import Any, Dict, Iterable, List, Tuple
+import math
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+def _key(e: Dict[str, Any]) -> Tuple[str, str]:
+    return str(e.get("errorCode", "")).upper(), str(e.get("source", "unknown"))
+
+def _count_keys(entries: Iterable[Dict[str, Any]]) -> Counter[Tuple[str, str]]:
+    key_counts: Counter[Tuple[str, str]] = Counter()
+    for e in entries:
+        key_counts[_key(e)] += 1
+    return key_counts
+
+def _annotate(
+    entries: Iterable[Dict[str, Any]],
+    key_counts: Counter[Tuple[str, str]],
+    threshold: int,
+    in_place: bool,
+) -> Iterator[Dict[str, Any]]:
+    for e in entries:
+        count = key_counts[_key(e)]
+        entry = e if in_place else dict(e)
+        entry["occurrences"] = count
+        entry["is_anomaly"] = count >= threshold
+        yield entry
+
+def iter_anomalies(
+    entries: Iterable[Dict[str, Any]],
+    threshold: int = 3,
+    in_place: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming counterpart of `scan_anomalies`.
+
+    Occurrence counts need the whole dataset, so this takes two passes while
+    only holding one counter per (errorCode, source) pair:
+
+      - re-iterable inputs (lists, or objects whose __iter__ starts a fresh
+        scan such as re-reading a log file) are simply iterated twice;
+      - one-shot iterators/generators are spilled to a temporary JSON lines
+        file during the counting pass and read back for the second pass.
+
+    With `in_place=True` the fields are written onto the yielded dicts
+    instead of copies.
+    """
+    if iter(entries) is not entries:
+        key_counts = _count_keys(entries)
+        yield from _annotate(entries, key_counts, threshold, in_place)
+        return
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spill:
+        key_counts = Counter()
+        for e in entries:
+            key_counts[_key(e)] += 1
+            spill.write(json.dumps(e, ensure_ascii=False) + "\n")
+        spill.seek(0)
+        # Entries read back from the spill file are fresh dicts we own.
+        yield from _annotate((json.loads(line) for line in spill), key_counts, threshold, True)
+
 def scan_anomalies(
     entries: Iterable[Dict[str, Any]],
     threshold: int = 3,
@@ -19,26 +79,149 @@ def scan_anomalies(
         is_anomaly: bool   - True if occurrences >= threshold
     """
     entries_list = list(entries)
-
-    key_counts: Counter[Tuple[str, str]] = Counter()
-    for e in entries_list:
-        code = str(e.get("errorCode", "")).upper()
-        source = str(e.get("source", "unknown"))
-        key_counts[(code, source)] += 1
-
-    results: List[Dict[str, Any]] = []
-    for e in entries_list:
-        code = str(e.get("errorCode", "")).upper()
-        source = str(e.get("source", "unknown"))
-        count = key_counts[(code, source)]
-        entry = dict(e)
-        entry["occurrences"] = count
-        entry["is_anomaly"] = count >= threshold
-        results.append(entry)
+    key_counts = _count_keys(entries_list)
+    results = list(_annotate(entries_list, key_counts, threshold, False))
 
     logger.debug(
         "Anomaly scan complete: %d entries, %d unique (code, source) pairs",
         len(results),
         len(key_counts),
     )
-    return results
\ No newline at end of file
+    return results
+
+def _event_time(value: Any) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+class WindowedAnomalyDetector:
+    """
+    Single-pass spike detector for live streams.
+
+    Events are counted per key in fixed time buckets of `bucket_seconds`.
+    When a bucket closes its count is folded into the key's exponentially
+    weighted mean and variance, so each key is compared with its own
+    baseline. An event is anomalous when the count of its key in the current
+    bucket reaches `min_count` and exceeds the baseline by more than
+    `z_threshold` standard deviations, once the key has seen `warmup_buckets`
+    buckets.
+
+    State is a few numbers per key, held in an LRU capped at `max_keys`; the
+    coldest keys are evicted first. Keys default to the parse_logs shape
+    (errorCode, source); use ("errorType", "sourceFile") for events going
+    through ErrorHandler.ingest. Events without a usable timestamp are
+    bucketed by arrival time.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: float = 60.0,
+        alpha: float = 0.1,
+        z_threshold: float = 3.0,
+        min_count: int = 5,
+        warmup_buckets: int = 5,
+        max_keys: int = 10000,
+        key_fields: Sequence[str] = ("errorCode", "source"),
+    ) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_count = min_count
+        self.warmup_buckets = warmup_buckets
+        self.max_keys = max_keys
+        self.key_fields = tuple(key_fields)
+        # Zero-count buckets beyond this many barely move the baseline.
+        self._max_gap = int(5 / alpha) + 1 if alpha > 0 else 0
+        # key -> [bucket, count, mean, var, buckets_seen]
+        self._state: "OrderedDict[Tuple[str, ...], List[float]]" = OrderedDict()
+        self.evicted = 0
+
+    def _key(self, entry: Dict[str, Any]) -> Tuple[str, ...]:
+        code_field = self.key_fields[0]
+        return (str(entry.get(code_field, "")).upper(),) + tuple(
+            str(entry.get(f, "unknown")) for f in self.key_fields[1:]
+        )
+
+    def _fold(self, st: List[float], value: float) -> None:
+        diff = value - st[2]
+        st[2] += self.alpha * diff
+        st[3] = (1 - self.alpha) * (st[3] + self.alpha * diff * diff)
+        st[4] += 1
+
+    def _is_spike(self, st: List[float], count: int, std: float) -> bool:
+        return (
+            st[4] >= self.warmup_buckets
+            and count >= self.min_count
+            and (count - st[2]) / std > self.z_threshold
+        )
+
+    def observe(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update state with one event and return its annotations:
+            occurrences   - count of the key in the current bucket
+            is_anomaly    - whether that count is a spike for the key
+            anomalyScore  - z-score of the count against the key's baseline
+            spikeStart    - True only for the event that starts a spike
+        """
+        ts = _event_time(entry.get("timestamp"))
+        bucket = int((ts if ts is not None else time.time()) // self.bucket_seconds)
+        key = self._key(entry)
+
+        st = self._state.get(key)
+        if st is None:
+            st = [bucket, 0, 0.0, 0.0, 0]
+            self._state[key] = st
+            if len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._state.move_to_end(key)
+            if bucket > st[0]:
+                self._fold(st, st[1])
+                for _ in range(min(bucket - st[0] - 1, self._max_gap)):
+                    self._fold(st, 0)
+                st[0], st[1] = bucket, 0
+            # Late events (bucket < st[0]) are counted in the current bucket.
+
+        st[1] += 1
+        count = int(st[1])
+        std = max(math.sqrt(st[3]), math.sqrt(st[2]), 1.0)
+        is_anomaly = self._is_spike(st, count, std)
+        return {
+            "occurrences": count,
+            "is_anomaly": is_anomaly,
+            "anomalyScore": round((count - st[2]) / std, 3),
+            # The baseline is fixed within a bucket, so the score only grows
+            # and the first anomalous event is the one that crossed the line.
+            "spikeStart": is_anomaly and not self._is_spike(st, count - 1, std),
+        }
+
+    def process(self, entry: Dict[str, Any], in_place: bool = False) -> Dict[str, Any]:
+        result = self.observe(entry)
+        out = entry if in_place else dict(entry)
+        out["occurrences"] = result["occurrences"]
+        out["is_anomaly"] = result["is_anomaly"]
+        out["anomalyScore"] = result["anomalyScore"]
+        return out
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+def iter_window_anomalies(
+    entries: Iterable[Dict[str, Any]],
+    detector: WindowedAnomalyDetector | None = None,
+    in_place: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming, time-aware alternative to `iter_anomalies`: annotates each
+    entry with its bucket count ('occurrences'), 'is_anomaly' and
+    'anomalyScore' as it arrives.
+    """
+    detector = detector or WindowedAnomalyDetector()
+    for e in entries:
+        yield detector.process(e, in_place)
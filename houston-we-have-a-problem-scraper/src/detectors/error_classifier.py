@@ -1,5 +1,7 @@
 import logging
-from typing import Any, Dict, Iterable, List, Mapping
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
 
 logger = logging.getLogger(__name__)
 
@@ -16,59 +18,150 @@ DEFAULT_SEVERITY_MAPPING = {
     "TRACE": "low",
 }
 
-def _normalize_severity(
-    level: str,
-    message: str,
-    code: str,
-    mapping: Mapping[str, str],
-) -> str:
-    # Code-based overrides first
-    code_upper = code.upper()
-    if code_upper.startswith("CRIT"):
-        return "critical"
-    if code_upper.startswith("WARN"):
-        return "warning"
-
-    # Explicit mapping based on level
-    if level.upper() in mapping:
-        return mapping[level.upper()]
-
-    # Keyword-based heuristics
-    text = f"{message} {code}".lower()
-    if any(k in text for k in ("timeout", "unreachable", "data loss", "corruption")):
-        return "critical"
-    if any(k in text for k in ("exception", "failed", "failure", "error")):
-        return "error"
-    if any(k in text for k in ("deprecated", "slow", "retry")):
-        return "warning"
-
-    return "info"
+# Keyword heuristics applied to "<message> <code>" when the level is not in
+# the mapping. Earlier severities win when keywords of several severities occur.
+DEFAULT_SEVERITY_KEYWORDS = {
+    "critical": ("timeout", "unreachable", "data loss", "corruption"),
+    "error": ("exception", "failed", "failure", "error"),
+    "warning": ("deprecated", "slow", "retry"),
+}
 
-def classify_errors(
+SEVERITY_PRIORITY = ("critical", "error", "warning", "info", "low")
+
+DEFAULT_CACHE_SIZE = 65536
+
+# Digit runs are masked so "timeout after 30s" and "timeout after 45s" share
+# one cache entry.
+_DIGITS = re.compile(r"\d+")
+
+class SeverityClassifier:
+    """
+    Severity normalization with the keyword heuristics compiled into a single
+    regex and results memoized in a bounded LRU keyed on
+    (level, code, message template).
+
+    `keywords` extends DEFAULT_SEVERITY_KEYWORDS per severity, e.g. the
+    "severity_keywords" section of settings.json.
+    """
+
+    def __init__(
+        self,
+        severity_mapping: Mapping[str, str] | None = None,
+        keywords: Mapping[str, Iterable[str]] | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.mapping = {**DEFAULT_SEVERITY_MAPPING}
+        if severity_mapping:
+            # Allow user overrides
+            for k, v in severity_mapping.items():
+                self.mapping[k.upper()] = v.lower()
+
+        merged: Dict[str, List[str]] = {sev: list(words) for sev, words in DEFAULT_SEVERITY_KEYWORDS.items()}
+        for sev, words in (keywords or {}).items():
+            merged.setdefault(sev.lower(), []).extend(w.lower() for w in words)
+        ranked = sorted(
+            merged,
+            key=lambda s: SEVERITY_PRIORITY.index(s) if s in SEVERITY_PRIORITY else len(SEVERITY_PRIORITY),
+        )
+        self.keywords = {sev: tuple(merged[sev]) for sev in ranked if merged[sev]}
+        self._ranked = tuple(self.keywords)
+        self._pattern = self._compile(self.keywords)
+        # Masking digits is only safe when no keyword can match across them.
+        self._mask_digits = not any(
+            ch.isdigit() or ch == "#" for words in self.keywords.values() for w in words for ch in w
+        )
+        self._classify = lru_cache(maxsize=cache_size)(self._classify_uncached)
+
+    @staticmethod
+    def _compile(keywords: Mapping[str, Iterable[str]]) -> re.Pattern[str] | None:
+        # One group per severity, in priority order. The lookahead makes the
+        # scan report a match at every offset, and at each offset the first
+        # (highest-priority) group that matches, so the best severity over
+        # all matches equals the per-tuple any() checks.
+        groups = []
+        for i, words in enumerate(keywords.values()):
+            alternatives = "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+            groups.append(f"(?P<s{i}>{alternatives})")
+        if not groups:
+            return None
+        return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+    def _match_keywords(self, text: str) -> str:
+        if self._pattern is None:
+            return "info"
+        best = None
+        for m in self._pattern.finditer(text):
+            rank = m.lastindex - 1
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        if best is None:
+            return "info"
+        return self._ranked[best]
+
+    def _classify_uncached(self, level: str, message: str, code: str) -> str:
+        # Code-based overrides first
+        code_upper = code.upper()
+        if code_upper.startswith("CRIT"):
+            return "critical"
+        if code_upper.startswith("WARN"):
+            return "warning"
+
+        # Explicit mapping based on level
+        if level in self.mapping:
+            return self.mapping[level]
+
+        # Keyword-based heuristics
+        return self._match_keywords(f"{message} {code}".lower())
+
+    def classify(self, level: str, message: str, code: str) -> str:
+        if self._mask_digits:
+            message = _DIGITS.sub("#", message)
+        return self._classify(level.upper(), message, code)
+
+    def cache_info(self):
+        return self._classify.cache_info()
+
+def iter_classified(
     entries: Iterable[Dict[str, Any]],
     severity_mapping: Mapping[str, str] | None = None,
-) -> List[Dict[str, Any]]:
+    in_place: bool = False,
+    keywords: Mapping[str, Iterable[str]] | None = None,
+    classifier: SeverityClassifier | None = None,
+) -> Iterator[Dict[str, Any]]:
     """
-    Classify severity of parsed log entries.
+    Streaming counterpart of `classify_errors`.
 
-    Adds/overwrites the 'severity' field on each entry with normalized values:
-        info, low, warning, error, critical
+    With `in_place=True` the 'severity' field is written onto the incoming
+    dicts instead of copies, for callers that own the entries. A prebuilt
+    `classifier` can be passed to share its cache across calls.
     """
-    mapping = {**DEFAULT_SEVERITY_MAPPING}
-    if severity_mapping:
-        # Allow user overrides
-        for k, v in severity_mapping.items():
-            mapping[k.upper()] = v.lower()
-
-    results: List[Dict[str, Any]] = []
+    if classifier is None:
+        classifier = SeverityClassifier(severity_mapping, keywords)
+    classify = classifier.classify
     for entry in entries:
         level = entry.get("rawLevel") or entry.get("severity") or "INFO"
         message = entry.get("errorMessage", "")
         code = entry.get("errorCode", "")
-        severity = _normalize_severity(level, message, code, mapping)
-        new_entry = dict(entry)
-        new_entry["severity"] = severity
-        results.append(new_entry)
+        new_entry = entry if in_place else dict(entry)
+        new_entry["severity"] = classify(level, message, code)
+        yield new_entry
 
+def classify_errors(
+    entries: Iterable[Dict[str, Any]],
+    severity_mapping: Mapping[str, str] | None = None,
+    in_place: bool = False,
+    keywords: Mapping[str, Iterable[str]] | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Classify severity of parsed log entries.
+
+    Adds/overwrites the 'severity' field on each entry with normalized values:
+        info, low, warning, error, critical
+
+    With `in_place=True` the entries are updated and returned without copying.
+    """
+    results = list(iter_classified(entries, severity_mapping, in_place, keywords))
     logger.debug("Classified %d entries", len(results))
-    return results
\ No newline at end of file
+    return results
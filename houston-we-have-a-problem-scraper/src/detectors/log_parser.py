@@ -1,10 +1,17 @@
+import io
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Files smaller than this are parsed serially even when workers are requested;
+# larger ones are split into chunks of roughly this many bytes.
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+
 LOG_PATTERN = re.compile(
     r"""
     ^\[
@@ -34,7 +41,118 @@ def _parse_timestamp(value: str) -> str:
             continue
     return value.strip()
 
-def parse_logs(file_path: str) -> List[Dict[str, Any]]:
+def _iter_entries(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse raw lines lazily, numbering them from 1."""
+    for line_number, raw_line in enumerate(lines, start=1):
+        line = raw_line.rstrip("\n")
+        if not line.strip():
+            continue
+
+        # LOG_PATTERN is anchored on "[", so anything else can skip the regex.
+        match = LOG_PATTERN.match(line) if line[0] == "[" else None
+        if not match:
+            logger.debug("Unrecognized log format at line %d: %s", line_number, line)
+            # Treat as generic info entry
+            yield {
+                "errorMessage": line.strip(),
+                "errorCode": "GENERIC",
+                "timestamp": "",
+                "source": "unknown",
+                "severity": "info",
+                "context": "",
+                "rawLevel": "INFO",
+                "rawLine": line,
+                "lineNumber": line_number,
+            }
+            continue
+
+        groups = match.groupdict()
+        timestamp = _parse_timestamp(groups["timestamp"])
+        level = groups["level"].upper()
+        source = groups["source"].strip()
+        code = groups["code"].strip()
+        message = (groups["message"] or "").strip()
+        context = (groups.get("context") or "").strip()
+
+        entry: Dict[str, Any] = {
+            "errorMessage": message,
+            "errorCode": code,
+            "timestamp": timestamp,
+            "source": source,
+            "severity": level.lower(),  # initial "severity" used by classifier
+            "context": context,
+            "rawLevel": level,
+            "rawLine": line,
+            "lineNumber": line_number,
+        }
+        yield entry
+
+def _chunk_boundaries(file_path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into (start, end) byte ranges that end on a newline, so no
+    line is shared between two chunks.
+    """
+    size = os.path.getsize(file_path)
+    bounds: List[Tuple[int, int]] = []
+    with open(file_path, "rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = min(f.tell(), size)
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+def _parse_chunk(file_path: str, start: int, end: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Parse one byte range of a log file in a worker process.
+
+    Line numbers in the returned entries are relative to the chunk (starting
+    at 1); the second element is the number of lines in the chunk so the
+    caller can shift later chunks into absolute numbering.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # TextIOWrapper applies the same universal-newline splitting as open(..., "r")
+    lines = list(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"))
+    return list(_iter_entries(lines)), len(lines)
+
+def _parse_logs_parallel(file_path: str, workers: int, chunk_size: int) -> List[Dict[str, Any]]:
+    bounds = _chunk_boundaries(file_path, chunk_size)
+    if len(bounds) <= 1:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return list(_iter_entries(f))
+
+    entries: List[Dict[str, Any]] = []
+    line_offset = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+        results = pool.map(
+            _parse_chunk,
+            [file_path] * len(bounds),
+            [b[0] for b in bounds],
+            [b[1] for b in bounds],
+        )
+        # map() yields in submission order, so chunks are merged in file order.
+        for chunk_entries, line_count in results:
+            if line_offset:
+                for entry in chunk_entries:
+                    entry["lineNumber"] += line_offset
+            entries.extend(chunk_entries)
+            line_offset += line_count
+    logger.debug("Parsed %s in %d chunks across %d workers", file_path, len(bounds), workers)
+    return entries
+
+def parse_logs(
+    file_path: str,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
     """
     Parse a log file into structured entries.
 
@@ -44,55 +162,16 @@ def parse_logs(file_path: str) -> List[Dict[str, Any]]:
 
     Returns a list of dictionaries with fields:
         errorMessage, errorCode, timestamp, source, severity, context, rawLevel, rawLine
-    """
-    entries: List[Dict[str, Any]] = []
 
+    When `workers` is greater than 1, the file is split at line boundaries into
+    chunks of about `chunk_size` bytes that are parsed in a process pool. The
+    result is identical to a serial parse, including `lineNumber`.
+    """
     try:
+        if workers and workers > 1:
+            return _parse_logs_parallel(file_path, workers, chunk_size)
         with open(file_path, "r", encoding="utf-8") as f:
-            for line_number, raw_line in enumerate(f, start=1):
-                line = raw_line.rstrip("\n")
-                if not line.strip():
-                    continue
-
-                match = LOG_PATTERN.match(line)
-                if not match:
-                    logger.debug("Unrecognized log format at line %d: %s", line_number, line)
-                    # Treat as generic info entry
-                    entries.append(
-                        {
-                            "errorMessage": line.strip(),
-                            "errorCode": "GENERIC",
-                            "timestamp": "",
-                            "source": "unknown",
-                            "severity": "info",
-                            "context": "",
-                            "rawLevel": "INFO",
-                            "rawLine": line,
-                            "lineNumber": line_number,
-                        }
-                    )
-                    continue
-
-                groups = match.groupdict()
-                timestamp = _parse_timestamp(groups["timestamp"])
-                level = groups["level"].upper()
-                source = groups["source"].strip()
-                code = groups["code"].strip()
-                message = (groups["message"] or "").strip()
-                context = (groups.get("context") or "").strip()
-
-                entry: Dict[str, Any] = {
-                    "errorMessage": message,
-                    "errorCode": code,
-                    "timestamp": timestamp,
-                    "source": source,
-                    "severity": level.lower(),  # initial "severity" used by classifier
-                    "context": context,
-                    "rawLevel": level,
-                    "rawLine": line,
-                    "lineNumber": line_number,
-                }
-                entries.append(entry)
+            return list(_iter_entries(f))
 
     except FileNotFoundError:
         logger.error("Log file not found: %s", file_path)
@@ -101,4 +180,18 @@ def parse_logs(file_path: str) -> List[Dict[str, Any]]:
         logger.error("Error reading log file %s: %s", file_path, e)
         raise
 
-    return entries
\ No newline at end of file
+def iter_logs(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming counterpart of `parse_logs`: yields one entry at a time while
+    reading, so memory does not grow with the size of the file.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            yield from _iter_entries(f)
+
+    except FileNotFoundError:
+        logger.error("Log file not found: %s", file_path)
+        raise
+    except OSError as e:
+        logger.error("Error reading log file %s: %s", file_path, e)
+        raise
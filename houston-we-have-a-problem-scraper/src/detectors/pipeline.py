@@ -0,0 +1,95 @@
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from .anomaly_scanner import iter_anomalies
+from .error_classifier import SeverityClassifier, iter_classified
+from .log_parser import iter_logs
+from ..outputs.issue_exporter import IssueExporter
+from ..outputs.report_generator import generate_report
+
+logger = logging.getLogger(__name__)
+
+class Rescan:
+    """
+    Re-iterable view over a stream factory: every iteration calls `factory`
+    again, e.g. to re-read a log file instead of keeping its entries around.
+    """
+
+    def __init__(self, factory: Callable[[], Iterable[Dict[str, Any]]]) -> None:
+        self.factory = factory
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.factory())
+
+def detection_stream(
+    log_path: str,
+    severity_mapping: Mapping[str, str] | None = None,
+    anomaly_threshold: int = 3,
+    spill: bool = False,
+    severity_keywords: Mapping[str, List[str]] | None = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fused parse_logs -> classify_errors -> scan_anomalies stream.
+
+    Entries are created by the parser and mutated in place by each stage, so
+    no stage copies them. The anomaly stage needs global counts: by default
+    the log file is parsed twice (once to count, once to annotate); with
+    `spill=True` it is parsed once and spilled to a temporary file instead.
+    Either way peak memory is bounded by the number of distinct
+    (errorCode, source) pairs, not by the number of lines.
+    """
+    classifier = SeverityClassifier(severity_mapping, severity_keywords)
+
+    def classified() -> Iterator[Dict[str, Any]]:
+        return iter_classified(iter_logs(log_path), in_place=True, classifier=classifier)
+
+    source: Iterable[Dict[str, Any]] = classified() if spill else Rescan(classified)
+    return iter_anomalies(source, anomaly_threshold, in_place=True)
+
+def _tee(issues: Iterable[Dict[str, Any]], outputs: List[Any]) -> Iterator[Dict[str, Any]]:
+    for issue in issues:
+        for out in outputs:
+            out.write(issue)
+        yield issue
+
+def run_detection(
+    log_path: str,
+    json_path: Path,
+    csv_path: Optional[Path] = None,
+    severity_mapping: Mapping[str, str] | None = None,
+    anomaly_threshold: int = 3,
+    spill: bool = False,
+    severity_keywords: Mapping[str, List[str]] | None = None,
+    fmt: str = "json",
+    compress: bool = False,
+    max_bytes: int | None = None,
+    export: Mapping[str, Any] | None = None,
+) -> int:
+    """
+    Run the full detection pipeline from a log file to the JSON/CSV reports.
+    `fmt`, `compress` and `max_bytes` are passed to generate_report. `export`
+    holds IssueExporter settings; the same pass then also writes the export.
+    Returns the number of issues written.
+    """
+    issues = detection_stream(log_path, severity_mapping, anomaly_threshold, spill, severity_keywords)
+    exporter = IssueExporter(export) if export is not None else None
+    exports = exporter.open() if exporter is not None else []
+    if exports:
+        issues = _tee(issues, exports)
+    try:
+        count = generate_report(
+            issues,
+            Path(json_path),
+            Path(csv_path) if csv_path else None,
+            fmt=fmt,
+            compress=compress,
+            max_bytes=max_bytes,
+        )
+        if exporter is not None:
+            exporter.finish(exports)
+    except Exception:
+        IssueExporter.abort(exports)
+        raise
+    logger.info("Detection pipeline processed %d entries from %s", count, log_path)
+    return count
@@ -0,0 +1,357 @@
+import csv
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from ..utils.file_utils import ensure_dir
+from ..utils.time_utils import to_utc_iso
+from .rollups import RollupStore
+from .storage import BASE_COLUMNS, CSV_HEADER, ROWS_WRITTEN, WRITE_SECONDS, Storage, occurrences
+from .trace_store import TraceStore
+
+# Block layout: MAGIC, uint32 header length, JSON header, column segments.
+MAGIC = b"HCB1"
+_PREFIX = struct.Struct("<4sI")
+
+DICT_COLUMNS = ("severity", "errorType", "sourceFile", "environment", "device")
+TEXT_COLUMNS = ("message", "stackTrace")
+TIME_COLUMNS = ("timestamp", "firstSeen", "lastSeen")
+COLUMNS = tuple(CSV_HEADER)
+DEFAULT_BLOCK_ROWS = 4096
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_SWAP = sys.byteorder != "little"
+
+def _to_micros(ts: str) -> int:
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _MICROSECOND
+
+def _from_micros(us: int) -> str:
+    return (_EPOCH + timedelta(microseconds=us)).isoformat().replace("+00:00", "Z")
+
+def _pack_ints(values: Sequence[int], typecode: str = "q") -> bytes:
+    arr = array(typecode, values)
+    if _SWAP:
+        arr.byteswap()
+    return arr.tobytes()
+
+def _unpack_ints(data: bytes, typecode: str = "q") -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if _SWAP:
+        arr.byteswap()
+    return arr
+
+def _column_value(event: Dict[str, Any], name: str) -> Any:
+    if name == "occurrences":
+        return occurrences(event)
+    if name in ("firstSeen", "lastSeen"):
+        return event.get(name) or event["timestamp"]
+    return event[name]
+
+def _encode_column(name: str, values: List[Any]) -> bytes:
+    if name in DICT_COLUMNS:
+        lookup: Dict[str, int] = {}
+        codes = [lookup.setdefault(str(v), len(lookup)) for v in values]
+        typecode = "B" if len(lookup) <= 1 << 8 else "H" if len(lookup) <= 1 << 16 else "I"
+        raw = typecode.encode() + json.dumps(list(lookup), ensure_ascii=False).encode("utf-8") + b"\0" + _pack_ints(codes, typecode)
+    elif name in TIME_COLUMNS:
+        micros = [_to_micros(v) for v in values]
+        raw = _pack_ints([b - a for a, b in zip([0] + micros, micros)])
+    elif name in ("lineNumber", "occurrences"):
+        raw = _pack_ints([int(v) for v in values])
+    elif name == "resolved":
+        raw = bytes(1 if v else 0 for v in values)
+    else:
+        raw = json.dumps([str(v) for v in values], ensure_ascii=False).encode("utf-8")
+    return zlib.compress(raw, 6)
+
+def _decode_column(name: str, data: bytes) -> List[Any]:
+    raw = zlib.decompress(data)
+    if name in DICT_COLUMNS:
+        typecode = chr(raw[0])
+        sep = raw.index(b"\0")
+        values = json.loads(raw[1:sep].decode("utf-8"))
+        return [values[c] for c in _unpack_ints(raw[sep + 1 :], typecode)]
+    if name in TIME_COLUMNS:
+        out, us = [], 0
+        for delta in _unpack_ints(raw):
+            us += delta
+            out.append(_from_micros(us))
+        return out
+    if name in ("lineNumber", "occurrences"):
+        return list(_unpack_ints(raw))
+    if name == "resolved":
+        return [b == 1 for b in raw]
+    return json.loads(raw.decode("utf-8"))
+
+class ColumnarArchive:
+    """
+    Append-only columnar archive of normalized events.
+
+    Each `append` writes one self-describing block: a JSON header with the
+    row count, min/max timestamp (microseconds) and distinct severities,
+    followed by one zlib-compressed segment per column. severity,
+    errorType, sourceFile, environment and device are dictionary-encoded,
+    timestamps are delta-encoded, and message/stackTrace sit in their own
+    segments, so a scan decodes only the columns it asks for and skips
+    whole blocks whose stats cannot match its filters. A torn block at the
+    end of the file (crash mid-append) is ignored by readers and cut off
+    before the next append.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        # End of the last complete block seen so far.
+        self._end = 0
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def append(self, events: Sequence[Dict[str, Any]]) -> int:
+        if not events:
+            return 0
+        segments, layout, pos = [], {}, 0
+        for name in COLUMNS:
+            seg = _encode_column(name, [_column_value(e, name) for e in events])
+            layout[name] = [pos, len(seg)]
+            segments.append(seg)
+            pos += len(seg)
+        micros = [_to_micros(e["timestamp"]) for e in events]
+        header = json.dumps(
+            {
+                "rows": len(events),
+                "minTs": min(micros),
+                "maxTs": max(micros),
+                "severities": sorted({e["severity"] for e in events}),
+                "columns": layout,
+                "payloadBytes": pos,
+            }
+        ).encode("utf-8")
+        ensure_dir(self.path.parent)
+        self._truncate_torn_tail()
+        block = _PREFIX.pack(MAGIC, len(header)) + header + b"".join(segments)
+        with open(self.path, "ab") as f:
+            f.write(block)
+        self._end += len(block)
+        return len(events)
+
+    def _truncate_torn_tail(self) -> None:
+        # Appends must start on a block boundary, or every block after a
+        # torn one would be unreadable.
+        size = self.size
+        if self._end > size:
+            self._end = 0
+        for payload, header in self.blocks(self._end):
+            self._end = payload + header["payloadBytes"]
+        if size > self._end:
+            os.truncate(self.path, self._end)
+
+    def blocks(self, start: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (payload offset, header) per complete block from byte `start`."""
+        if not self.path.exists():
+            return
+        size = self.size
+        with open(self.path, "rb") as f:
+            offset = start
+            while offset + _PREFIX.size <= size:
+                f.seek(offset)
+                magic, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+                if magic != MAGIC:
+                    raise ValueError(f"{self.path}: corrupt block at byte {offset}")
+                payload = offset + _PREFIX.size + header_len
+                if payload > size:
+                    return
+                try:
+                    header = json.loads(f.read(header_len))
+                except ValueError:
+                    return
+                if payload + header["payloadBytes"] > size:
+                    return
+                yield payload, header
+                offset = payload + header["payloadBytes"]
+
+    def read_block(self, payload: int, header: Dict[str, Any], columns: Iterable[str]) -> Dict[str, List[Any]]:
+        out = {}
+        with open(self.path, "rb") as f:
+            for name in columns:
+                if name not in header["columns"]:
+                    continue
+                rel, length = header["columns"][name]
+                f.seek(payload + rel)
+                out[name] = _decode_column(name, f.read(length))
+        # Blocks written before dedup existed: one occurrence at `timestamp`.
+        for name in columns:
+            if name in out:
+                continue
+            if name == "occurrences":
+                out[name] = [1] * header["rows"]
+            else:
+                out[name] = out.get("timestamp") or self.read_block(payload, header, ["timestamp"])["timestamp"]
+        return out
+
+    def scan(
+        self,
+        columns: Sequence[str] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        severities: Iterable[str] | None = None,
+        start: int = 0,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield rows holding only `columns` (all by default), optionally limited
+        to since <= timestamp < until and to the given severities. Blocks
+        whose stats rule them out are skipped without being decoded.
+        """
+        columns = list(columns or COLUMNS)
+        lo = _to_micros(to_utc_iso(since)) if since else None
+        hi = _to_micros(to_utc_iso(until)) if until else None
+        wanted = {s.lower() for s in severities} if severities is not None else None
+
+        needed = list(columns)
+        if (lo is not None or hi is not None) and "timestamp" not in needed:
+            needed.append("timestamp")
+        if wanted is not None and "severity" not in needed:
+            needed.append("severity")
+
+        for payload, header in self.blocks(start):
+            if lo is not None and header["maxTs"] < lo:
+                continue
+            if hi is not None and header["minTs"] >= hi:
+                continue
+            if wanted is not None and wanted.isdisjoint(header["severities"]):
+                continue
+            cols = self.read_block(payload, header, needed)
+            micros = None
+            if lo is not None or hi is not None:
+                micros = [_to_micros(t) for t in cols["timestamp"]]
+            for i in range(header["rows"]):
+                if micros is not None and ((lo is not None and micros[i] < lo) or (hi is not None and micros[i] >= hi)):
+                    continue
+                if wanted is not None and cols["severity"][i] not in wanted:
+                    continue
+                yield {name: cols[name][i] for name in columns}
+
+class ColumnarStorage(Storage):
+    """
+    Storage backend ("columnar") that archives to a ColumnarArchive instead
+    of CSV. The archive sits next to the configured CSV path with the
+    suffix .hcol. Events are buffered and written as one block per
+    `block_rows` events or on `flush()`; JSONL output and rollups behave as
+    in Storage.
+    """
+
+    def __init__(
+        self,
+        csv_path: Path,
+        jsonl_path: Path | None = None,
+        rollups: RollupStore | None = None,
+        block_rows: int = DEFAULT_BLOCK_ROWS,
+        traces: TraceStore | None = None,
+    ) -> None:
+        self.archive = ColumnarArchive(Path(csv_path).with_suffix(".hcol"))
+        self.block_rows = block_rows
+        self._buffer: List[Dict[str, Any]] = []
+        super().__init__(csv_path, jsonl_path=jsonl_path, rollups=None, traces=traces)
+        self.rollups = rollups
+        if self.rollups is not None:
+            self.rollups.catch_up(
+                self.archive.size,
+                lambda offset: (
+                    (r["timestamp"], r["severity"], r["occurrences"])
+                    for r in self.archive.scan(("timestamp", "severity", "occurrences"), start=offset)
+                ),
+            )
+
+    @property
+    def archive_path(self) -> Path:
+        return self.archive.path
+
+    def write_event(self, event: Dict[str, Any]) -> None:
+        self.write_many([event])
+
+    def write_many(self, events: Iterable[Dict[str, Any]]) -> int:
+        started = time.perf_counter()
+        events = self._externalize(list(events))
+        if not events:
+            return 0
+        self._buffer.extend(events)
+        while len(self._buffer) >= self.block_rows:
+            self.archive.append(self._buffer[: self.block_rows])
+            self._buffer = self._buffer[self.block_rows :]
+        if self.jsonl_path:
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+        if self.rollups is not None:
+            for e in events:
+                self.rollups.add(e["timestamp"], e["severity"], occurrences(e))
+        WRITE_SECONDS.labels("columnar").observe(time.perf_counter() - started)
+        ROWS_WRITTEN.labels("columnar").inc(len(events))
+        return len(events)
+
+    def _write_block(self) -> None:
+        self.archive.append(self._buffer)
+        self._buffer = []
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._write_block()
+        if self.traces is not None:
+            self.traces.flush()
+        if self.rollups is not None:
+            self.rollups.flush(watermark=self.archive.size)
+
+    def scan(self, columns: Sequence[str] | None = None, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Full-history scan (see ColumnarArchive.scan); flushes buffered events first."""
+        if self._buffer:
+            self._write_block()
+        return self.archive.scan(columns, **filters)
+
+    def read_recent(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict[str, Any]]:
+        columns = list(columns or COLUMNS)
+        rows = [{name: _column_value(e, name) for name in columns} for e in self._buffer[-limit:]]
+        if len(rows) >= limit:
+            return rows
+        # Decode only as many trailing blocks as the limit needs.
+        tail, count = [], len(rows)
+        for block in reversed(list(self.archive.blocks())):
+            tail.append(block)
+            count += block[1]["rows"]
+            if count >= limit:
+                break
+        older = []
+        for payload, header in reversed(tail):
+            cols = self.archive.read_block(payload, header, columns)
+            older.extend({name: cols[name][i] for name in columns} for i in range(header["rows"]))
+        return (older + rows)[-limit:]
+
+def convert_csv(csv_path: Path, archive_path: Path, block_rows: int = DEFAULT_BLOCK_ROWS) -> int:
+    """Copy a CSV archive into a columnar archive; returns the number of rows."""
+    archive = ColumnarArchive(archive_path)
+    total, batch = 0, []
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        for values in csv.reader(f):
+            if len(values) < BASE_COLUMNS or values[0] == "timestamp":
+                continue
+            # Older archives lack the dedup columns; zip leaves them out.
+            row: Dict[str, Any] = dict(zip(CSV_HEADER, values))
+            row["lineNumber"] = int(row["lineNumber"] or 0)
+            row["resolved"] = row["resolved"] == "true"
+            row["stackTrace"] = row["stackTrace"].replace("\\n", "\n")
+            batch.append(row)
+            if len(batch) >= block_rows:
+                total += archive.append(batch)
+                batch = []
+    total += archive.append(batch)
+    return total
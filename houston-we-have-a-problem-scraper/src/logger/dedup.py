@@ -0,0 +1,121 @@
+import hashlib
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from ..analyzers.template_miner import mask_message
+from .storage import occurrences
+
+def fingerprint(event: Dict[str, Any]) -> str:
+    """
+    Identity of a repeated error: errorType, sourceFile, lineNumber and the
+    message and stack trace with numbers, IDs, addresses and IPs masked.
+    """
+    parts = (
+        str(event.get("errorType", "")),
+        str(event.get("sourceFile", "")),
+        str(event.get("lineNumber", "")),
+        mask_message(str(event.get("message", ""))),
+        mask_message(str(event.get("stackTrace", ""))),
+    )
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+def _seconds(value: Any) -> float | None:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+class Deduplicator:
+    """
+    Collapses repeats of the same event (by `fingerprint`) into one row.
+
+    The first event of a group is kept, with "occurrences", "firstSeen" and
+    "lastSeen" added, until `window_seconds` of event time have passed since
+    it was seen; the row is then returned by `add` for storage. At most
+    `max_keys` groups are held: beyond that the least recently repeated
+    group is returned early, so memory stays bounded under any key
+    cardinality. `flush()` returns everything still pending.
+
+    Event time is taken from "timestamp" and only moves forward, so late
+    events join open groups rather than reopening closed ones. A group
+    also closes once `window_seconds` have passed on the wall `clock`:
+    long-running callers call `expire()` while idle, since event time
+    stands still when no events arrive.
+    `stats` counts events, rows (returned) and evictions.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.window_seconds = float(window_seconds)
+        self.max_keys = max(1, int(max_keys))
+        self.clock = clock
+        self.groups: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (opened at event time, opened at wall time, key, row) in opening
+        # order, for window expiry.
+        self._opened: Deque[Tuple[float, float, str, Dict[str, Any]]] = deque()
+        self._clock = 0.0
+        self.stats = Counter()
+
+    def add(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fold a normalized event in; return the rows that are now complete."""
+        self.stats["events"] += 1
+        t = _seconds(event.get("timestamp"))
+        if t is not None and t > self._clock:
+            self._clock = t
+        done = self._expire()
+
+        key = fingerprint(event)
+        n = occurrences(event)
+        row = self.groups.get(key)
+        if row is None:
+            ts = event.get("timestamp")
+            row = dict(event, occurrences=n, firstSeen=event.get("firstSeen") or ts, lastSeen=event.get("lastSeen") or ts)
+            self.groups[key] = row
+            self._opened.append((self._clock, self.clock(), key, row))
+            while len(self.groups) > self.max_keys:
+                _, evicted = self.groups.popitem(last=False)
+                self.stats["evictions"] += 1
+                done.append(evicted)
+            if len(self._opened) > 2 * self.max_keys:
+                # Drop entries for groups that were evicted.
+                self._opened = deque(entry for entry in self._opened if self.groups.get(entry[2]) is entry[3])
+        else:
+            row["occurrences"] += n
+            last = event.get("lastSeen") or event.get("timestamp")
+            if last and str(last) > str(row["lastSeen"]):
+                row["lastSeen"] = last
+            self.groups.move_to_end(key)
+        self.stats["rows"] += len(done)
+        return done
+
+    def _expire(self) -> List[Dict[str, Any]]:
+        done = []
+        # Both opening times grow along the deque, so expired groups are at its head.
+        event_limit = self._clock - self.window_seconds
+        wall_limit = self.clock() - self.window_seconds
+        while self._opened and (self._opened[0][0] <= event_limit or self._opened[0][1] <= wall_limit):
+            _, _, key, row = self._opened.popleft()
+            if self.groups.get(key) is row:
+                del self.groups[key]
+                done.append(row)
+        return done
+
+    def expire(self) -> List[Dict[str, Any]]:
+        """Return the rows whose window has passed, without adding an event."""
+        done = self._expire()
+        self.stats["rows"] += len(done)
+        return done
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Return every pending row, oldest first, and start over."""
+        done = [row for _, _, key, row in self._opened if self.groups.get(key) is row]
+        self.groups.clear()
+        self._opened.clear()
+        self.stats["rows"] += len(done)
+        return done
@@ -1,6 +1,12 @@
-from typing import Dict, Any
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List
+from ..utils.metrics import METRICS
 from ..utils.time_utils import to_utc_iso
 
+NORMALIZE_SECONDS = METRICS.histogram("houston_normalize_seconds", "Time to normalize one raw event")
+
 REQUIRED_FIELDS = [
     "timestamp",
     "errorType",
@@ -14,6 +20,23 @@ REQUIRED_FIELDS = [
     "resolved",
 ]
 
+_REQUIRED_SET = frozenset(REQUIRED_FIELDS)
+_TEXT_FIELDS = ("errorType", "message", "stackTrace", "sourceFile", "environment", "device")
+
+# Plain ISO 8601 timestamps, which is what nearly all events carry.
+_ISO_TS = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2})?"
+)
+
+def observe_normalize(seconds: float, events: int) -> None:
+    """
+    Record `seconds` spent normalizing `events` events. Callers time the
+    call themselves, so batches normalized in a worker process can be
+    reported by the parent.
+    """
+    if events:
+        NORMALIZE_SECONDS.observe(seconds / events, events)
+
 def normalize(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Ensure the error event contains all required fields and normalized types.
@@ -22,6 +45,8 @@ def normalize(event: Dict[str, Any]) -> Dict[str, Any]:
     - resolved to bool
     - lineNumber to int (>=0)
     """
+    if not isinstance(event, dict):
+        raise ValueError(f"Expected an event object, got {type(event).__name__}")
     missing = [f for f in REQUIRED_FIELDS if f not in event]
     if missing:
         raise ValueError(f"Missing required fields: {', '.join(missing)}")
@@ -47,4 +72,72 @@ def normalize(event: Dict[str, Any]) -> Dict[str, Any]:
     normalized["environment"] = str(event["environment"])
     normalized["device"] = str(event["device"])
 
-    return normalized
\ No newline at end of file
+    return normalized
+
+@lru_cache(maxsize=4096)
+def _fast_utc_iso(ts: str) -> str:
+    m = _ISO_TS.fullmatch(ts)
+    if m is None:
+        return to_utc_iso(ts)
+    year, month, day, hour, minute, second, frac, tz = m.groups()
+    if tz is None or tz == "Z":
+        tzinfo = timezone.utc
+    else:
+        sign = -1 if tz[0] == "-" else 1
+        tzinfo = timezone(sign * timedelta(hours=int(tz[1:3]), minutes=int(tz[4:6])))
+    try:
+        dt = datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second),
+            int(frac.ljust(6, "0")) if frac else 0,
+            tzinfo=tzinfo,
+        )
+    except ValueError:
+        # Out-of-range fields: let dateutil decide, exactly as normalize() does.
+        return to_utc_iso(ts)
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+def normalize_many(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Batch form of `normalize` with identical output and errors.
+
+    Faster on the common case: required keys are checked against a
+    precomputed set, plain ISO timestamps are parsed with a fixed-format
+    path (memoized, dateutil only for other inputs), and values that
+    already have the target type are not converted again.
+    """
+    results: List[Dict[str, Any]] = []
+    for event in events:
+        if not isinstance(event, dict):
+            raise ValueError(f"Expected an event object, got {type(event).__name__}")
+        if not _REQUIRED_SET <= event.keys():
+            missing = [f for f in REQUIRED_FIELDS if f not in event]
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        normalized = dict(event)
+        ts = event["timestamp"]
+        normalized["timestamp"] = _fast_utc_iso(ts) if type(ts) is str else to_utc_iso(ts)
+
+        sev = event["severity"]
+        normalized["severity"] = sev.lower() if type(sev) is str else str(sev).lower()
+
+        resolved = event["resolved"]
+        if resolved is not True and resolved is not False:
+            normalized["resolved"] = bool(resolved)
+
+        ln = event["lineNumber"]
+        if type(ln) is not int or ln < 0:
+            try:
+                ln = int(ln)
+                if ln < 0:
+                    ln = 0
+                normalized["lineNumber"] = ln
+            except Exception as e:
+                raise ValueError(f"Invalid lineNumber '{event['lineNumber']}': {e}")
+
+        for field in _TEXT_FIELDS:
+            value = event[field]
+            if type(value) is not str:
+                normalized[field] = str(value)
+
+        results.append(normalized)
+    return results
@@ -1,14 +1,33 @@
-from typing import Dict, Any, List
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Dict, Any, List
 from pathlib import Path
 
-from .formatter import normalize
-from .storage import Storage
-from ..alerts.email_notifier import EmailNotifier
-from ..alerts.webhook_notifier import WebhookNotifier
+from ..utils.metrics import METRICS
+from .formatter import normalize, observe_normalize
+
+if TYPE_CHECKING:
+    from .dedup import Deduplicator
+    from .sampler import AdaptiveSampler
+    from .storage import Storage
+    from ..alerts.email_notifier import EmailNotifier
+    from ..alerts.webhook_notifier import WebhookNotifier
+    from ..detectors.anomaly_scanner import WindowedAnomalyDetector
+
+_EVENTS = METRICS.counter("houston_events_ingested_total", "Events ingested, before sampling and dedup", ("severity",))
+_ALERTS = METRICS.counter("houston_alerts_emitted_total", "Threshold and spike alerts raised", ("kind",))
 
 class ErrorHandler:
     """
     High-level API to ingest normalized events, persist them, and emit alerts based on thresholds.
+
+    With a `dedup` Deduplicator, repeats are stored as one row with an
+    occurrence count, while thresholds and anomaly detection still see
+    every event. With an AdaptiveSampler, floods of low-severity events
+    are thinned before storage and the stored ones carry the skipped
+    events' count; thresholds and anomaly detection again see every event.
+    Call `flush()` when done to store the pending rows.
     """
 
     def __init__(
@@ -17,19 +36,85 @@ class ErrorHandler:
         email_notifier: EmailNotifier | None = None,
         webhook_notifier: WebhookNotifier | None = None,
         thresholds: dict | None = None,
+        anomaly_detector: WindowedAnomalyDetector | None = None,
+        dedup: Deduplicator | None = None,
+        sampler: AdaptiveSampler | None = None,
     ) -> None:
         self.storage = storage
         self.email_notifier = email_notifier
         self.webhook_notifier = webhook_notifier
         self.thresholds = thresholds or {"critical": 1, "error": 10, "warning": 50}
+        self.anomaly_detector = anomaly_detector
+        self.dedup = dedup
+        self.sampler = sampler
 
         self._counters = {"critical": 0, "error": 0, "warning": 0, "info": 0}
 
     def ingest(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
         ev = normalize(event)
-        self.storage.write_event(ev)
+        observe_normalize(time.perf_counter() - started, 1)
+        return self.ingest_normalized(ev)
+
+    def ingest_normalized(self, ev: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist and alert on an event that already went through `normalize`."""
+        if self.dedup is None and self.sampler is None:
+            self.storage.write_event(ev)
+        else:
+            self._store([ev])
+        self._track(ev)
+        return ev
+
+    def ingest_batch(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Persist a batch of normalized events in one storage write, then run
+        thresholds and anomaly checks per event in order.
+        """
+        self._store(events)
+        for ev in events:
+            self._track(ev)
+        return len(events)
+
+    def _store(self, rows: List[Dict[str, Any]]) -> None:
+        """Sample, then deduplicate, then write what is left in one batch."""
+        if self.sampler is not None:
+            rows = [row for row in map(self.sampler.offer, rows) if row is not None]
+        if self.dedup is not None:
+            rows = [out for row in rows for out in self.dedup.add(row)]
+        if rows:
+            self.storage.write_many(rows)
+
+    def expire(self) -> int:
+        """
+        Store deduplicated rows whose window has run out on the wall clock;
+        returns how many. The ingest server and HoustonLogHandler call this
+        while idle, since windows otherwise only close as newer events arrive.
+        """
+        if self.dedup is None:
+            return 0
+        rows = self.dedup.expire()
+        if rows:
+            self.storage.write_many(rows)
+        return len(rows)
+
+    def flush(self) -> None:
+        """Store rows still held by the sampler and deduplicator, then flush storage."""
+        if self.sampler is not None:
+            rows = self.sampler.flush()
+            if self.dedup is not None:
+                rows = [out for row in rows for out in self.dedup.add(row)]
+            if rows:
+                self.storage.write_many(rows)
+        if self.dedup is not None:
+            rows = self.dedup.flush()
+            if rows:
+                self.storage.write_many(rows)
+        self.storage.flush()
+
+    def _track(self, ev: Dict[str, Any]) -> None:
         sev = ev["severity"]
         self._counters[sev] = self._counters.get(sev, 0) + 1
+        _EVENTS.labels(sev).inc()
 
         # Check alert thresholds
         threshold = self.thresholds.get(sev)
@@ -38,7 +123,10 @@ class ErrorHandler:
             # reset the counter after emitting alert to avoid spamming
             self._counters[sev] = 0
 
-        return ev
+        if self.anomaly_detector is not None:
+            spike = self.anomaly_detector.observe(ev)
+            if spike["spikeStart"]:
+                self._emit_spike_alert(ev, spike)
 
     def ingest_many(self, events: List[Dict[str, Any]]) -> int:
         count = 0
@@ -47,7 +135,23 @@ class ErrorHandler:
             count += 1
         return count
 
+    def _emit_spike_alert(self, last_event: Dict[str, Any], spike: Dict[str, Any]) -> None:
+        _ALERTS.labels("spike").inc()
+        title = f"[Houston] Spike in {last_event['errorType']} at {last_event['sourceFile']}"
+        body = (
+            f"Occurrences in window: {spike['occurrences']} (z-score {spike['anomalyScore']})\n"
+            f"Last event at: {last_event['timestamp']}\n"
+            f"Message: {last_event['message']}\n"
+            f"Environment: {last_event['environment']}\n"
+        )
+        payload = {"title": title, "spike": spike, "last_event": last_event}
+        if self.email_notifier:
+            self.email_notifier.send(subject=title, body=body)
+        if self.webhook_notifier:
+            self.webhook_notifier.post(payload)
+
     def _emit_alert(self, severity: str, last_event: Dict[str, Any]) -> None:
+        _ALERTS.labels("threshold").inc()
         title = f"[Houston] {severity.upper()} threshold reached"
         body = (
             f"Severity: {severity}\n"
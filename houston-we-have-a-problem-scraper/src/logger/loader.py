@@ -0,0 +1,126 @@
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple
+
+from .formatter import normalize, normalize_many
+from ..utils.file_utils import read_json
+from ..utils.manifest import file_sha256
+
+# Input files holding one JSON event per line; these may be appended to.
+NDJSON_SUFFIXES = (".jsonl", ".ndjson")
+
+def read_ndjson(path: Path, offset: int = 0) -> Tuple[List[Dict[str, Any]], int, List[str]]:
+    """
+    Read complete lines from `offset` on; a trailing partial line is left for
+    the next run. Returns (events, offset after the last complete line, warnings).
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    events: List[Dict[str, Any]] = []
+    warnings: List[str] = []
+    for line_no, line in enumerate(data[:end].splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            warnings.append(f"[WARN] Skipping invalid JSON line in {path.name} (+{line_no}): {e}")
+            continue
+        if isinstance(obj, dict):
+            events.append(obj)
+        else:
+            warnings.append(f"[WARN] Skipping non-object JSON line in {path.name} (+{line_no})")
+    return events, offset + end, warnings
+
+def load_input(
+    path: Path,
+    offset: int = 0,
+    known_sha256: str | None = None,
+    with_hash: bool = False,
+) -> Dict[str, Any]:
+    """
+    Read, decode and normalize one input file. Safe to run in a worker
+    process: it never touches Storage or alert state.
+
+    Returns a dict with:
+        path, events (normalized, in file order), offset (NDJSON only),
+        size/mtime (stat()ed before reading, for the manifest),
+        normalize_seconds (for `observe_normalize` in the consuming process),
+        sha256 (when with_hash), skipped (content hash equals known_sha256),
+        error (message of the exception that stopped the file, if any), warnings
+
+    Events that fail to normalize are skipped with a warning, like invalid
+    NDJSON lines, so one bad record neither blocks the rest of the file nor
+    keeps it from being recorded as ingested.
+    """
+    result: Dict[str, Any] = {
+        "path": path,
+        "events": [],
+        "offset": None,
+        "size": None,
+        "mtime": None,
+        "sha256": None,
+        "normalize_seconds": 0.0,
+        "skipped": False,
+        "error": None,
+        "warnings": [],
+    }
+    try:
+        st = path.stat()
+        result["size"], result["mtime"] = st.st_size, st.st_mtime
+        if path.suffix in NDJSON_SUFFIXES:
+            raw, result["offset"], result["warnings"] = read_ndjson(path, offset)
+        else:
+            if with_hash:
+                result["sha256"] = file_sha256(path)
+                if known_sha256 is not None and result["sha256"] == known_sha256:
+                    result["skipped"] = True
+                    return result
+            data = read_json(path)
+            if isinstance(data, list):
+                raw = data
+            elif isinstance(data, dict):
+                raw = [data]
+            else:
+                raw = []
+                result["warnings"].append(f"[WARN] Unsupported JSON structure in {path.name}")
+        started = time.perf_counter()
+        try:
+            result["events"] = normalize_many(raw)
+        except Exception:
+            # Redo per event to sort the valid events from the invalid ones.
+            for i, ev in enumerate(raw):
+                try:
+                    result["events"].append(normalize(ev))
+                except Exception as e:
+                    result["warnings"].append(f"[WARN] Skipping invalid event in {path.name} (#{i}): {e}")
+        result["normalize_seconds"] = time.perf_counter() - started
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def load_inputs(tasks: Iterable[Tuple[Path, int, str | None, bool]], workers: int | None = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield `load_input` results in task order. With workers > 1 files are
+    loaded in a process pool, at most 2 * workers ahead of the consumer so
+    decoded batches do not pile up in memory.
+    """
+    if not workers or workers <= 1:
+        for task in tasks:
+            yield load_input(*task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        for task in tasks:
+            pending.append(pool.submit(load_input, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
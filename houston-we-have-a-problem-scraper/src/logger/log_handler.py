@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from .formatter import normalize_many, observe_normalize
+
+if TYPE_CHECKING:
+    from .handler import ErrorHandler
+
+_STOP = object()
+# Seconds without records after which the worker lets dedup windows expire.
+IDLE_SECONDS = 1.0
+
+def level_to_severity(levelno: int) -> str:
+    if levelno >= logging.CRITICAL:
+        return "critical"
+    if levelno >= logging.ERROR:
+        return "error"
+    if levelno >= logging.WARNING:
+        return "warning"
+    return "info"
+
+def record_to_event(record: logging.LogRecord, environment: str, device: str) -> Dict[str, Any]:
+    """Map a LogRecord onto the REQUIRED_FIELDS event shape."""
+    stack = ""
+    error_type = record.name
+    if record.exc_info and record.exc_info[0] is not None:
+        error_type = record.exc_info[0].__name__
+        stack = "".join(traceback.format_exception(*record.exc_info)).rstrip("\n")
+    elif record.exc_text:
+        stack = record.exc_text
+    if record.stack_info:
+        stack = f"{stack}\n{record.stack_info}" if stack else record.stack_info
+    return {
+        "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat().replace("+00:00", "Z"),
+        "errorType": error_type,
+        "message": record.getMessage(),
+        "stackTrace": stack,
+        "severity": level_to_severity(record.levelno),
+        "sourceFile": record.pathname,
+        "lineNumber": record.lineno,
+        "environment": environment,
+        "device": device,
+        "resolved": False,
+        "logger": record.name,
+    }
+
+class HoustonLogHandler(logging.Handler):
+    """
+    logging.Handler that reports records to Houston without blocking the caller.
+
+    `emit` only builds the event dict and puts it on a bounded queue; a daemon
+    thread batches queued events and delivers them either to a local
+    ErrorHandler (`ingest_batch`) or as NDJSON to the ingest server's
+    /events endpoint. When the queue is full the record is dropped and
+    counted in `dropped`; batches that fail delivery are counted in `failed`.
+    """
+
+    def __init__(
+        self,
+        error_handler: ErrorHandler | None = None,
+        url: str | None = None,
+        level: int = logging.WARNING,
+        environment: str = "production",
+        device: str | None = None,
+        capacity: int = 10000,
+        batch_size: int = 200,
+        timeout: float = 5.0,
+    ) -> None:
+        if (error_handler is None) == (url is None):
+            raise ValueError("Pass exactly one of error_handler or url")
+        super().__init__(level)
+        self.error_handler = error_handler
+        self.url = url
+        self.environment = environment
+        self.device = device or socket.gethostname()
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.dropped = 0
+        self.failed = 0
+        self.delivered = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=capacity)
+        self._thread = threading.Thread(target=self._run, name="houston-log-handler", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if threading.current_thread() is self._thread:
+            # Logged while delivering (e.g. by storage or requests): shipping
+            # it would feed the handler its own output.
+            return
+        try:
+            event = record_to_event(record, self.environment, self.device)
+        except Exception:
+            self.handleError(record)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """
+        Wait until every queued record has been delivered (or failed), for at
+        most `timeout` seconds: logging.shutdown() calls this at exit, which
+        must not hang on a stuck delivery.
+        """
+        if not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + self.timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._queue.all_tasks_done.wait(remaining)
+
+    def close(self) -> None:
+        """
+        Deliver what is already queued, flush a local ErrorHandler (rows held
+        by dedup or the sampler), then stop the worker thread.
+        """
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=self.timeout)
+            except queue.Full:
+                # Delivery is stuck: drop the oldest record to make room
+                # for the sentinel instead of blocking shutdown.
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                try:
+                    self._queue.put_nowait(_STOP)
+                except queue.Full:
+                    pass
+            self._thread.join(timeout=self.timeout * 2)
+        super().close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=IDLE_SECONDS)
+            except queue.Empty:
+                if self.error_handler is not None:
+                    try:
+                        self.error_handler.expire()
+                    except Exception:
+                        pass
+                continue
+            while item is not _STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                stopping = True
+                self._queue.task_done()
+            if not batch:
+                continue
+            try:
+                self._deliver(batch)
+                self.delivered += len(batch)
+            except Exception:
+                self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        if self.error_handler is not None:
+            # Rows still held by dedup / the sampler.
+            self.error_handler.flush()
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        if self.error_handler is not None:
+            started = time.perf_counter()
+            events = normalize_many(batch)
+            observe_normalize(time.perf_counter() - started, len(events))
+            self.error_handler.ingest_batch(events)
+            return
+        import requests  # deferred: only needed for network delivery
+
+        body = "\n".join(json.dumps(e, ensure_ascii=False) for e in batch).encode("utf-8")
+        resp = requests.post(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from ..utils.file_utils import atomic_write, read_json
+
+# Prefix length of an ISO timestamp ("2025-11-10T16:05:12Z") per granularity.
+GRANULARITIES = {"minute": 16, "hour": 13, "day": 10}
+
+# Position of the "occurrences" column in storage.CSV_HEADER (absent in
+# archives written before deduplication existed).
+_OCCURRENCES = 10
+
+class RollupStore:
+    """
+    Per-severity event counts at minute, hour and day granularity, kept in
+    memory and persisted as JSON next to the archive.
+
+    `add` is O(1) per event. The file records a watermark: the size of the
+    archive that the counts cover. `sync` (CSV) and `catch_up` (any format)
+    count only archive rows past the watermark, so they are safe to call
+    repeatedly (nothing is counted twice), backfill full history the first
+    time, and recover rows that were archived but never flushed after a
+    crash.
+
+    Minute and hour buckets older than their retention are pruned on flush;
+    day buckets are kept forever.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        minute_retention_days: int = 7,
+        hour_retention_days: int = 90,
+    ) -> None:
+        self.path = Path(path)
+        self.retention = {"minute": minute_retention_days, "hour": hour_retention_days}
+        self.watermark = 0
+        self.counts: Dict[str, Dict[str, Dict[str, int]]] = {g: {} for g in GRANULARITIES}
+        if self.path.exists():
+            data = read_json(self.path)
+            self.watermark = int(data.get("watermark", 0))
+            for g in GRANULARITIES:
+                self.counts[g] = data.get(g, {})
+
+    def add(self, timestamp: str, severity: str, n: int = 1) -> None:
+        ts = str(timestamp)
+        sev = str(severity).lower()
+        for g, width in GRANULARITIES.items():
+            bucket = ts[:width] if len(ts) >= width else "unknown"
+            by_sev = self.counts[g].get(bucket)
+            if by_sev is None:
+                by_sev = self.counts[g][bucket] = {}
+            by_sev[sev] = by_sev.get(sev, 0) + n
+
+    def sync(self, csv_path: Path) -> int:
+        """Count archive rows written after the watermark; returns how many."""
+        csv_path = Path(csv_path)
+        if not csv_path.exists():
+            return 0
+
+        def read_from(offset: int) -> Iterator[Tuple[str, str, int]]:
+            with open(csv_path, "rb") as f:
+                f.seek(offset)
+                reader = csv.reader(io.TextIOWrapper(f, encoding="utf-8", newline=""))
+                for row in reader:
+                    if len(row) < 2 or row[0] == "timestamp":
+                        continue
+                    n = row[_OCCURRENCES] if len(row) > _OCCURRENCES else ""
+                    yield row[0], row[1], int(n) if n else 1
+
+        return self.catch_up(csv_path.stat().st_size, read_from)
+
+    def catch_up(self, size: int, read_from: Callable[[int], Iterable[Tuple[str, str, int]]]) -> int:
+        """
+        Archive-format independent part of `sync`: `size` is the archive's
+        current size and `read_from(offset)` yields (timestamp, severity,
+        occurrences) for every row stored at or after byte `offset`.
+        """
+        if size < self.watermark:
+            # Archive was truncated or replaced: rebuild from scratch.
+            self.watermark = 0
+            self.counts = {g: {} for g in GRANULARITIES}
+        if size == self.watermark:
+            return 0
+        added = 0
+        for timestamp, severity, n in read_from(self.watermark):
+            self.add(timestamp, severity, n)
+            added += 1
+        self.watermark = size
+        return added
+
+    def flush(self, watermark: int | None = None) -> None:
+        if watermark is not None:
+            self.watermark = watermark
+        self._prune()
+        atomic_write(self.path, json.dumps({"watermark": self.watermark, **self.counts}, ensure_ascii=False))
+
+    def _prune(self) -> None:
+        now = datetime.now(timezone.utc)
+        for g, days in self.retention.items():
+            cutoff = (now - timedelta(days=days)).isoformat()[: GRANULARITIES[g]]
+            buckets = self.counts[g]
+            for bucket in [b for b in buckets if b < cutoff]:
+                del buckets[bucket]
+
+    def rows(self, granularity: str = "day") -> List[Dict[str, Any]]:
+        """Trend rows ({"date", "severity", "count"}) sorted by bucket and severity."""
+        rows = [
+            {"date": bucket, "severity": sev, "count": count}
+            for bucket, by_sev in self.counts[granularity].items()
+            for sev, count in by_sev.items()
+        ]
+        rows.sort(key=lambda r: (r["date"], r["severity"]))
+        return rows
@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from .storage import occurrences
+
+class AdaptiveSampler:
+    """
+    Keeps every event of unbudgeted severities (critical and error by
+    default) and thins the severities in `budgets` ({severity: events/s})
+    down to their budget when they flood in.
+
+    The rate of each budgeted severity is measured over windows of
+    `window_seconds` (smoothed across windows), and the next window keeps
+    budget / rate of its events, evenly spaced. A kept event stands for
+    itself and the events skipped since the previous kept one: their count
+    is added to its "occurrences", which every count in the pipeline
+    (rollups, severity_breakdown, trends, full-history report) already
+    weights by. `flush()` returns the last skipped event of each severity
+    carrying what is still owed, so stored weights add up exactly.
+
+    `seen` counts events per severity before sampling (true volume) and
+    `kept` the rows passed on.
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, float] | None = None,
+        window_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budgets = dict(budgets if budgets is not None else {"warning": 500.0, "info": 200.0})
+        self.window_seconds = float(window_seconds)
+        self.clock = clock
+        self.seen = Counter()
+        self.kept = Counter()
+        self._window_start = clock()
+        self._window = Counter()
+        self._rate: Dict[str, float] = {}
+        self._keep: Dict[str, float] = {}
+        self._credit: Dict[str, float] = {}
+        self._owed: Dict[str, int] = {}
+        self._last_skipped: Dict[str, Dict[str, Any]] = {}
+
+    def keep_ratio(self, severity: str) -> float:
+        """Fraction of `severity` events currently kept (1.0 when unbudgeted or under budget)."""
+        return self._keep.get(severity, 1.0)
+
+    def _roll(self, now: float) -> None:
+        elapsed = max(now - self._window_start, 1e-9)
+        for sev, budget in self.budgets.items():
+            rate = self._window[sev] / elapsed
+            previous = self._rate.get(sev)
+            # Smooth so one quiet window does not open the gates completely.
+            self._rate[sev] = rate if previous is None else 0.5 * previous + 0.5 * rate
+            self._keep[sev] = min(1.0, budget / self._rate[sev]) if self._rate[sev] > 0 else 1.0
+        self._window.clear()
+        self._window_start = now
+
+    def offer(self, event: Dict[str, Any]) -> Dict[str, Any] | None:
+        """The event to store (weighted when events were skipped before it), or None to skip it."""
+        sev = event["severity"]
+        n = occurrences(event)
+        self.seen[sev] += n
+        if sev not in self.budgets:
+            self.kept[sev] += 1
+            return event
+        now = self.clock()
+        if now - self._window_start >= self.window_seconds:
+            self._roll(now)
+        self._window[sev] += n
+
+        credit = self._credit.get(sev, 0.0) + self.keep_ratio(sev)
+        if credit < 1.0:
+            self._credit[sev] = credit
+            self._owed[sev] = self._owed.get(sev, 0) + n
+            self._last_skipped[sev] = event
+            return None
+        self._credit[sev] = credit - 1.0
+        owed = self._owed.pop(sev, 0)
+        self._last_skipped.pop(sev, None)
+        self.kept[sev] += 1
+        return dict(event, occurrences=n + owed) if owed else event
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Stand-ins for events skipped since the last kept one of each severity."""
+        rows = []
+        for sev, event in self._last_skipped.items():
+            self.kept[sev] += 1
+            rows.append(dict(event, occurrences=self._owed[sev]))
+        self._last_skipped.clear()
+        self._owed.clear()
+        return rows
@@ -0,0 +1,370 @@
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from ..utils.metrics import METRICS
+from .formatter import normalize, normalize_many, observe_normalize
+from .handler import ErrorHandler
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_DEPTH = METRICS.gauge("houston_server_queue_batches", "Batches waiting for the storage writer")
+_OUTCOMES = METRICS.counter("houston_server_events_total", "Events received by the ingest server", ("outcome",))
+
+# Seconds without a batch after which the writer lets dedup windows expire.
+IDLE_SECONDS = 1.0
+
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+}
+
+def decode_events(body: bytes) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Decode a request body holding one JSON event, a JSON array of events, or
+    NDJSON (one event per line), and normalize the events.
+    Returns (normalized events, error messages for the rejected ones).
+    Lines are decoded one by one, so a line that is not valid UTF-8 only
+    rejects itself.
+    """
+    stripped = body.strip()
+    try:
+        doc = json.loads(stripped.decode("utf-8"))
+        raw = doc if isinstance(doc, list) else [doc]
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raw = []
+        errors = []
+        for line_no, line in enumerate(stripped.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                raw.append(json.loads(line.decode("utf-8")))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                errors.append(f"line {line_no}: {e}")
+        if errors and not raw:
+            return [], errors
+    else:
+        errors = []
+
+    events = [e for e in raw if isinstance(e, dict)]
+    if len(events) != len(raw):
+        errors.append(f"{len(raw) - len(events)} non-object value(s) skipped")
+    started = time.perf_counter()
+    try:
+        normalized = normalize_many(events)
+        observe_normalize(time.perf_counter() - started, len(normalized))
+        return normalized, errors
+    except Exception:
+        # Sort the valid events from the invalid ones one by one; any
+        # failure (e.g. TypeError on a numeric timestamp) rejects only its event.
+        normalized = []
+        for i, ev in enumerate(events):
+            try:
+                normalized.append(normalize(ev))
+            except Exception as e:
+                errors.append(f"event {i}: {e}")
+        observe_normalize(time.perf_counter() - started, len(normalized))
+        return normalized, errors
+
+class IngestServer:
+    """
+    asyncio network front end for ErrorHandler.
+
+    - HTTP (POST /events): body is one JSON event, a JSON array or NDJSON;
+      GET /healthz reports queue depth and totals. Keep-alive is supported;
+      bodies need a Content-Length of at most `max_body_bytes`.
+    - Optional TCP and UDP listeners take NDJSON lines (at most
+      `max_line_bytes` each).
+
+    Decoded batches go through a bounded queue to a single writer that owns
+    the ErrorHandler and runs it in one worker thread, so archive order and
+    thresholds stay deterministic and the event loop never blocks on disk or
+    alert I/O. When the queue is full, HTTP and TCP connections wait before
+    reading more from their socket (per-connection backpressure); UDP has no
+    flow control, so datagrams arriving then are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        handler: ErrorHandler,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        tcp_port: int | None = None,
+        udp_port: int | None = None,
+        max_body_bytes: int = 1 << 20,
+        max_line_bytes: int = 1 << 16,
+        queue_batches: int = 64,
+        batch_size: int = 500,
+    ) -> None:
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.tcp_port = tcp_port
+        self.udp_port = udp_port
+        self.max_body_bytes = max_body_bytes
+        self.max_line_bytes = max_line_bytes
+        self.queue_batches = queue_batches
+        self.batch_size = batch_size
+        self.stats = {"accepted": 0, "rejected": 0, "written": 0, "dropped": 0, "write_errors": 0}
+        self.ports: Dict[str, int] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+        self._udp_transport: asyncio.DatagramTransport | None = None
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="houston-writer")
+
+    # -- lifecycle -----------------------------------------------------
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_batches)
+        self._writer_task = asyncio.create_task(self._writer())
+
+        http = await asyncio.start_server(self._serve_http, self.host, self.port, limit=self.max_line_bytes)
+        self._servers.append(http)
+        self.ports["http"] = http.sockets[0].getsockname()[1]
+
+        if self.tcp_port is not None:
+            tcp = await asyncio.start_server(self._serve_lines, self.host, self.tcp_port, limit=self.max_line_bytes)
+            self._servers.append(tcp)
+            self.ports["tcp"] = tcp.sockets[0].getsockname()[1]
+
+        if self.udp_port is not None:
+            loop = asyncio.get_running_loop()
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UdpProtocol(self), local_addr=(self.host, self.udp_port)
+            )
+            self._udp_transport = transport
+            self.ports["udp"] = transport.get_extra_info("sockname")[1]
+
+        logger.info("Ingest server listening on %s %s", self.host, self.ports)
+
+    async def stop(self) -> None:
+        """Stop accepting, drain queued batches into the handler, flush storage."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        if self._udp_transport is not None:
+            self._udp_transport.close()
+        if self._queue is not None:
+            await self._queue.join()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._pool, self.handler.flush)
+        self._pool.shutdown(wait=True)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    # -- writer --------------------------------------------------------
+
+    async def _enqueue(self, events: List[Dict[str, Any]]) -> None:
+        for i in range(0, len(events), self.batch_size):
+            await self._queue.put(events[i : i + self.batch_size])
+        self.stats["accepted"] += len(events)
+        _OUTCOMES.labels("accepted").inc(len(events))
+        _QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def _writer(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                batch = await asyncio.wait_for(self._queue.get(), timeout=IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                try:
+                    await loop.run_in_executor(self._pool, self.handler.expire)
+                except Exception:
+                    logger.exception("Failed to store expired rows")
+                continue
+            taken = 1
+            # Coalesce whatever else is already queued into one storage write.
+            while len(batch) < self.batch_size * 4 and not self._queue.empty():
+                batch = batch + self._queue.get_nowait()
+                taken += 1
+            _QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                await loop.run_in_executor(self._pool, self.handler.ingest_batch, batch)
+                self.stats["written"] += len(batch)
+            except Exception:
+                self.stats["write_errors"] += 1
+                _OUTCOMES.labels("write_error").inc(len(batch))
+                logger.exception("Failed to ingest a batch of %d events", len(batch))
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+
+    # -- HTTP ----------------------------------------------------------
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: Dict[str, Any], keep_alive: bool) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _serve_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, {"error": "headers too large"}, False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        k, v = line.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                if path == "/healthz" and method == "GET":
+                    await self._respond(writer, 200, {"status": "ok", "queued": self._queue.qsize(), **self.stats}, keep_alive)
+                    if not keep_alive:
+                        break
+                    continue
+                if path not in ("/events", "/ingest"):
+                    await self._respond(writer, 404, {"error": "not found"}, False)
+                    break
+                if method != "POST":
+                    await self._respond(writer, 405, {"error": "use POST"}, False)
+                    break
+                if "content-length" not in headers:
+                    await self._respond(writer, 411, {"error": "Content-Length required"}, False)
+                    break
+                try:
+                    length = int(headers["content-length"])
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                if length < 0:
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, False)
+                    break
+                if length > self.max_body_bytes:
+                    await self._respond(writer, 413, {"error": f"body exceeds {self.max_body_bytes} bytes"}, False)
+                    break
+
+                body = await reader.readexactly(length)
+                events, errors = decode_events(body)
+                self.stats["rejected"] += len(errors)
+                _OUTCOMES.labels("rejected").inc(len(errors))
+                if events:
+                    # Blocks (and stops reading this connection) while the queue is full.
+                    await self._enqueue(events)
+                status = 202 if events or not errors else 400
+                await self._respond(writer, status, {"accepted": len(events), "rejected": len(errors), "errors": errors[:10]}, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # -- TCP / UDP line listeners ----------------------------------------
+
+    async def _serve_lines(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Read whatever is buffered and ingest all complete lines in it as one
+        # batch; the partial tail waits for the next read.
+        tail = b""
+        try:
+            while True:
+                data = await reader.read(self.max_line_bytes)
+                if not data:
+                    break
+                lines = (tail + data).split(b"\n")
+                tail = lines.pop()
+                if len(tail) > self.max_line_bytes:
+                    # Line longer than max_line_bytes: drop the connection.
+                    self.stats["rejected"] += 1
+                    _OUTCOMES.labels("rejected").inc()
+                    tail = b""
+                    break
+                lines = [line for line in lines if line.strip()]
+                if lines:
+                    await self._ingest_lines(lines)
+            if tail.strip():
+                await self._ingest_lines([tail])
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _ingest_lines(self, lines: List[bytes]) -> None:
+        events, errors = decode_events(b"\n".join(lines))
+        self.stats["rejected"] += len(errors)
+        _OUTCOMES.labels("rejected").inc(len(errors))
+        if events:
+            await self._enqueue(events)
+
+    def _ingest_datagram(self, data: bytes) -> None:
+        if len(data) > self.max_line_bytes:
+            self.stats["rejected"] += 1
+            _OUTCOMES.labels("rejected").inc()
+            return
+        events, errors = decode_events(data)
+        self.stats["rejected"] += len(errors)
+        _OUTCOMES.labels("rejected").inc(len(errors))
+        if not events:
+            return
+        try:
+            self._queue.put_nowait(events)
+            self.stats["accepted"] += len(events)
+            _OUTCOMES.labels("accepted").inc(len(events))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += len(events)
+            _OUTCOMES.labels("dropped").inc(len(events))
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server: IngestServer) -> None:
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.server._ingest_datagram(data)
+
+def run_server(handler: ErrorHandler, cfg: Dict[str, Any]) -> None:
+    """Run the ingest server from the "server" settings until interrupted."""
+    server = IngestServer(
+        handler,
+        host=cfg.get("host", "127.0.0.1"),
+        port=int(cfg.get("port", 8765)),
+        tcp_port=cfg.get("tcp_port"),
+        udp_port=cfg.get("udp_port"),
+        max_body_bytes=int(cfg.get("max_body_bytes", 1 << 20)),
+        max_line_bytes=int(cfg.get("max_line_bytes", 1 << 16)),
+        queue_batches=int(cfg.get("queue_batches", 64)),
+        batch_size=int(cfg.get("batch_size", 500)),
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
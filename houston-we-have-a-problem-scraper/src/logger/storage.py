@@ -1,8 +1,15 @@
+import csv
+import os
+import shutil
+import time
 from pathlib import Path
-from typing import Dict, Any, Iterable, List
+from typing import Dict, Any, Iterable, List, Sequence
 import json
 
 from ..utils.file_utils import append_csv, ensure_dir
+from ..utils.metrics import METRICS
+from .rollups import RollupStore
+from .trace_store import TraceStore
 
 CSV_HEADER = [
     "timestamp",
@@ -15,25 +22,99 @@ CSV_HEADER = [
     "device",
     "resolved",
     "stackTrace",
+    "occurrences",
+    "firstSeen",
+    "lastSeen",
 ]
+# Archives written before dedup (see dedup.py) have only these columns;
+# their rows count as one occurrence seen at `timestamp`.
+BASE_COLUMNS = len(CSV_HEADER) - 3
+
+WRITE_SECONDS = METRICS.histogram("houston_storage_write_seconds", "Time per storage write call", ("backend",))
+ROWS_WRITTEN = METRICS.counter("houston_storage_rows_written_total", "Rows handed to storage", ("backend",))
+
+def occurrences(event: Dict[str, Any]) -> int:
+    """How many events a stored row stands for (1 unless it was deduplicated)."""
+    n = event.get("occurrences")
+    return int(n) if n not in (None, "") else 1
 
 class Storage:
     """
     Persists events to:
       - JSON lines file (optional)
       - CSV archive (required)
+      - trend rollups (optional), brought up to date with the archive on open
+
+    With a TraceStore, stack traces are written there once and archive and
+    JSONL rows carry a "trace:<hash>" reference instead; `stack_trace(row)`
+    resolves one when it is actually needed.
+
+    An archive written before dedup gets the full CSV_HEADER on open, so
+    DictReader consumers never see more fields than header columns; its
+    old rows simply leave occurrences/firstSeen/lastSeen empty.
     """
 
-    def __init__(self, csv_path: Path, jsonl_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        csv_path: Path,
+        jsonl_path: Path | None = None,
+        rollups: RollupStore | None = None,
+        traces: TraceStore | None = None,
+    ) -> None:
         self.csv_path = Path(csv_path)
         self.jsonl_path = Path(jsonl_path) if jsonl_path else None
+        self.rollups = rollups
+        self.traces = traces
         ensure_dir(self.csv_path.parent)
         if self.jsonl_path:
             ensure_dir(self.jsonl_path.parent)
+        grown = self._upgrade_header()
+        if self.rollups is not None:
+            if grown and self.rollups.watermark:
+                # Rows moved by the longer header; keep the watermark on a row boundary.
+                self.rollups.flush(watermark=self.rollups.watermark + grown)
+            self.rollups.sync(self.csv_path)
 
-    def write_event(self, event: Dict[str, Any]) -> None:
-        # CSV
-        row = [
+    def _upgrade_header(self) -> int:
+        """Rewrite a pre-dedup header to CSV_HEADER (atomically); returns how many bytes it grew."""
+        if not self.csv_path.exists():
+            return 0
+        with open(self.csv_path, "rb") as src:
+            first = src.readline()
+            line = first.rstrip(b"\r\n")
+            if line.decode("utf-8", "replace") != ",".join(CSV_HEADER[:BASE_COLUMNS]):
+                return 0
+            # csv.writer's line ending, also when the file is a bare header without one.
+            header = ",".join(CSV_HEADER).encode("utf-8") + (first[len(line):] or b"\r\n")
+            tmp_path = f"{self.csv_path}.tmp"
+            with open(tmp_path, "wb") as dst:
+                dst.write(header)
+                shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_path, self.csv_path)
+        return len(header) - len(first)
+
+    @property
+    def archive_path(self) -> Path:
+        """File holding the full event history."""
+        return self.csv_path
+
+    def _externalize(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Swap stack traces for trace store references (no-op without a store)."""
+        if self.traces is None:
+            return events
+        out = [dict(e, stackTrace=self.traces.put(e["stackTrace"])) if e["stackTrace"] else e for e in events]
+        # Traces reach the pack before any row that refers to them.
+        self.traces.flush()
+        return out
+
+    def stack_trace(self, row: Dict[str, Any]) -> str:
+        """The full stack trace of an archived row, read from the trace store if needed."""
+        value = row.get("stackTrace") or ""
+        return self.traces.get(value) if self.traces is not None else value
+
+    @staticmethod
+    def _csv_row(event: Dict[str, Any]) -> List[Any]:
+        return [
             event["timestamp"],
             event["severity"],
             event["errorType"],
@@ -44,23 +125,58 @@ class Storage:
             event["device"],
             str(event["resolved"]).lower(),
             event["stackTrace"].replace("\n", "\\n"),
+            occurrences(event),
+            event.get("firstSeen", event["timestamp"]),
+            event.get("lastSeen", event["timestamp"]),
         ]
-        append_csv(self.csv_path, [row], header=CSV_HEADER)
+
+    def write_event(self, event: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        event = self._externalize([event])[0]
+        # CSV
+        append_csv(self.csv_path, [self._csv_row(event)], header=CSV_HEADER)
 
         # JSONL
         if self.jsonl_path:
             with open(self.jsonl_path, "a", encoding="utf-8") as f:
                 f.write(json.dumps(event, ensure_ascii=False) + "\n")
 
+        if self.rollups is not None:
+            self.rollups.add(event["timestamp"], event["severity"], occurrences(event))
+        WRITE_SECONDS.labels("csv").observe(time.perf_counter() - started)
+        ROWS_WRITTEN.labels("csv").inc()
+
     def write_many(self, events: Iterable[Dict[str, Any]]) -> int:
-        count = 0
-        for e in events:
-            self.write_event(e)
-            count += 1
-        return count
-
-    def read_recent(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Return last N rows from CSV (naive, reads file tail)."""
+        """Write a batch with one open/append per file instead of one per event."""
+        started = time.perf_counter()
+        events = self._externalize(list(events))
+        if not events:
+            return 0
+        append_csv(self.csv_path, (self._csv_row(e) for e in events), header=CSV_HEADER)
+        if self.jsonl_path:
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+        if self.rollups is not None:
+            for e in events:
+                self.rollups.add(e["timestamp"], e["severity"], occurrences(e))
+        WRITE_SECONDS.labels("csv").observe(time.perf_counter() - started)
+        ROWS_WRITTEN.labels("csv").inc(len(events))
+        return len(events)
+
+    def flush(self) -> None:
+        """Persist rollups, marking everything archived so far as counted."""
+        if self.traces is not None:
+            self.traces.flush()
+        if self.rollups is not None:
+            size = self.csv_path.stat().st_size if self.csv_path.exists() else 0
+            self.rollups.flush(watermark=size)
+
+    def read_recent(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict[str, Any]]:
+        """
+        Return last N rows from CSV (naive, reads file tail).
+        `columns` is a projection hint for columnar backends; CSV rows always
+        come back whole.
+        """
         if not self.csv_path.exists():
             return []
         # Efficient tail read
@@ -70,12 +186,16 @@ class Storage:
             block = 4096
             data = b""
             lines = []
-            while file_size > 0 and len(lines) <= limit:
+            # limit rows, plus the partial first line and the empty one after the last newline.
+            while file_size > 0 and len(lines) <= limit + 1:
                 step = min(block, file_size)
                 file_size -= step
                 f.seek(file_size)
                 data = f.read(step) + data
                 lines = data.split(b"\n")
+            if file_size > 0:
+                # The block boundary cut the first line.
+                lines = lines[1:]
             # Drop header if present
             text_lines = [l.decode("utf-8") for l in lines if l.strip()]
         if not text_lines:
@@ -85,12 +205,9 @@ class Storage:
             text_lines = text_lines[1:]
         # Keep last N
         text_lines = text_lines[-limit:]
-        # Parse CSV minimally (split by comma), stackTrace may contain escaped \n but commas should be safe (message stripped)
         records = []
-        for line in text_lines:
-            cols = line.split(",")
-            if len(cols) < len(CSV_HEADER):
+        for row in csv.reader(text_lines):
+            if len(row) < BASE_COLUMNS:
                 continue
-            record = {CSV_HEADER[i]: ",".join(cols[i:]) if i == len(CSV_HEADER) - 1 else cols[i] for i in range(len(CSV_HEADER))}
-            records.append(record)
-        return records
\ No newline at end of file
+            records.append(dict(zip(CSV_HEADER, row)))
+        return records
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import os
+import re
+import struct
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Tuple
+
+from ..utils.file_utils import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+# Archive rows hold "trace:<hash>" in place of the stack trace text.
+TRACE_REF_PREFIX = "trace:"
+_TRACE_REF = re.compile(re.escape(TRACE_REF_PREFIX) + "[0-9a-f]{32}")
+
+# Pack record: 16-byte blake2b digest, flags, payload length, payload.
+_RECORD = struct.Struct("<16sBI")
+_ZLIB = 1
+# Traces shorter than this are rarely worth a zlib header.
+_MIN_COMPRESS = 128
+
+def is_trace_ref(value: Any) -> bool:
+    return isinstance(value, str) and _TRACE_REF.fullmatch(value) is not None
+
+class TraceStore:
+    """
+    Content-addressed, append-only store for stack traces.
+
+    `put(trace)` writes a trace once (zlib-compressed when `compress` is on
+    and it helps) and returns its reference; repeats only cost a hash
+    lookup. Every non-empty trace is stored, including one that happens to
+    look like a reference, so a row never carries a reference the store
+    did not issue. `get(ref)` returns the text, reading and decompressing
+    it on first use and keeping the last `cache_size` traces in memory.
+    Values that are not references (stack traces in rows written without a
+    store) and references the pack does not hold are returned unchanged.
+
+    The pack is a single file of records; the index is rebuilt from the
+    record headers on open, and a record torn by a crash is cut off before
+    the first new write. One process writes a pack at a time.
+    `stats` counts puts, stored (new traces), bytes_in and bytes_stored.
+    """
+
+    def __init__(self, path: Path, compress: bool = True, cache_size: int = 256) -> None:
+        self.path = Path(path)
+        self.compress = compress
+        self.cache_size = cache_size
+        self.index: Dict[bytes, Tuple[int, int, int]] = {}
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._writer: BinaryIO | None = None
+        self._end = 0
+        self.stats = Counter()
+        ensure_dir(self.path.parent)
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            pos = self._end
+            f.seek(pos)
+            while pos + _RECORD.size <= size:
+                digest, flags, length = _RECORD.unpack(f.read(_RECORD.size))
+                if pos + _RECORD.size + length > size:
+                    break
+                self.index[digest] = (pos + _RECORD.size, length, flags)
+                pos += _RECORD.size + length
+                f.seek(pos)
+        self._end = pos
+
+    def put(self, trace: str) -> str:
+        """Store `trace` if new and return its reference ("" for no trace)."""
+        if not trace:
+            return trace
+        self.stats["puts"] += 1
+        raw = trace.encode("utf-8")
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if digest not in self.index:
+            flags, payload = 0, raw
+            if self.compress and len(raw) >= _MIN_COMPRESS:
+                packed = zlib.compress(raw, 6)
+                if len(packed) < len(raw):
+                    flags, payload = _ZLIB, packed
+            if self._writer is None:
+                self._open_writer()
+            self._writer.write(_RECORD.pack(digest, flags, len(payload)) + payload)
+            self.index[digest] = (self._end + _RECORD.size, len(payload), flags)
+            self._end += _RECORD.size + len(payload)
+            self.stats["stored"] += 1
+            self.stats["bytes_in"] += len(raw)
+            self.stats["bytes_stored"] += len(payload)
+        return TRACE_REF_PREFIX + digest.hex()
+
+    def _open_writer(self) -> None:
+        self._load()
+        if self.path.exists() and self.path.stat().st_size > self._end:
+            # Torn tail from an interrupted write: appends must start on a record boundary.
+            os.truncate(self.path, self._end)
+        self._writer = open(self.path, "ab")
+
+    def get(self, ref: str) -> str:
+        """The stack trace for `ref` (`ref` itself if the store does not have it)."""
+        if not is_trace_ref(ref):
+            return ref
+        digest = bytes.fromhex(ref[len(TRACE_REF_PREFIX):])
+        cached = self._cache.get(digest)
+        if cached is not None:
+            self._cache.move_to_end(digest)
+            return cached
+        self.flush()
+        if digest not in self.index:
+            # Possibly written by another process since we opened the pack.
+            self._load()
+        if digest not in self.index:
+            logger.warning("Trace %s not found in %s", ref, self.path)
+            return ref
+        offset, length, flags = self.index[digest]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            payload = f.read(length)
+        text = (zlib.decompress(payload) if flags & _ZLIB else payload).decode("utf-8")
+        self._cache[digest] = text
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
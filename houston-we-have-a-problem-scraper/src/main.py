@@ -1,24 +1,32 @@
 import argparse
+import atexit
 import json
 import os
 import sys
 from pathlib import Path
 from typing import List, Dict, Any
 
-# Allow absolute-style imports from src/
-CURRENT_DIR = Path(__file__).parent
+# Allow package imports (src.*) when run as a script; the subpackages use
+# relative imports between each other, so they must not be top-level.
+CURRENT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = CURRENT_DIR.parent
-if str(CURRENT_DIR) not in sys.path:
-    sys.path.insert(0, str(CURRENT_DIR))
-
-from utils.file_utils import list_files, read_json  # noqa: E402
-from utils.time_utils import utc_now_iso  # noqa: E402
-from logger.storage import Storage  # noqa: E402
-from logger.handler import ErrorHandler  # noqa: E402
-from alerts.email_notifier import EmailNotifier  # noqa: E402
-from alerts.webhook_notifier import WebhookNotifier  # noqa: E402
-from analyzers.pattern_detector import top_patterns, severity_breakdown  # noqa: E402
-from analyzers.trend_reporter import daily_trends, write_trend_csv  # noqa: E402
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.utils.file_utils import list_files, read_json  # noqa: E402
+from src.utils.manifest import IngestManifest  # noqa: E402
+from src.utils.metrics import METRICS  # noqa: E402
+from src.utils.registry import ANALYZERS, DETECTORS, NOTIFIERS, PROFILERS, REDUCERS, SERVERS, STORAGE_BACKENDS  # noqa: E402
+from src.utils.time_utils import utc_now_iso  # noqa: E402
+from src.logger.rollups import RollupStore  # noqa: E402
+from src.logger.trace_store import TraceStore  # noqa: E402
+from src.logger.formatter import observe_normalize  # noqa: E402
+from src.logger.handler import ErrorHandler  # noqa: E402
+from src.logger.loader import NDJSON_SUFFIXES, load_inputs  # noqa: E402
+
+# Notifiers, storage backends, detectors and analyzers are looked up by name
+# in src.utils.registry and only imported when the settings enable them.
+DEFAULT_ANALYZERS = ["top_patterns", "severity_breakdown", "trends"]
 
 def load_settings(path: Path) -> Dict[str, Any]:
     if not path.exists():
@@ -31,68 +39,249 @@ def build_handler(cfg: Dict[str, Any]) -> ErrorHandler:
     if jsonl_path:
         jsonl_path = ROOT_DIR / jsonl_path
 
-    storage = Storage(csv_path=archive_csv, jsonl_path=jsonl_path)
+    rollup_cfg = cfg.get("rollups", {})
+    rollups = None
+    if rollup_cfg.get("enabled", False):
+        rollups = RollupStore(
+            ROOT_DIR / rollup_cfg.get("path", "data/archives/rollups.json"),
+            minute_retention_days=int(rollup_cfg.get("minute_retention_days", 7)),
+            hour_retention_days=int(rollup_cfg.get("hour_retention_days", 90)),
+        )
+
+    trace_cfg = cfg.get("trace_store", {})
+    traces = None
+    if trace_cfg.get("enabled", False):
+        traces = TraceStore(
+            ROOT_DIR / trace_cfg.get("path", "data/archives/traces.pack"),
+            compress=bool(trace_cfg.get("compress", True)),
+        )
+
+    storage_cfg = dict(cfg.get("storage", {}))
+    storage_cls = STORAGE_BACKENDS.load(storage_cfg.pop("backend", "csv"))
+    # Remaining keys are backend options (e.g. block_rows for "columnar").
+    storage = storage_cls(csv_path=archive_csv, jsonl_path=jsonl_path, rollups=rollups, traces=traces, **storage_cfg)
 
     email_cfg = cfg.get("email", {})
-    email_notifier = EmailNotifier(
-        host=email_cfg.get("host", ""),
-        port=int(email_cfg.get("port", 587)),
-        username=email_cfg.get("username") or None,
-        password=email_cfg.get("password") or None,
-        from_addr=email_cfg.get("from", ""),
-        to_addr=email_cfg.get("to", ""),
-        use_tls=bool(email_cfg.get("use_tls", True)),
-        enabled=bool(email_cfg.get("enabled", False)),
-    )
+    email_notifier = None
+    if email_cfg.get("enabled", False):
+        email_notifier = NOTIFIERS.load("email")(
+            host=email_cfg.get("host", ""),
+            port=int(email_cfg.get("port", 587)),
+            username=email_cfg.get("username") or None,
+            password=email_cfg.get("password") or None,
+            from_addr=email_cfg.get("from", ""),
+            to_addr=email_cfg.get("to", ""),
+            use_tls=bool(email_cfg.get("use_tls", True)),
+            enabled=True,
+        )
 
     webhook_cfg = cfg.get("webhook", {})
-    webhook_notifier = WebhookNotifier(
-        url=webhook_cfg.get("url", ""),
-        enabled=bool(webhook_cfg.get("enabled", False)),
-    )
+    webhook_notifier = None
+    if webhook_cfg.get("enabled", False):
+        webhook_notifier = NOTIFIERS.load("webhook")(
+            url=webhook_cfg.get("url", ""),
+            enabled=True,
+        )
+
+    anomaly_cfg = cfg.get("anomaly_detection", {})
+    anomaly_detector = None
+    if anomaly_cfg.get("enabled", False):
+        anomaly_detector = DETECTORS.load("windowed_anomaly")(
+            bucket_seconds=float(anomaly_cfg.get("bucket_seconds", 60)),
+            alpha=float(anomaly_cfg.get("alpha", 0.1)),
+            z_threshold=float(anomaly_cfg.get("z_threshold", 3.0)),
+            min_count=int(anomaly_cfg.get("min_count", 5)),
+            warmup_buckets=int(anomaly_cfg.get("warmup_buckets", 5)),
+            max_keys=int(anomaly_cfg.get("max_keys", 10000)),
+            key_fields=("errorType", "sourceFile"),
+        )
+
+    dedup_cfg = cfg.get("dedup", {})
+    dedup = None
+    if dedup_cfg.get("enabled", False):
+        dedup = REDUCERS.load("dedup")(
+            window_seconds=float(dedup_cfg.get("window_seconds", 300)),
+            max_keys=int(dedup_cfg.get("max_keys", 10000)),
+        )
+
+    sampling_cfg = cfg.get("sampling", {})
+    sampler = None
+    if sampling_cfg.get("enabled", False):
+        sampler = REDUCERS.load("sampler")(
+            budgets={sev: float(v) for sev, v in sampling_cfg.get("budgets", {"warning": 500, "info": 200}).items()},
+            window_seconds=float(sampling_cfg.get("window_seconds", 1.0)),
+        )
 
     thresholds = cfg.get("alert_thresholds", {"critical": 1, "error": 10, "warning": 50})
-    return ErrorHandler(storage, email_notifier, webhook_notifier, thresholds)
+    return ErrorHandler(storage, email_notifier, webhook_notifier, thresholds, anomaly_detector, dedup, sampler)
+
+# Events ingested between manifest saves. Every save first flushes the
+# handler, so the manifest never lists a file whose rows are still buffered
+# (columnar blocks, dedup windows); a crash re-ingests at most this many.
+CHECKPOINT_EVENTS = 10000
 
-def ingest_from_dir(handler: ErrorHandler, input_dir: Path) -> int:
+def ingest_from_dir(
+    handler: ErrorHandler,
+    input_dir: Path,
+    manifest: IngestManifest | None = None,
+    workers: int | None = None,
+) -> int:
     """
     Reads all .json files in input_dir and ingests them as error events.
     Files may contain either a single event object or an array of events.
+    .jsonl/.ndjson files hold one event per line.
+
+    With a manifest, files already ingested are skipped, append-only files
+    resume from the last ingested byte, and progress is saved every
+    CHECKPOINT_EVENTS events, each time after flushing the handler. The
+    handler is flushed again at the end.
+
+    With workers > 1, files are read, decoded and normalized in a process
+    pool; this process stays the only writer and ingests the batches in file
+    order, so archive order and alert thresholds behave as in a serial run.
     """
     count = 0
+    own_output = handler.storage.jsonl_path.resolve() if handler.storage.jsonl_path else None
     files = list_files(input_dir, ".json")
+    for suffix in NDJSON_SUFFIXES:
+        files += [p for p in list_files(input_dir, suffix) if p.resolve() != own_output]
+
+    tasks = []
     for jf in files:
         try:
-            data = read_json(jf)
-            if isinstance(data, list):
-                for ev in data:
-                    handler.ingest(ev)
-                    count += 1
-            elif isinstance(data, dict):
-                handler.ingest(data)
-                count += 1
-            else:
-                print(f"[WARN] Unsupported JSON structure in {jf.name}")
+            if manifest is None:
+                tasks.append((jf, 0, None, False))
+            elif not manifest.unchanged(jf):
+                entry = manifest.get(jf) or {}
+                offset = manifest.resume_offset(jf) if jf.suffix in NDJSON_SUFFIXES else 0
+                tasks.append((jf, offset, entry.get("sha256"), True))
         except Exception as e:
             print(f"[ERROR] Failed to ingest {jf.name}: {e}")
+
+    unsaved = 0
+    for result in load_inputs(tasks, workers):
+        jf = result["path"]
+        for warning in result["warnings"]:
+            print(warning)
+        error = result["error"]
+        observe_normalize(result["normalize_seconds"], len(result["events"]))
+        try:
+            for ev in result["events"]:
+                handler.ingest_normalized(ev)
+                count += 1
+        except Exception as e:
+            error = error or str(e)
+        if error:
+            print(f"[ERROR] Failed to ingest {jf.name}: {error}")
+            continue
+        if manifest is not None:
+            # Also re-stamps files that were touched but not modified (skipped)
+            manifest.record(
+                jf,
+                sha256=result["sha256"],
+                offset=result["offset"],
+                size=result["size"],
+                mtime=result["mtime"],
+            )
+            unsaved += len(result["events"])
+            if unsaved >= CHECKPOINT_EVENTS:
+                handler.flush()
+                manifest.save()
+                unsaved = 0
+    handler.flush()
+    if manifest is not None:
+        manifest.save()
     return count
 
-def generate_reports(cfg: Dict[str, Any], storage: Storage) -> None:
-    recent_n = int(cfg.get("report", {}).get("recent_sample", 200))
-    recent = storage.read_recent(limit=recent_n)
-    patterns = top_patterns(recent, top_n=5)
-    sev = severity_breakdown(recent)
-    trend_rows = daily_trends(recent)
-    trend_path = ROOT_DIR / cfg.get("report", {}).get("trend_csv", "data/archives/daily_trends.csv")
-    write_trend_csv(trend_path, trend_rows)
+def generate_full_history_report(cfg: Dict[str, Any], storage, workers: int | None = None) -> None:
+    report_cfg = cfg.get("report", {})
+    history_cfg = report_cfg.get("full_history", {})
+    cache = history_cfg.get("cache")
+    storage.flush()
+    result = ANALYZERS.load("full_history")(
+        storage.archive_path,
+        cache_path=ROOT_DIR / cache if cache else None,
+        workers=workers or history_cfg.get("workers"),
+        partition_bytes=int(history_cfg.get("partition_mb", 64)) * 1024 * 1024,
+        top_n=5,
+    )
+    trend_path = ROOT_DIR / report_cfg.get("trend_csv", "data/archives/daily_trends.csv")
+    ANALYZERS.load("write_trend_csv")(trend_path, result["trends"])
+
+    print("=== Houston Full-History Summary ===")
+    print(f"Generated at: {utc_now_iso()}")
+    print(f"Events: {result['rows']} in {result['partitions']} partition(s), {result['cached']} from cache")
+    print("Severity breakdown:", json.dumps(result["severity"], indent=2))
+    print("Top patterns:", json.dumps(result["patterns"], indent=2))
+    print(f"Trend CSV updated: {trend_path}")
+
+def generate_reports(cfg: Dict[str, Any], storage) -> None:
+    report_cfg = cfg.get("report", {})
+    enabled = report_cfg.get("analyzers", DEFAULT_ANALYZERS)
+    recent_n = int(report_cfg.get("recent_sample", 200))
+    sample_analyzers = [ANALYZERS.load(name) for name in ("top_patterns", "severity_breakdown") if name in enabled]
+    # Columnar storage decodes only the fields the enabled analyzers read.
+    columns = sorted({c for fn in sample_analyzers for c in fn.columns}) or None
+    recent = storage.read_recent(limit=recent_n, columns=columns)
+
+    patterns = sev = trend_path = None
+    if "top_patterns" in enabled:
+        patterns = ANALYZERS.load("top_patterns")(recent, top_n=5)
+    if "severity_breakdown" in enabled:
+        sev = ANALYZERS.load("severity_breakdown")(recent)
+    if "trends" in enabled:
+        if storage.rollups is not None:
+            trend_rows = ANALYZERS.load("rollup_trends")(storage.rollups, report_cfg.get("trend_granularity", "day"))
+        elif hasattr(storage, "scan"):
+            # Full history from the timestamp/severity columns only.
+            daily_trends = ANALYZERS.load("daily_trends")
+            trend_rows = daily_trends(storage.scan(columns=daily_trends.columns))
+        else:
+            trend_rows = ANALYZERS.load("daily_trends")(recent)
+        trend_path = ROOT_DIR / report_cfg.get("trend_csv", "data/archives/daily_trends.csv")
+        ANALYZERS.load("write_trend_csv")(trend_path, trend_rows)
 
     # Print a compact summary to stdout
     print("=== Houston Summary ===")
     print(f"Generated at: {utc_now_iso()}")
     print(f"Recent sample size: {len(recent)}")
-    print("Severity breakdown:", json.dumps(sev, indent=2))
-    print("Top patterns:", json.dumps(patterns, indent=2))
-    print(f"Trend CSV updated: {trend_path}")
+    if sev is not None:
+        print("Severity breakdown:", json.dumps(sev, indent=2))
+    if patterns is not None:
+        print("Top patterns:", json.dumps(patterns, indent=2))
+    if trend_path is not None:
+        print(f"Trend CSV updated: {trend_path}")
+
+def run_log_detection(cfg: Dict[str, Any]) -> int:
+    """
+    Classify and anomaly-scan `log_file` with the configured severity_mapping,
+    severity_keywords and anomaly_threshold, writing the issues to
+    output.json (and output.csv) in output.format, gzipped with
+    output.compress and split at output.max_bytes. An output.export section
+    (IssueExporter settings) adds a timestamped export from the same pass.
+    Returns the number of issues.
+    """
+    output = cfg.get("output", {})
+    csv_path = output.get("csv")
+    export = output.get("export")
+    if export is not None:
+        export = {**export, "output_dir": str(ROOT_DIR / export.get("output_dir", "exports"))}
+    max_bytes = output.get("max_bytes")
+    return DETECTORS.load("pipeline")(
+        str(ROOT_DIR / cfg.get("log_file", "data/sample_logs.txt")),
+        ROOT_DIR / output.get("json", "data/results.json"),
+        ROOT_DIR / csv_path if csv_path else None,
+        severity_mapping=cfg.get("severity_mapping"),
+        anomaly_threshold=int(cfg.get("anomaly_threshold", 3)),
+        severity_keywords=cfg.get("severity_keywords"),
+        fmt=output.get("format", "json"),
+        compress=bool(output.get("compress", False)),
+        max_bytes=int(max_bytes) if max_bytes else None,
+        export=export,
+    )
+
+def _no_stage(name: str) -> None:
+    """Stage marker used when --profile is off."""
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Houston Error Monitor")
@@ -111,25 +300,103 @@ def main() -> None:
         action="store_true",
         help="Generate analytics reports (severity breakdown, trends)",
     )
+    parser.add_argument(
+        "--reingest",
+        action="store_true",
+        help="Ignore the ingest manifest and ingest every input file again",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Decode and normalize input files in N worker processes",
+    )
+    parser.add_argument(
+        "--full-history",
+        action="store_true",
+        help="Report over the whole archive (map-reduce, cached per partition) instead of the recent sample",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Accept events over HTTP (and optional TCP/UDP) until interrupted",
+    )
+    parser.add_argument(
+        "--detect",
+        action="store_true",
+        help="Classify and anomaly-scan the configured log_file into the output reports",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="data/profile",
+        metavar="DIR",
+        help="Profile the run (cProfile + tracemalloc per stage) and write the results to DIR",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        help="Functions and allocation sites listed per profile section",
+    )
     args = parser.parse_args()
 
+    stage = _no_stage
+    if args.profile:
+        profiler = PROFILERS.load("cprofile")(ROOT_DIR / args.profile, top_n=args.profile_top, base=ROOT_DIR).start()
+        stage = profiler.stage
+        atexit.register(lambda: print(f"[INFO] Profile written to {profiler.stop()}"))
+
     cfg = load_settings(Path(args.config))
+    metrics_cfg = cfg.get("metrics", {})
+    if metrics_cfg.get("enabled", False):
+        host, port = metrics_cfg.get("host", "127.0.0.1"), int(metrics_cfg.get("port", 9108))
+        METRICS.serve(host, port)
+        print(f"[INFO] Metrics at http://{host}:{port}/metrics")
+    if metrics_cfg.get("dump_json"):
+        atexit.register(METRICS.dump_json, ROOT_DIR / metrics_cfg["dump_json"])
     handler = build_handler(cfg)
+    manifest = None
+    if cfg.get("ingest_manifest"):
+        manifest = IngestManifest(ROOT_DIR / cfg["ingest_manifest"])
+        if args.reingest:
+            manifest.files.clear()
+    stage("setup")
+
+    if args.serve:
+        server_cfg = cfg.get("server", {})
+        print(f"[INFO] Serving on {server_cfg.get('host', '127.0.0.1')}:{server_cfg.get('port', 8765)}")
+        SERVERS.load("ingest")(handler, server_cfg)
+        stage("serve")
+        return
+
+    if args.detect:
+        n = run_log_detection(cfg)
+        print(f"[INFO] Detected {n} issue(s) in {ROOT_DIR / cfg.get('log_file', 'data/sample_logs.txt')}")
+        stage("detect")
+        return
 
     if args.ingest:
         input_dir = ROOT_DIR / cfg.get("log_input_dir", "data/logs")
-        n = ingest_from_dir(handler, input_dir)
+        n = ingest_from_dir(handler, input_dir, manifest, args.workers)
         print(f"[INFO] Ingested {n} event(s) from {input_dir}")
+        stage("ingest")
 
-    if args.report:
+    if args.full_history:
+        generate_full_history_report(cfg, handler.storage, args.workers)
+        stage("report")
+    elif args.report:
         generate_reports(cfg, handler.storage)
+        stage("report")
 
-    if not args.ingest and not args.report:
+    if not args.ingest and not args.report and not args.full_history:
         # Default action: ingest then report
         input_dir = ROOT_DIR / cfg.get("log_input_dir", "data/logs")
-        n = ingest_from_dir(handler, input_dir)
+        n = ingest_from_dir(handler, input_dir, manifest, args.workers)
         print(f"[INFO] Ingested {n} event(s) from {input_dir}")
+        stage("ingest")
         generate_reports(cfg, handler.storage)
+        stage("report")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
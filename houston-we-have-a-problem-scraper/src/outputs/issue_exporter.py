@@ -1,13 +1,62 @@
-import json
 import os
+import time
+from pathlib import Path
+
+from .report_generator import REPORT_FIELDS
+from .stream_writer import StreamWriter
 
 class IssueExporter:
     def __init__(self, settings):
         self.output_dir = settings.get("output_dir", "exports")
+        # strftime patterns are expanded per export, e.g. "issues_%Y%m%d.json"
+        self.filename = settings.get("export_filename", "issues_report.json")
+        self.format = settings.get("export_format", "json")
+        self.csv = settings.get("export_csv", False)
+        self.compress = settings.get("export_compress", False)
+        self.max_bytes = settings.get("export_max_bytes")
         os.makedirs(self.output_dir, exist_ok=True)
 
+    def open(self):
+        """
+        Start an export: returns the StreamWriters to write each issue to and
+        to pass to finish() (or abort() on failure).
+        """
+        output_path = Path(self.output_dir) / time.strftime(self.filename)
+        outputs = [StreamWriter(output_path, self.format, compress=self.compress, max_bytes=self.max_bytes)]
+        if self.csv:
+            outputs.append(
+                StreamWriter(
+                    output_path.with_suffix(".csv"),
+                    "csv",
+                    fieldnames=REPORT_FIELDS,
+                    compress=self.compress,
+                    max_bytes=self.max_bytes,
+                )
+            )
+        return outputs
+
+    def finish(self, outputs):
+        """Close the writers from open() and return the paths written."""
+        written = [path for out in outputs for path in out.close()]
+        print(f"Issues exported to {', '.join(map(str, written))}")
+        return written
+
+    @staticmethod
+    def abort(outputs):
+        for out in outputs:
+            out.abort()
+
     def export(self, issues):
-        output_path = os.path.join(self.output_dir, "issues_report.json")
-        with open(output_path, "w") as f:
-            json.dump(issues, f, indent=2)
-        print(f"Issues exported to {output_path}")
\ No newline at end of file
+        """
+        Stream `issues` (any iterable) to the export file(s) in one pass.
+        Returns the paths written.
+        """
+        outputs = self.open()
+        try:
+            for issue in issues:
+                for out in outputs:
+                    out.write(issue)
+            return self.finish(outputs)
+        except Exception:
+            self.abort(outputs)
+            raise
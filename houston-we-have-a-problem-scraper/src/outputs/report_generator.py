@@ -1,8 +1,8 @@
-import csv
-import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Optional
+
+from .stream_writer import StreamWriter
 
 logger = logging.getLogger(__name__)
 
@@ -17,48 +17,52 @@ REPORT_FIELDS = [
     "context",
 ]
 
-def _ensure_parent_dir(path: Path) -> None:
-    if not path.parent.exists():
-        path.parent.mkdir(parents=True, exist_ok=True)
-
 def generate_report(
     issues: Iterable[Dict[str, Any]],
     json_path: Path,
     csv_path: Optional[Path] = None,
-) -> None:
+    fmt: str = "json",
+    compress: bool = False,
+    max_bytes: int | None = None,
+) -> int:
     """
     Generate structured JSON (and optional CSV) reports for detected issues.
 
     JSON:
         List of issue objects containing the fields defined in REPORT_FIELDS
-        plus any extra metadata that may exist.
+        plus any extra metadata that may exist. fmt="ndjson" writes one
+        object per line instead of an array.
 
     CSV:
         Flat table containing the fields from REPORT_FIELDS.
-    """
-    issues_list: List[Dict[str, Any]] = list(issues)
 
-    # JSON report
-    _ensure_parent_dir(json_path)
+    Both files are written incrementally from a single pass over `issues`, so
+    a generator is never materialized, and only replace the previous reports
+    once complete. `compress` gzips them and `max_bytes` splits them into
+    numbered parts (see StreamWriter). Returns the number of issues written.
+    """
+    json_out = StreamWriter(json_path, fmt=fmt, compress=compress, max_bytes=max_bytes)
+    csv_out = (
+        StreamWriter(csv_path, fmt="csv", fieldnames=REPORT_FIELDS, compress=compress, max_bytes=max_bytes)
+        if csv_path
+        else None
+    )
     try:
-        with json_path.open("w", encoding="utf-8") as jf:
-            json.dump(issues_list, jf, indent=2, ensure_ascii=False)
-        logger.info("Wrote JSON report with %d issues to %s", len(issues_list), json_path)
-    except OSError as e:
-        logger.error("Failed to write JSON report to %s: %s", json_path, e)
+        for issue in issues:
+            json_out.write(issue)
+            if csv_out is not None:
+                csv_out.write(issue)
+        json_files = json_out.close()
+        csv_files = csv_out.close() if csv_out is not None else []
+    except Exception as e:
+        json_out.abort()
+        if csv_out is not None:
+            csv_out.abort()
+        if isinstance(e, OSError):
+            logger.error("Failed to write report to %s (csv: %s): %s", json_path, csv_path, e)
         raise
 
-    # CSV report
-    if csv_path:
-        _ensure_parent_dir(csv_path)
-        try:
-            with csv_path.open("w", encoding="utf-8", newline="") as cf:
-                writer = csv.DictWriter(cf, fieldnames=REPORT_FIELDS)
-                writer.writeheader()
-                for issue in issues_list:
-                    row = {field: issue.get(field, "") for field in REPORT_FIELDS}
-                    writer.writerow(row)
-            logger.info("Wrote CSV report to %s", csv_path)
-        except OSError as e:
-            logger.error("Failed to write CSV report to %s: %s", csv_path, e)
-            raise
\ No newline at end of file
+    logger.info("Wrote %s report with %d issues to %s", fmt.upper(), json_out.count, ", ".join(map(str, json_files)))
+    if csv_files:
+        logger.info("Wrote CSV report to %s", ", ".join(map(str, csv_files)))
+    return json_out.count
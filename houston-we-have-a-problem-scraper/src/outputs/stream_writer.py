@@ -0,0 +1,159 @@
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, IO, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("json", "ndjson", "csv")
+
+def json_array_item(item: Dict[str, Any]) -> str:
+    # Same layout json.dump(list, indent=2) gives an element of the array.
+    return "\n".join("  " + line for line in json.dumps(item, indent=2, ensure_ascii=False).split("\n"))
+
+class StreamWriter:
+    """
+    Writes records one at a time as a JSON array, NDJSON or CSV file.
+
+    - Nothing is held in memory beyond the current record.
+    - Output goes to temporary files that are renamed into place by
+      `close()`, so readers never see a half-written export and a failed
+      export (`abort()`, or an exception inside a `with` block) leaves the
+      previous one untouched.
+    - `compress=True` gzips each file (".gz" is appended to the name).
+    - With `max_bytes`, a new part is started once the current one holds that
+      many (uncompressed) bytes; every part is a complete JSON array / NDJSON
+      / CSV file with its own header. A single part keeps the plain name,
+      several are named "<stem>.00001<suffix>", "<stem>.00002<suffix>", ...
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fmt: str = "json",
+        fieldnames: Sequence[str] | None = None,
+        compress: bool = False,
+        max_bytes: int | None = None,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(FORMATS)})")
+        if fmt == "csv" and not fieldnames:
+            raise ValueError("CSV exports need fieldnames")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.fieldnames = list(fieldnames or [])
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.count = 0
+        self._parts: List[Path] = []
+        self._fh: IO[str] | None = None
+        self._part_items = 0
+        self._part_bytes = 0
+        self._csv_buf = io.StringIO()
+        self._csv = csv.writer(self._csv_buf)
+
+    def __enter__(self) -> "StreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _open_part(self) -> None:
+        tmp = self.path.with_name(f"{self.path.name}.part{len(self._parts)}.tmp")
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            self._fh = gzip.open(tmp, "wt", encoding="utf-8", newline="")
+        else:
+            self._fh = open(tmp, "w", encoding="utf-8", newline="")
+        self._parts.append(tmp)
+        self._part_items = 0
+        self._part_bytes = 0
+        if self.fmt == "json":
+            self._emit("[")
+        elif self.fmt == "csv":
+            self._emit(self._csv_line(self.fieldnames))
+
+    def _close_part(self) -> None:
+        if self.fmt == "json":
+            self._emit("\n]" if self._part_items else "]")
+        self._fh.close()
+        self._fh = None
+
+    def _emit(self, text: str) -> None:
+        self._fh.write(text)
+        self._part_bytes += len(text.encode("utf-8"))
+
+    def _csv_line(self, values: Sequence[Any]) -> str:
+        self._csv_buf.seek(0)
+        self._csv_buf.truncate()
+        self._csv.writerow(values)
+        return self._csv_buf.getvalue()
+
+    def write(self, item: Dict[str, Any]) -> None:
+        if self._fh is None:
+            self._open_part()
+        elif self.max_bytes and self._part_items and self._part_bytes >= self.max_bytes:
+            self._close_part()
+            self._open_part()
+        if self.fmt == "json":
+            self._emit((",\n" if self._part_items else "\n") + json_array_item(item))
+        elif self.fmt == "ndjson":
+            self._emit(json.dumps(item, ensure_ascii=False) + "\n")
+        else:
+            self._emit(self._csv_line([item.get(field, "") for field in self.fieldnames]))
+        self._part_items += 1
+        self.count += 1
+
+    def _final_names(self) -> List[Path]:
+        suffix = ".gz" if self.compress else ""
+        if len(self._parts) == 1:
+            return [self.path.with_name(self.path.name + suffix)]
+        return [
+            self.path.with_name(f"{self.path.stem}.{i:05d}{self.path.suffix}{suffix}")
+            for i in range(1, len(self._parts) + 1)
+        ]
+
+    def close(self) -> List[Path]:
+        """Finish the last part and move every part into place; returns the final paths."""
+        if self._fh is None and not self._parts:
+            self._open_part()  # an empty export is still a valid (empty) file
+        if self._fh is not None:
+            self._close_part()
+        final = self._final_names()
+        for tmp, dest in zip(self._parts, final):
+            os.replace(tmp, dest)
+        self._remove_stale(final)
+        self._parts = []
+        return final
+
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        for tmp in self._parts:
+            try:
+                tmp.unlink()
+            except FileNotFoundError:
+                pass
+        self._parts = []
+
+    def _remove_stale(self, final: List[Path]) -> None:
+        # Parts left by an earlier, larger export would otherwise look current.
+        suffix = re.escape(".gz" if self.compress else "")
+        pattern = re.compile(
+            rf"{re.escape(self.path.stem)}(\.\d{{5}})?{re.escape(self.path.suffix)}{suffix}"
+        )
+        keep = {p.name for p in final}
+        for sibling in self.path.parent.iterdir():
+            if sibling.name not in keep and pattern.fullmatch(sibling.name):
+                logger.info("Removing stale export part %s", sibling)
+                sibling.unlink()
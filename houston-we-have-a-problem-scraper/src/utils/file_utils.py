@@ -1,5 +1,6 @@
 import json
 import csv
+import io
 import os
 from pathlib import Path
 from typing import Iterable, Dict, Any, Optional, List
@@ -28,6 +29,16 @@ def append_csv(path: str | Path, rows: Iterable[Iterable[Any]], header: Optional
         for r in rows:
             writer.writerow(list(r))
 
+def write_csv(path: str | Path, rows: Iterable[Iterable[Any]], header: Optional[List[str]] = None) -> None:
+    """Replace the file at `path` with `rows`, atomically."""
+    buf = io.StringIO(newline="")
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(header)
+    for r in rows:
+        writer.writerow(list(r))
+    atomic_write(path, buf.getvalue())
+
 def list_files(path: str | Path, suffix: str) -> list[Path]:
     base = Path(path)
     if not base.exists():
@@ -37,7 +48,7 @@ def list_files(path: str | Path, suffix: str) -> list[Path]:
 def atomic_write(path: str | Path, content: str) -> None:
     ensure_dir(Path(path).parent)
     tmp_path = f"{path}.tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
         f.write(content)
     os.replace(tmp_path, path)
 
@@ -0,0 +1,91 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from .file_utils import atomic_write, read_json
+
+# Bytes before the saved offset that are re-hashed to check that an
+# append-only file was only appended to (not rotated or rewritten).
+TAIL_BYTES = 4096
+
+def file_sha256(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def tail_sha256(path: str | Path, offset: int) -> str:
+    start = max(0, offset - TAIL_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+class IngestManifest:
+    """
+    Persisted record of what has been ingested from each input file:
+    path -> {size, mtime, sha256, offset, tail}.
+
+    - whole-document files (.json) are skipped while size/mtime match, or
+      when they changed on disk but their content hash did not;
+    - append-only files (.jsonl/.ndjson) are skipped while `offset` reaches
+      the end of the file and mtime matches, and otherwise resume from
+      `offset`, provided the bytes just before it are unchanged (`tail`);
+      if not, they are read again from the start.
+
+    size/mtime are those stat()ed before the file was read, so anything
+    written while it was being read shows up as a change on the next run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.files = read_json(self.path).get("files", {})
+
+    def get(self, path: Path) -> Dict[str, Any] | None:
+        return self.files.get(str(Path(path).resolve()))
+
+    def unchanged(self, path: Path) -> bool:
+        entry = self.get(path)
+        if entry is None:
+            return False
+        st = Path(path).stat()
+        if entry.get("offset") is not None:
+            return entry["offset"] == st.st_size and entry["mtime"] == st.st_mtime
+        return entry["size"] == st.st_size and entry["mtime"] == st.st_mtime
+
+    def resume_offset(self, path: Path) -> int:
+        """Offset to continue an append-only file from (0 if it was rewritten)."""
+        entry = self.get(path)
+        if not entry or not entry.get("offset"):
+            return 0
+        offset = entry["offset"]
+        if Path(path).stat().st_size < offset or tail_sha256(path, offset) != entry.get("tail"):
+            return 0
+        return offset
+
+    def record(
+        self,
+        path: Path,
+        sha256: str | None = None,
+        offset: int | None = None,
+        size: int | None = None,
+        mtime: float | None = None,
+    ) -> None:
+        """
+        Pass the `size`/`mtime` stat()ed before the file was read; they are
+        only looked up here when omitted.
+        """
+        if size is None or mtime is None:
+            st = Path(path).stat()
+            size, mtime = st.st_size, st.st_mtime
+        entry: Dict[str, Any] = {"size": size, "mtime": mtime, "sha256": sha256}
+        if offset is not None:
+            entry["offset"] = offset
+            entry["tail"] = tail_sha256(path, offset)
+        self.files[str(Path(path).resolve())] = entry
+
+    def save(self) -> None:
+        atomic_write(self.path, json.dumps({"files": self.files}, indent=2))
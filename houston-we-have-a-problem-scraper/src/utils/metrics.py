@@ -0,0 +1,203 @@
+import bisect
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .file_utils import atomic_write
+
+# Latency buckets in seconds, from sub-millisecond writes to slow SMTP sends.
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self) -> float:
+        return self.value
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def snapshot(self) -> float:
+        return self.value
+
+class Histogram:
+    """Fixed-bucket histogram; `observe` is one bisect and three adds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, count: int = 1) -> None:
+        """Record `value` (`count` times, e.g. a batch's per-item mean)."""
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += count
+            self.sum += value * count
+            self.count += count
+
+    def time(self) -> "_Timer":
+        """Context manager observing the elapsed seconds of its block."""
+        return _Timer(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = [], 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            cumulative.append(("+Inf" if bound == float("inf") else bound, running))
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.histogram.observe(time.perf_counter() - self.started)
+
+_KINDS = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}
+
+class Family:
+    """A metric with labels; `labels(*values)` returns (and caches) one child per value tuple."""
+
+    def __init__(self, kind: str, labelnames: Tuple[str, ...], **options: Any) -> None:
+        self.kind = kind
+        self.labelnames = labelnames
+        self.options = options
+        self.children: Dict[Tuple[str, ...], Any] = {}
+        # Lookups by the raw values, so hot paths skip the str() conversion.
+        self._by_values: Dict[Tuple[Any, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        child = self._by_values.get(values)
+        if child is None:
+            key = tuple(str(v) for v in values)
+            with self._lock:
+                child = self.children.setdefault(key, _KINDS[self.kind](**self.options))
+                self._by_values[values] = child
+        return child
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and latency histograms, rendered in the
+    Prometheus text format (`render_prometheus`, or `serve` for a scrape
+    endpoint) or as JSON (`to_dict`, `dump_json`). Registering the same
+    name twice returns the existing metric, so modules can declare theirs
+    at import time.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Tuple[str, str, Family]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind: str, name: str, help: str, labelnames: Sequence[str], **options: Any) -> Any:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = (kind, help, Family(kind, tuple(labelnames), **options))
+            existing_kind, _, family = self._metrics[name]
+        if existing_kind != kind:
+            raise ValueError(f"Metric '{name}' is already registered as a {existing_kind}")
+        return family if family.labelnames else family.labels()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Any:
+        return self._get("counter", name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Any:
+        return self._get("gauge", name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Any:
+        return self._get("histogram", name, help, labelnames, buckets=buckets)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for name, (kind, _, family) in sorted(self._metrics.items()):
+            samples = [
+                {"labels": dict(zip(family.labelnames, key)), "value": child.snapshot()}
+                for key, child in sorted(family.children.items())
+            ]
+            out[name] = {"type": kind, "samples": samples}
+        return out
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for name, (kind, help, family) in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, child in sorted(family.children.items()):
+                labels = list(zip(family.labelnames, key))
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {_number(child.snapshot())}")
+                    continue
+                snap = child.snapshot()
+                for bound, n in snap["buckets"]:
+                    lines.append(f"{name}_bucket{_labels(labels + [('le', str(bound))])} {n}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(snap['sum'])}")
+                lines.append(f"{name}_count{_labels(labels)} {snap['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: Path) -> None:
+        atomic_write(Path(path), json.dumps(self.to_dict(), indent=2))
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9108):
+        """Serve GET /metrics from a daemon thread; returns the HTTP server (call shutdown() to stop)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="houston-metrics", daemon=True).start()
+        return server
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+# Process-wide registry the ingestion path reports to.
+METRICS = MetricsRegistry()
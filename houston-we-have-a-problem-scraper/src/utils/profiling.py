@@ -0,0 +1,124 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .file_utils import atomic_write, ensure_dir
+
+def _site(path: str, base: Path | None) -> str:
+    # Paths relative to the project, so runs from different checkouts compare.
+    if base is not None:
+        try:
+            return str(Path(path).resolve().relative_to(base))
+        except ValueError:
+            pass
+    return path
+
+class Profiler:
+    """
+    cProfile plus tracemalloc for one CLI run.
+
+    `start()` begins both; `stage(name)` marks the end of a pipeline stage
+    and snapshots memory (current and peak traced bytes, elapsed time, the
+    largest allocation sites and the sites that grew most since the
+    previous stage); `stop()` writes to `out_dir`:
+
+      - profile.pstats: raw cProfile stats (pstats / snakeviz),
+      - hot_functions.json / hot_functions.txt: top `top_n` functions by
+        own and cumulative time,
+      - memory.json: one entry per stage.
+
+    File names are fixed and sites are "path:line" relative to `base`, so
+    two runs' outputs can be diffed directly.
+    """
+
+    def __init__(self, out_dir: Path, top_n: int = 25, frames: int = 1, base: Path | None = None) -> None:
+        self.out_dir = Path(out_dir)
+        self.top_n = top_n
+        self.frames = frames
+        self.base = Path(base).resolve() if base is not None else None
+        self.stages: List[Dict[str, Any]] = []
+        self._profile = cProfile.Profile()
+        self._previous: tracemalloc.Snapshot | None = None
+        self._started = 0.0
+        self._stage_started = 0.0
+
+    def start(self) -> "Profiler":
+        tracemalloc.start(self.frames)
+        self._started = self._stage_started = time.perf_counter()
+        self._previous = self._snapshot()
+        self._profile.enable()
+        return self
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def stage(self, name: str) -> None:
+        """Close the current stage as `name`."""
+        self._profile.disable()
+        now = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self._snapshot()
+        top = [
+            {"site": self._where(stat.traceback), "bytes": stat.size, "blocks": stat.count}
+            for stat in snapshot.statistics("lineno")[: self.top_n]
+        ]
+        growth = [
+            {"site": self._where(stat.traceback), "bytes": stat.size_diff, "blocks": stat.count_diff}
+            for stat in snapshot.compare_to(self._previous, "lineno")[: self.top_n]
+            if stat.size_diff > 0
+        ]
+        self.stages.append({
+            "stage": name,
+            "seconds": round(now - self._stage_started, 6),
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top_sites": top,
+            "growth_sites": growth,
+        })
+        self._previous = snapshot
+        tracemalloc.reset_peak()
+        self._stage_started = time.perf_counter()
+        self._profile.enable()
+
+    def _where(self, traceback: tracemalloc.Traceback) -> str:
+        frame = traceback[0]
+        return f"{_site(frame.filename, self.base)}:{frame.lineno}"
+
+    def hot_functions(self) -> Dict[str, List[Dict[str, Any]]]:
+        stats = pstats.Stats(self._profile)
+        rows = []
+        for (path, line, func), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{_site(path, self.base)}:{line}({func})",
+                "calls": calls,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            })
+        by_own = sorted(rows, key=lambda r: (-r["own_seconds"], r["function"]))[: self.top_n]
+        by_cumulative = sorted(rows, key=lambda r: (-r["cumulative_seconds"], r["function"]))[: self.top_n]
+        return {"own": by_own, "cumulative": by_cumulative}
+
+    def stop(self) -> Path:
+        """Stop profiling and write the outputs; returns `out_dir`."""
+        self._profile.disable()
+        tracemalloc.stop()
+        ensure_dir(self.out_dir)
+        self._profile.dump_stats(str(self.out_dir / "profile.pstats"))
+        hot = self.hot_functions()
+        atomic_write(self.out_dir / "hot_functions.json", json.dumps(hot, indent=2))
+        lines = [f"Total: {time.perf_counter() - self._started:.3f}s", "", "By own time:"]
+        lines += [f"  {r['own_seconds']:10.4f}s {r['calls']:>9} {r['function']}" for r in hot["own"]]
+        lines += ["", "By cumulative time:"]
+        lines += [f"  {r['cumulative_seconds']:10.4f}s {r['calls']:>9} {r['function']}" for r in hot["cumulative"]]
+        atomic_write(self.out_dir / "hot_functions.txt", "\n".join(lines) + "\n")
+        atomic_write(self.out_dir / "memory.json", json.dumps(self.stages, indent=2))
+        return self.out_dir
@@ -0,0 +1,68 @@
+import importlib
+from typing import Any, Dict
+
+# Top-level package ("src") that registry targets are relative to.
+_ROOT_PACKAGE = __package__.rpartition(".")[0]
+
+class Registry:
+    """
+    Name -> "module:attribute" table whose modules are imported on first
+    `load`, so optional components (and their heavy dependencies such as
+    requests or smtplib) cost nothing unless a run actually uses them.
+    Module paths are relative to the top-level package, e.g.
+    ".alerts.webhook_notifier:WebhookNotifier".
+    """
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+        self._targets: Dict[str, str] = {}
+        self._loaded: Dict[str, Any] = {}
+
+    def register(self, name: str, target: str) -> None:
+        self._targets[name] = target
+        self._loaded.pop(name, None)
+
+    def load(self, name: str) -> Any:
+        if name not in self._loaded:
+            if name not in self._targets:
+                raise KeyError(f"Unknown {self.kind} '{name}' (known: {', '.join(sorted(self._targets))})")
+            module_name, _, attr = self._targets[name].partition(":")
+            module = importlib.import_module(module_name, package=_ROOT_PACKAGE)
+            self._loaded[name] = getattr(module, attr)
+        return self._loaded[name]
+
+    def names(self) -> list[str]:
+        return list(self._targets)
+
+NOTIFIERS = Registry("notifier")
+NOTIFIERS.register("email", ".alerts.email_notifier:EmailNotifier")
+NOTIFIERS.register("webhook", ".alerts.webhook_notifier:WebhookNotifier")
+
+STORAGE_BACKENDS = Registry("storage backend")
+STORAGE_BACKENDS.register("csv", ".logger.storage:Storage")
+STORAGE_BACKENDS.register("columnar", ".logger.columnar:ColumnarStorage")
+
+# Thin the rows ErrorHandler stores; thresholds still see every event.
+REDUCERS = Registry("reducer")
+REDUCERS.register("dedup", ".logger.dedup:Deduplicator")
+REDUCERS.register("sampler", ".logger.sampler:AdaptiveSampler")
+
+# Run-wide instrumentation (--profile).
+PROFILERS = Registry("profiler")
+PROFILERS.register("cprofile", ".utils.profiling:Profiler")
+
+# Long-running front ends that feed an ErrorHandler (--serve).
+SERVERS = Registry("server")
+SERVERS.register("ingest", ".logger.server:run_server")
+
+DETECTORS = Registry("detector")
+DETECTORS.register("windowed_anomaly", ".detectors.anomaly_scanner:WindowedAnomalyDetector")
+DETECTORS.register("pipeline", ".detectors.pipeline:run_detection")
+
+ANALYZERS = Registry("analyzer")
+ANALYZERS.register("top_patterns", ".analyzers.pattern_detector:top_patterns")
+ANALYZERS.register("severity_breakdown", ".analyzers.pattern_detector:severity_breakdown")
+ANALYZERS.register("daily_trends", ".analyzers.trend_reporter:daily_trends")
+ANALYZERS.register("rollup_trends", ".analyzers.trend_reporter:rollup_trends")
+ANALYZERS.register("write_trend_csv", ".analyzers.trend_reporter:write_trend_csv")
+ANALYZERS.register("full_history", ".analyzers.full_history:full_history_report")
@@ -1,5 +1,4 @@
 from datetime import datetime, timezone
-from dateutil import parser
 
 def utc_now_iso() -> str:
     """Return current UTC time in ISO 8601 format with 'Z'."""
@@ -14,6 +13,8 @@ def to_utc_iso(ts: str | datetime) -> str:
         if ts.tzinfo is None:
             ts = ts.replace(tzinfo=timezone.utc)
         return ts.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    from dateutil import parser  # deferred: only needed when a string is parsed
+
     dt = parser.parse(ts)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
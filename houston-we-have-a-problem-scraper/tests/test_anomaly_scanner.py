@@ -0,0 +1,41 @@
+import unittest
+from src.detectors.anomaly_scanner import WindowedAnomalyDetector, iter_window_anomalies
+
+def _events(minute, count, code="ERR1", source="svc"):
+    return [
+        {"timestamp": f"2025-11-10T10:{minute:02d}:{i % 60:02d}", "errorCode": code, "source": source}
+        for i in range(count)
+    ]
+
+class TestWindowedAnomalyDetector(unittest.TestCase):
+    def test_spike_against_own_baseline(self):
+        detector = WindowedAnomalyDetector(warmup_buckets=3, min_count=5)
+        stream = []
+        for minute in range(10):
+            stream += _events(minute, 2)
+            stream += _events(minute, 20, code="BUSY")  # steady high-volume key
+        stream += _events(10, 12)
+        stream += _events(10, 20, code="BUSY")
+        results = list(iter_window_anomalies(stream, detector))
+        spikes = [r for r in results if r["is_anomaly"]]
+        self.assertTrue(spikes)
+        self.assertTrue(all(r["errorCode"] == "ERR1" for r in spikes))
+        self.assertEqual(results[-21]["occurrences"], 12)
+
+    def test_spike_start_reported_once(self):
+        detector = WindowedAnomalyDetector(warmup_buckets=3, min_count=5)
+        for minute in range(5):
+            for e in _events(minute, 1):
+                detector.observe(e)
+        starts = [detector.observe(e)["spikeStart"] for e in _events(5, 30)]
+        self.assertEqual(starts.count(True), 1)
+
+    def test_lru_bounds_keys(self):
+        detector = WindowedAnomalyDetector(max_keys=10)
+        for i in range(100):
+            detector.observe({"timestamp": "2025-11-10T10:00:00", "errorCode": f"E{i}", "source": "s"})
+        self.assertEqual(len(detector), 10)
+        self.assertEqual(detector.evicted, 90)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from src.analyzers.bulk_checker import BulkChecker
+from src.analyzers.error_logger import ErrorLogger
+
+PAGES = {
+    "/ok": "<html><head><title>Fine</title></head><body><p>All good</p></body></html>",
+    "/bad": "<html><head><title>Oops</title></head><body><script>var error;</script>An error occurred</body></html>",
+    "/untitled": "<html><body>no title here</body></html>",
+}
+
+class _StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(0.02)
+            path = self.path.split("?")[0]
+            if path == "/slow":
+                time.sleep(1.0)
+            body = PAGES.get(path)
+            if path == "/etag":
+                body = PAGES["/bad"]
+            elif path == "/counter":
+                server.counter += 1
+                body = f"<title>n</title>visit {server.counter}"
+            status = 200 if body is not None else 404
+            if path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+                body, status = "", 304
+            payload = (body if body is not None else "missing").encode()
+            self.send_response(status)
+            if path == "/etag":
+                self.send_header("ETag", '"v1"')
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+class TestBulkChecker(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.active = self.server.peak = self.server.counter = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_results_stream_into_rules_and_logger(self):
+        urls = [f"{self.base}/ok?i={i}" for i in range(40)]
+        urls += [f"{self.base}/bad", f"{self.base}/untitled", f"{self.base}/gone", f"{self.base}/slow"]
+        settings = {"concurrency": 16, "per_host": 3, "timeout": 0.5,
+                    "rules": {"missing_title": True, "forbidden_words": ["error"]}}
+        error_logger = ErrorLogger({"log_dir": self.tmp.name})
+        checker = BulkChecker(settings, error_logger=error_logger)
+
+        results = {r["url"]: r for r in checker.check(iter(urls))}
+        self.assertEqual(set(results), set(urls))
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertEqual(results[f"{self.base}/ok?i=0"]["data"]["title"], "Fine")
+        self.assertEqual([i["errorMessage"] for i in results[f"{self.base}/bad"]["issues"]],
+                         ["Found forbidden word: error"])
+        self.assertEqual(results[f"{self.base}/untitled"]["issues"][0]["errorType"], "missing_data")
+        self.assertIn("404", results[f"{self.base}/gone"]["error"])
+        self.assertIn("Timeout", results[f"{self.base}/slow"]["error"])
+        self.assertEqual(dict(checker.stats), {"fetched": 42, "failed": 2, "issues": 2})
+
+        log_dir = Path(self.tmp.name)
+        errors = [json.loads(l) for l in (log_dir / "errors.log").read_text().splitlines()]
+        issues = [json.loads(l) for l in (log_dir / "issues.log").read_text().splitlines()]
+        self.assertEqual(len(errors), 2)
+        self.assertEqual({i["sourceUrl"] for i in issues}, {f"{self.base}/bad", f"{self.base}/untitled"})
+
+    def test_fetch_cache_skips_unchanged_pages(self):
+        urls = [f"{self.base}/etag", f"{self.base}/bad", f"{self.base}/counter"]
+        settings = {"per_host": 2, "rules": {"forbidden_words": ["error"]},
+                    "fetch_cache": {"path": str(Path(self.tmp.name) / "cache.json")}}
+
+        first = BulkChecker(settings)
+        self.assertFalse(any(r["cached"] for r in first.check(urls)))
+
+        second = BulkChecker(settings)
+        results = {r["url"]: r for r in second.check(urls)}
+        self.assertTrue(results[f"{self.base}/etag"]["cached"])
+        self.assertTrue(results[f"{self.base}/bad"]["cached"])
+        self.assertFalse(results[f"{self.base}/counter"]["cached"])
+        self.assertEqual(results[f"{self.base}/etag"]["data"]["status"], 304)
+        self.assertEqual(results[f"{self.base}/etag"]["issues"][0]["errorMessage"], "Found forbidden word: error")
+        stats = second.cache.stats
+        self.assertEqual((stats["not_modified"], stats["hash_hits"], stats["misses"]), (1, 1, 1))
+        self.assertAlmostEqual(second.cache.hit_rate(), 2 / 3)
+
+        # Changed rules invalidate the cached issues.
+        changed = BulkChecker({**settings, "rules": {"forbidden_words": ["visit"]}})
+        self.assertFalse(any(r["cached"] for r in changed.check(urls)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.analyzers.pattern_detector import severity_breakdown
+from src.analyzers.trend_reporter import daily_trends
+from src.logger.columnar import ColumnarArchive, ColumnarStorage, convert_csv
+from src.logger.rollups import RollupStore
+from src.logger.storage import Storage
+
+def _event(i, severity="error"):
+    return {
+        "timestamp": f"2025-11-{10 + i % 3:02d}T16:05:{i % 60:02d}" + (".250000Z" if i % 2 else "Z"),
+        "severity": severity, "errorType": f"E{i % 4}", "message": f"failed job {i}",
+        "sourceFile": "a.py", "lineNumber": i, "environment": "dev", "device": "d",
+        "resolved": i % 5 == 0, "stackTrace": f"Traceback\n  line {i}" if i % 3 else "",
+    }
+
+def _stored(event):
+    # Single events are stored as one occurrence seen at their timestamp.
+    return dict(event, occurrences=1, firstSeen=event["timestamp"], lastSeen=event["timestamp"])
+
+class TestColumnarArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_projection(self):
+        events = [_event(i, "error" if i % 2 else "warning") for i in range(50)]
+        archive = ColumnarArchive(self.dir / "a.hcol")
+        archive.append(events[:20])
+        archive.append(events[20:])
+        self.assertEqual(list(archive.scan()), [_stored(e) for e in events])
+        self.assertEqual(list(archive.scan(["severity"])), [{"severity": e["severity"]} for e in events])
+        self.assertEqual(severity_breakdown(archive.scan(["severity"])), {"error": 25, "warning": 25})
+
+    def test_filters_skip_blocks(self):
+        archive = ColumnarArchive(self.dir / "a.hcol")
+        archive.append([_event(0, "info")])
+        archive.append([_event(1, "critical"), _event(2, "error")])
+        rows = list(archive.scan(["message"], severities=["critical"]))
+        self.assertEqual(rows, [{"message": "failed job 1"}])
+        rows = list(archive.scan(["timestamp"], since="2025-11-11T00:00:00Z", until="2025-11-12T00:00:00Z"))
+        self.assertEqual(rows, [{"timestamp": "2025-11-11T16:05:01.250000Z"}])
+
+    def test_torn_tail_block_is_ignored(self):
+        path = self.dir / "a.hcol"
+        archive = ColumnarArchive(path)
+        archive.append([_event(0)])
+        archive.append([_event(1)])
+        path.write_bytes(path.read_bytes()[:-5])
+        self.assertEqual([r["lineNumber"] for r in archive.scan(["lineNumber"])], [0])
+
+    def test_append_after_torn_tail(self):
+        path = self.dir / "a.hcol"
+        ColumnarArchive(path).append([_event(0)])
+        whole = path.stat().st_size
+        for cut in (3, 12, 40):
+            with self.subTest(cut=cut):
+                archive = ColumnarArchive(path)
+                archive.append([_event(1)])
+                path.write_bytes(path.read_bytes()[: whole + cut])
+                self.assertEqual([r["lineNumber"] for r in archive.scan(["lineNumber"])], [0])
+                ColumnarArchive(path).append([_event(2)])
+                self.assertEqual([r["lineNumber"] for r in archive.scan(["lineNumber"])], [0, 2])
+                path.write_bytes(path.read_bytes()[:whole])
+
+    def test_storage_backend_with_rollups(self):
+        csv_path = self.dir / "history.csv"
+        rollups = lambda: RollupStore(self.dir / "rollups.json", hour_retention_days=100000)
+        storage = ColumnarStorage(csv_path, rollups=rollups(), block_rows=4)
+        storage.write_many([_event(i) for i in range(6)])
+        self.assertEqual([r["lineNumber"] for r in storage.read_recent(3, columns=["lineNumber"])], [3, 4, 5])
+        storage.flush()
+        self.assertFalse(csv_path.exists())
+
+        # A new rollup file backfills from the archive, reading two columns.
+        (self.dir / "rollups.json").unlink()
+        reopened = ColumnarStorage(csv_path, rollups=rollups())
+        self.assertEqual(reopened.rollups.rows("day"), daily_trends(reopened.scan(["timestamp", "severity"])))
+
+    def test_convert_csv(self):
+        csv_path = self.dir / "history.csv"
+        storage = Storage(csv_path)
+        storage.write_many([_event(i) for i in range(7)])
+        self.assertEqual(convert_csv(csv_path, self.dir / "history.hcol", block_rows=3), 7)
+        rows = list(ColumnarArchive(self.dir / "history.hcol").scan())
+        self.assertEqual(rows, [_stored(_event(i)) for i in range(7)])
+
+    def test_convert_csv_without_dedup_columns(self):
+        csv_path = self.dir / "history.csv"
+        Storage(csv_path).write_many([_event(i) for i in range(3)])
+        # Archives written before the dedup columns existed have 10 fields per row.
+        lines = csv_path.read_text(encoding="utf-8").splitlines()
+        csv_path.write_text("".join(",".join(line.split(",")[:-3]) + "\n" for line in lines), encoding="utf-8")
+        convert_csv(csv_path, self.dir / "history.hcol")
+        rows = list(ColumnarArchive(self.dir / "history.hcol").scan(["lineNumber", "occurrences", "firstSeen"]))
+        self.assertEqual(rows, [{"lineNumber": i, "occurrences": 1, "firstSeen": _event(i)["timestamp"]} for i in range(3)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.analyzers.full_history import full_history_report
+from src.analyzers.pattern_detector import severity_breakdown
+from src.logger.dedup import Deduplicator, fingerprint
+from src.logger.formatter import normalize
+from src.logger.handler import ErrorHandler
+from src.logger.rollups import RollupStore
+from src.logger.storage import Storage
+
+def _event(second, message="Timeout after 3000 ms on job 42", severity="error", line=7):
+    return normalize({
+        "timestamp": f"2025-11-10T16:{second // 60:02d}:{second % 60:02d}Z",
+        "severity": severity, "errorType": "TimeoutError", "message": message,
+        "sourceFile": "worker.py", "lineNumber": line, "environment": "prod", "device": "d1", "resolved": False,
+        "stackTrace": "Traceback\n  at 0x7f3a2b10 in run()",
+    })
+
+class TestDeduplicator(unittest.TestCase):
+    def test_fingerprint_masks_variable_parts(self):
+        a = _event(0)
+        b = dict(_event(1), message="Timeout after 5000 ms on job 97", stackTrace="Traceback\n  at 0x7f3a9c44 in run()")
+        self.assertEqual(fingerprint(a), fingerprint(b))
+        self.assertNotEqual(fingerprint(a), fingerprint(_event(0, line=8)))
+
+    def test_window_and_flush(self):
+        dedup = Deduplicator(window_seconds=60)
+        self.assertEqual([r for s in range(50) for r in dedup.add(_event(s))], [])
+        rows = dedup.add(_event(61))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["occurrences"], 50)
+        self.assertEqual(rows[0]["firstSeen"], "2025-11-10T16:00:00Z")
+        self.assertEqual(rows[0]["lastSeen"], "2025-11-10T16:00:49Z")
+        self.assertEqual(rows[0]["message"], _event(0)["message"])
+        rows = dedup.flush()
+        self.assertEqual([(r["occurrences"], r["firstSeen"]) for r in rows], [(1, "2025-11-10T16:01:01Z")])
+        self.assertEqual(dedup.flush(), [])
+
+    def test_wall_clock_expiry_while_idle(self):
+        now = [0.0]
+        dedup = Deduplicator(window_seconds=60, clock=lambda: now[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = ErrorHandler(Storage(Path(tmp) / "history.csv"), dedup=dedup)
+            for s in range(3):
+                handler.ingest_normalized(_event(s))
+            now[0] = 59.0
+            self.assertEqual(handler.expire(), 0)
+            now[0] = 60.0
+            self.assertEqual(handler.expire(), 1)
+            self.assertEqual([r["occurrences"] for r in handler.storage.read_recent(10)], ["3"])
+            self.assertEqual(dedup.flush(), [])
+
+    def test_max_keys_evicts_least_recent(self):
+        dedup = Deduplicator(window_seconds=3600, max_keys=2)
+        dedup.add(_event(0, line=1))
+        dedup.add(_event(1, line=2))
+        dedup.add(_event(2, line=1))
+        rows = dedup.add(_event(3, line=3))
+        self.assertEqual([r["lineNumber"] for r in rows], [2])
+        self.assertEqual(sorted(r["lineNumber"] for r in dedup.flush()), [1, 3])
+        self.assertEqual(dedup.stats["evictions"], 1)
+
+class TestHandlerDedup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stores_one_row_but_alerts_on_every_event(self):
+        storage = Storage(self.dir / "history.csv", rollups=RollupStore(self.dir / "rollups.json", hour_retention_days=100000))
+        handler = ErrorHandler(storage, thresholds={"error": 100}, dedup=Deduplicator(window_seconds=3600))
+        alerts = []
+        handler._emit_alert = lambda severity, ev: alerts.append(severity)
+        handler.ingest_batch([_event(s) for s in range(150)])
+        handler.ingest_normalized(_event(150, severity="warning", line=9))
+        self.assertEqual(alerts, ["error"])
+        self.assertEqual(storage.read_recent(10), [])
+        handler.flush()
+
+        rows = storage.read_recent(10)
+        self.assertEqual([(r["occurrences"], r["severity"]) for r in rows], [("150", "error"), ("1", "warning")])
+        self.assertEqual(severity_breakdown(rows), {"error": 150, "warning": 1})
+        self.assertEqual(storage.rollups.rows("day"), [
+            {"date": "2025-11-10", "severity": "error", "count": 150},
+            {"date": "2025-11-10", "severity": "warning", "count": 1},
+        ])
+        report = full_history_report(storage.archive_path, workers=1)
+        self.assertEqual(report["rows"], 151)
+        self.assertEqual(report["severity"], {"error": 150, "warning": 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import itertools
+import unittest
+from src.detectors.error_classifier import SeverityClassifier, classify_errors
+
+class TestSeverityClassifier(unittest.TestCase):
+    def test_keyword_priority(self):
+        c = SeverityClassifier()
+        # An error keyword earlier in the text must not hide a critical one.
+        self.assertEqual(c.classify("NOTICE", "request failed after timeout", "E1"), "critical")
+        self.assertEqual(c.classify("NOTICE", "call is slow, retry scheduled", "E1"), "warning")
+        self.assertEqual(c.classify("NOTICE", "all good", "E1"), "info")
+        self.assertEqual(c.classify("NOTICE", "all good", "CRIT01"), "critical")
+        self.assertEqual(c.classify("warn", "data loss", "E1"), "warning")
+
+    def test_user_keywords_and_cache(self):
+        c = SeverityClassifier(keywords={"critical": ["Disk Full"]})
+        for i in range(100):
+            self.assertEqual(c.classify("NOTICE", f"node {i} disk full", "E1"), "critical")
+        self.assertEqual(c.cache_info().currsize, 1)
+
+    def test_matches_reference_heuristics(self):
+        words = ["", "timeout", "failed", "slow", "data", "loss", "ok", "Error42"]
+        for a, b in itertools.product(words, repeat=2):
+            message = f"{a} {b}".strip()
+            text = f"{message} E1".lower()
+            if any(k in text for k in ("timeout", "unreachable", "data loss", "corruption")):
+                expected = "critical"
+            elif any(k in text for k in ("exception", "failed", "failure", "error")):
+                expected = "error"
+            elif any(k in text for k in ("deprecated", "slow", "retry")):
+                expected = "warning"
+            else:
+                expected = "info"
+            self.assertEqual(SeverityClassifier().classify("NOTICE", message, "E1"), expected, message)
+
+    def test_in_place_batch(self):
+        entries = [{"rawLevel": "FATAL", "errorMessage": "x", "errorCode": "E"}]
+        result = classify_errors(entries, in_place=True)
+        self.assertIs(result[0], entries[0])
+        self.assertEqual(entries[0]["severity"], "critical")
+
+if __name__ == "__main__":
+    unittest.main()
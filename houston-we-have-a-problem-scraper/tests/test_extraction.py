@@ -16,5 +16,13 @@ class TestPatternDetector(unittest.TestCase):
             self.assertIn("title", data)
             self.assertIn("content", data)
 
+    def test_unknown_charset_falls_back_to_utf8(self):
+        from unittest.mock import MagicMock
+
+        response = MagicMock()
+        response.encoding = "x-no-such-charset"
+        response.iter_content.return_value = [b"<title>Caf\xc3", b"\xa9</title>"]
+        self.assertEqual("".join(PatternDetector._chunks(response)), "<title>Caf\u00e9</title>")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
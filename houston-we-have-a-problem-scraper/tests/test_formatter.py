@@ -0,0 +1,71 @@
+import itertools
+import random
+import unittest
+from datetime import datetime, timezone, timedelta
+from src.logger.formatter import normalize, normalize_many
+
+TIMESTAMPS = [
+    "2025-11-10T16:05:12Z",
+    "2025-11-10T16:05:12",
+    "2025-11-10 16:05:12",
+    "2025-11-10T16:05:12.5Z",
+    "2025-11-10T16:05:12.123456+05:30",
+    "2025-11-10T23:30:00-08:00",
+    "2025-11-10T16:05:12+0000",
+    "2024-02-29T00:00:00Z",
+    "2025-02-30T00:00:00Z",
+    "2025-11-10",
+    "Nov 10 2025 4:05pm",
+    " 2025-11-10T16:05:12Z ",
+    "not a date",
+    datetime(2025, 11, 10, 16, 5, 12),
+    datetime(2025, 11, 10, 16, 5, 12, tzinfo=timezone(timedelta(hours=2))),
+]
+SEVERITIES = ["error", "ERROR", "Warning", 3, None]
+RESOLVED = [True, False, 0, 1, "", "false"]
+LINE_NUMBERS = [42, 0, -5, "17", "x", 3.9, True, None]
+TEXT = ["text", "", 5, None, ["a"]]
+
+def _outcome(fn, events):
+    try:
+        return fn(events)
+    except Exception as e:
+        return (type(e), str(e))
+
+class TestNormalizeMany(unittest.TestCase):
+    def test_differential_against_normalize(self):
+        rng = random.Random(7)
+        base = {
+            "timestamp": TIMESTAMPS[0], "errorType": "E", "message": "m", "stackTrace": "",
+            "severity": "error", "sourceFile": "a.py", "lineNumber": 1,
+            "environment": "dev", "device": "d", "resolved": False, "extra": {"k": 1},
+        }
+        cases = []
+        for ts, sev, res, ln in itertools.product(TIMESTAMPS, SEVERITIES, RESOLVED, LINE_NUMBERS):
+            ev = dict(base, timestamp=ts, severity=sev, resolved=res, lineNumber=ln)
+            ev[rng.choice(["errorType", "message", "stackTrace", "sourceFile", "environment", "device"])] = rng.choice(TEXT)
+            cases.append(ev)
+        missing = dict(base)
+        del missing["device"], missing["message"]
+        cases.append(missing)
+
+        for ev in cases:
+            expected = _outcome(lambda e: [normalize(x) for x in e], [ev])
+            actual = _outcome(normalize_many, [ev])
+            self.assertEqual(actual, expected, ev)
+            if isinstance(expected, list):
+                self.assertEqual(list(actual[0]), list(expected[0]))  # key order
+
+    def test_non_object_raises_value_error(self):
+        valid = {
+            "timestamp": TIMESTAMPS[0], "errorType": "E", "message": "m", "stackTrace": "",
+            "severity": "error", "sourceFile": "a.py", "lineNumber": 1,
+            "environment": "dev", "device": "d", "resolved": False,
+        }
+        for value in ("str", 5, None, ["a"]):
+            expected = _outcome(lambda e: [normalize(x) for x in e], [valid, value])
+            self.assertEqual(expected[0], ValueError)
+            self.assertEqual(_outcome(normalize_many, [valid, value]), expected)
+
+if __name__ == "__main__":
+    unittest.main()
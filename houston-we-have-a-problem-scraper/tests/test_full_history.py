@@ -0,0 +1,78 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+from src.analyzers.full_history import csv_partitions, full_history_report
+from src.analyzers.pattern_detector import severity_breakdown, top_patterns
+from src.analyzers.trend_reporter import daily_trends
+from src.logger.columnar import ColumnarStorage
+from src.logger.storage import Storage
+
+def _event(i):
+    return {
+        "timestamp": f"2025-11-{10 + i % 4:02d}T16:05:12Z", "severity": ["error", "warning", "critical"][i % 3],
+        "errorType": f"E{i % 5}", "message": f"job {i} failed on host 10.0.0.{i % 7}",
+        "sourceFile": f"m{i % 2}.py", "lineNumber": i % 11, "environment": "dev", "device": "d",
+        "resolved": False, "stackTrace": "Traceback\n  boom",
+    }
+
+class TestFullHistoryReport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.csv = self.dir / "history.csv"
+        self.cache = self.dir / "cache.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _expected(self):
+        with open(self.csv, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        patterns = top_patterns(rows)
+        return severity_breakdown(rows), daily_trends(rows), patterns
+
+    def _check(self, result):
+        sev, trends, patterns = self._expected()
+        self.assertEqual(result["severity"], sev)
+        self.assertEqual(result["trends"], trends)
+        self.assertEqual(result["patterns"]["errorType"], patterns["errorType"])
+        self.assertEqual(result["patterns"]["source"], patterns["source"])
+        self.assertEqual(sum(c for _, c in result["patterns"]["message"]), result["rows"])
+
+    def test_partitions_are_line_aligned_and_stable(self):
+        Storage(self.csv).write_many(_event(i) for i in range(300))
+        parts = csv_partitions(self.csv, 4096)
+        data = self.csv.read_bytes()
+        self.assertGreater(len(parts), 3)
+        self.assertEqual(parts[0][0], 0)
+        self.assertEqual(parts[-1][1], len(data))
+        for start, _ in parts[1:]:
+            self.assertEqual(data[start - 1 : start], b"\n")
+        Storage(self.csv).write_many(_event(i) for i in range(300, 400))
+        self.assertEqual(csv_partitions(self.csv, 4096)[: len(parts) - 1], parts[:-1])
+
+    def test_matches_single_threaded_analyzers_and_caches(self):
+        Storage(self.csv).write_many(_event(i) for i in range(300))
+        first = full_history_report(self.csv, self.cache, partition_bytes=4096)
+        self.assertEqual(first["rows"], 300)
+        self.assertEqual(first["cached"], 0)
+        self._check(first)
+
+        Storage(self.csv).write_many(_event(i) for i in range(300, 330))
+        second = full_history_report(self.csv, self.cache, workers=2, partition_bytes=4096)
+        self.assertEqual(second["rows"], 330)
+        self.assertEqual(second["cached"], first["partitions"] - 1)
+        self._check(second)
+
+    def test_columnar_blocks_are_partitions(self):
+        storage = ColumnarStorage(self.csv, block_rows=50)
+        storage.write_many(_event(i) for i in range(120))
+        storage.flush()
+        result = full_history_report(storage.archive_path, self.cache)
+        self.assertEqual((result["rows"], result["partitions"]), (120, 3))
+        Storage(self.csv).write_many(_event(i) for i in range(120))
+        self._check(result)
+
+if __name__ == "__main__":
+    unittest.main()
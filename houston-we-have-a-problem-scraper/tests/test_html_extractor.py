@@ -0,0 +1,76 @@
+import unittest
+from src.analyzers.html_extractor import extract
+from src.analyzers.pattern_detector import parse_page
+from src.analyzers.validation_rules import ValidationRules
+
+PAGE = """<!doctype html>
+<html><head><title> Shop &amp; Co </title>
+<meta name="Description" content="">
+<meta property="og:title" content="Shop">
+<style>.error { color: red }</style></head>
+<body>
+<h1>Welcome</h1><h1>Deals <b>today</b></h1>
+<script>console.log("error")</script>
+<p>Cheap <a href="http://cdn.example.com/x">things</a> and <a href="#">more</a>.</p>
+<img src="/logo.png"><img src="/a.png" alt="A">
+<!-- hidden error -->
+</body></html>"""
+
+class TestPageExtractor(unittest.TestCase):
+    def test_collects_only_what_is_needed(self):
+        data = extract(PAGE)
+        self.assertEqual(set(data), {"title", "content"})
+        self.assertEqual(data["title"], "Shop & Co")
+        self.assertEqual(data["content"], "Welcome Deals today Cheap things and more .")
+
+        data = extract(PAGE, {"meta": {"og:title"}, "attrs": {"img": {"alt"}}, "text_of": {"h1"}})
+        self.assertEqual(data["meta"], {"og:title": "Shop"})
+        self.assertEqual(data["elements"]["img"], [{"alt": None, "line": 10}, {"alt": "A", "line": 10}])
+        self.assertEqual(data["text_of"]["h1"], ["Welcome", "Deals today"])
+
+    def test_only_first_document_title(self):
+        page = (
+            "<html><head><title>Shop</title></head><body>"
+            "<svg><title>Cart icon</title></svg><math><title>x</title></math>"
+            "<p>Hi</p><title>Late</title></body></html>"
+        )
+        self.assertEqual(extract(page), {"title": "Shop", "content": "Hi"})
+        self.assertEqual(extract("<svg><title>Icon</title></svg><title>Page</title>")["title"], "Page")
+
+    def test_chunked_feed_matches_whole_page(self):
+        needs = {"title": True, "text": True, "attrs": {"a": {"href"}}, "text_of": {"h1"}}
+        whole = extract(PAGE, needs)
+        for size in (1, 7, 64):
+            chunks = (PAGE[i : i + size] for i in range(0, len(PAGE), size))
+            self.assertEqual(extract(chunks, needs), whole)
+
+    def test_structural_rules_share_one_parse(self):
+        rules = ValidationRules({"rules": {
+            "forbidden_words": ["error"],
+            "required_meta": ["description"],
+            "h1_count": 1,
+            "images_without_alt": True,
+            "insecure_links": True,
+            "empty_links": True,
+        }})
+        self.assertEqual(rules.needs["attrs"]["img"], {"alt", "src"})
+        issues = rules.check(parse_page("https://shop.example.com", PAGE, rules.needs))
+        messages = sorted(i["errorMessage"] for i in issues)
+        self.assertEqual(messages, [
+            "Images without alt text: 1",
+            "Insecure (http://) links on https page: 1",
+            "Links without a target: 1",
+            "Missing meta tag: description",
+            "Too many h1 headings: 2",
+        ])
+        self.assertTrue(all(i["errorType"] == "structure" for i in issues))
+
+    def test_insecure_script_src_is_reported(self):
+        rules = ValidationRules({"rules": {"insecure_links": True}})
+        page = '<html><head><script src="http://cdn.example.com/app.js"></script></head><body><p>Hi</p></body></html>'
+        self.assertEqual(extract(page, rules.needs)["elements"]["script"], [{"src": "http://cdn.example.com/app.js", "line": 1}])
+        issues = rules.check(parse_page("https://shop.example.com", page, rules.needs))
+        self.assertEqual([i["errorMessage"] for i in issues], ["Insecure (http://) links on https page: 1"])
+
+if __name__ == "__main__":
+    unittest.main()
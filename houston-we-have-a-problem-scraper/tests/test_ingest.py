@@ -0,0 +1,121 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src import main
+from src.logger import loader
+from src.logger.columnar import ColumnarStorage
+from src.logger.dedup import Deduplicator
+from src.logger.handler import ErrorHandler
+from src.logger.storage import Storage
+from src.main import ingest_from_dir
+from src.utils.manifest import IngestManifest
+
+def _event(message):
+    return {
+        "timestamp": "2025-11-10T16:05:12Z", "errorType": "E", "message": message,
+        "stackTrace": "", "severity": "error", "sourceFile": "a.py", "lineNumber": 1,
+        "environment": "dev", "device": "d", "resolved": False,
+    }
+
+class TestCheckpointedIngest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.inputs = self.dir / "logs"
+        self.inputs.mkdir()
+        self.handler = ErrorHandler(Storage(self.dir / "history.csv", self.inputs / "errors.jsonl"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _ingest(self):
+        return ingest_from_dir(self.handler, self.inputs, IngestManifest(self.dir / "manifest.json"))
+
+    def test_unchanged_files_are_skipped(self):
+        (self.inputs / "a.json").write_text(json.dumps([_event("one"), _event("two")]))
+        self.assertEqual(self._ingest(), 2)
+        self.assertEqual(self._ingest(), 0)
+        # Own JSONL output in the same directory is never read back.
+        self.assertTrue((self.inputs / "errors.jsonl").exists())
+
+    def test_appended_ndjson_resumes_from_offset(self):
+        stream = self.inputs / "stream.jsonl"
+        stream.write_text(json.dumps(_event("one")) + "\n" + json.dumps(_event("partial"))[:10])
+        self.assertEqual(self._ingest(), 1)
+        with open(stream, "w") as f:
+            f.write(json.dumps(_event("one")) + "\n" + json.dumps(_event("two")) + "\n")
+        self.assertEqual(self._ingest(), 1)
+        messages = [r["message"] for r in self.handler.storage.read_recent(10)]
+        self.assertEqual(messages, ["one", "two"])
+
+    def test_line_appended_during_read_is_ingested_next_run(self):
+        stream = self.inputs / "stream.jsonl"
+        stream.write_text(json.dumps(_event("one")) + "\n")
+        read_ndjson = loader.read_ndjson
+
+        def read_then_append(path, offset=0):
+            result = read_ndjson(path, offset)
+            with open(path, "a") as f:
+                f.write(json.dumps(_event("late")) + "\n")
+            return result
+
+        with mock.patch.object(loader, "read_ndjson", side_effect=read_then_append):
+            self.assertEqual(self._ingest(), 1)
+        self.assertEqual(self._ingest(), 1)
+        self.assertEqual(self._ingest(), 0)
+        messages = [r["message"] for r in self.handler.storage.read_recent(10)]
+        self.assertEqual(messages, ["one", "late"])
+
+    def test_non_object_element_is_skipped(self):
+        path = self.inputs / "mixed.json"
+        path.write_text(json.dumps([_event("one"), "str", _event("two")]))
+        result = loader.load_input(path)
+        self.assertEqual([e["message"] for e in result["events"]], ["one", "two"])
+        self.assertIsNone(result["error"])
+        self.assertEqual(len(result["warnings"]), 1)
+        self.assertIn("Expected an event object", result["warnings"][0])
+
+    def test_invalid_event_is_not_ingested_twice(self):
+        bad = _event("bad")
+        del bad["severity"]
+        (self.inputs / "a.json").write_text(json.dumps([_event("one"), bad, _event("two")]))
+        stream = self.inputs / "b.jsonl"
+        stream.write_text("\n".join(json.dumps(e) for e in (_event("three"), bad, _event("four"))) + "\n")
+        self.assertEqual(self._ingest(), 4)
+        self.assertEqual(self._ingest(), 0)
+        messages = [r["message"] for r in self.handler.storage.read_recent(10)]
+        self.assertEqual(messages, ["one", "two", "three", "four"])
+
+    def test_manifest_saved_only_after_buffered_rows_are_written(self):
+        storage = ColumnarStorage(self.dir / "history.csv", block_rows=1000)
+        handler = ErrorHandler(storage, dedup=Deduplicator(window_seconds=3600))
+        for i in range(3):
+            (self.inputs / f"f{i}.json").write_text(json.dumps([_event(f"{i}-a"), _event(f"{i}-b")]))
+        manifest = IngestManifest(self.dir / "manifest.json")
+        archived_at_save = []
+        manifest.save = lambda: archived_at_save.append(
+            (len(manifest.files), len(list(storage.archive.scan(["message"]))))
+        )
+        with mock.patch.object(main, "CHECKPOINT_EVENTS", 2):
+            self.assertEqual(ingest_from_dir(handler, self.inputs, manifest), 6)
+        self.assertEqual(archived_at_save, [(1, 2), (2, 4), (3, 6), (3, 6)])
+
+    def test_worker_pool_matches_serial(self):
+        for i in range(6):
+            (self.inputs / f"f{i}.json").write_text(json.dumps([_event(f"{i}-a"), _event(f"{i}-b")]))
+        bad = _event("bad")
+        del bad["severity"]
+        (self.inputs / "f3.json").write_text(json.dumps([_event("3-a"), bad, _event("3-c")]))
+        (self.inputs / "f4.json").write_text("{not json")
+
+        self.assertEqual(ingest_from_dir(self.handler, self.inputs, workers=3), 10)
+        parallel = self.handler.storage.read_recent(100)
+        self.handler.storage.csv_path.unlink()
+        self.assertEqual(ingest_from_dir(self.handler, self.inputs), 10)
+        self.assertEqual(self.handler.storage.read_recent(100), parallel)
+        self.assertEqual([r["message"] for r in parallel[6:8]], ["3-a", "3-c"])
+
+if __name__ == "__main__":
+    unittest.main()
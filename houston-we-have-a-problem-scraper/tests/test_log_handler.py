@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+from pathlib import Path
+from unittest import mock
+from src.logger import log_handler as log_handler_module
+from src.logger.dedup import Deduplicator
+from src.logger.handler import ErrorHandler
+from src.logger.log_handler import HoustonLogHandler
+from src.logger.server import IngestServer
+from src.logger.storage import Storage
+
+class _BlockingStorage(Storage):
+    def __init__(self, csv_path):
+        super().__init__(csv_path)
+        self.gate = threading.Event()
+
+    def write_many(self, events):
+        self.gate.wait()
+        return super().write_many(events)
+
+class TestHoustonLogHandler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / "history.csv"
+        self.log = logging.getLogger(f"houston.test.{self.id()}")
+        self.log.propagate = False
+
+    def tearDown(self):
+        for h in list(self.log.handlers):
+            self.log.removeHandler(h)
+            h.close()
+        self.tmp.cleanup()
+
+    def test_records_become_events(self):
+        handler = ErrorHandler(Storage(self.csv))
+        self.log.addHandler(HoustonLogHandler(handler, environment="test", device="box"))
+        self.log.info("below level")
+        self.log.warning("disk at %d%%", 91)
+        try:
+            {}["missing"]
+        except KeyError:
+            self.log.exception("lookup failed")
+        self.log.handlers[0].flush()
+
+        rows = handler.storage.read_recent(10)
+        self.assertEqual([r["message"] for r in rows], ["disk at 91%", "lookup failed"])
+        self.assertEqual(rows[0]["severity"], "warning")
+        self.assertEqual(rows[1]["errorType"], "KeyError")
+        self.assertIn("Traceback", rows[1]["stackTrace"])
+        self.assertTrue(rows[1]["sourceFile"].endswith("test_log_handler.py"))
+        self.assertEqual((rows[1]["environment"], rows[1]["device"]), ("test", "box"))
+
+    def test_close_flushes_deduplicated_rows(self):
+        handler = ErrorHandler(Storage(self.csv), dedup=Deduplicator(window_seconds=300))
+        log_handler = HoustonLogHandler(handler)
+        self.log.addHandler(log_handler)
+        for _ in range(5):
+            self.log.error("same failure")
+        self.log.removeHandler(log_handler)
+        log_handler.close()
+        rows = handler.storage.read_recent(10)
+        self.assertEqual([(r["message"], r["occurrences"]) for r in rows], [("same failure", "5")])
+
+    def test_idle_worker_stores_expired_rows(self):
+        handler = ErrorHandler(Storage(self.csv), dedup=Deduplicator(window_seconds=0.05))
+        with mock.patch.object(log_handler_module, "IDLE_SECONDS", 0.02):
+            log_handler = HoustonLogHandler(handler)
+            self.log.addHandler(log_handler)
+            for _ in range(3):
+                self.log.error("same failure")
+            deadline = time.monotonic() + 5
+            while not handler.storage.read_recent(10) and time.monotonic() < deadline:
+                time.sleep(0.02)
+        rows = handler.storage.read_recent(10)
+        self.assertEqual([(r["message"], r["occurrences"]) for r in rows], [("same failure", "3")])
+
+    def test_overflow_is_dropped_and_counted(self):
+        storage = _BlockingStorage(self.csv)
+        log_handler = HoustonLogHandler(ErrorHandler(storage), capacity=5, batch_size=1)
+        self.log.addHandler(log_handler)
+        for i in range(20):
+            self.log.error("burst %d", i)
+        storage.gate.set()
+        log_handler.flush()
+        self.assertGreater(log_handler.dropped, 0)
+        self.assertEqual(log_handler.delivered + log_handler.dropped, 20)
+        self.assertEqual(len(storage.read_recent(100)), log_handler.delivered)
+
+    def test_close_does_not_block_on_full_queue(self):
+        storage = _BlockingStorage(self.csv)
+        log_handler = HoustonLogHandler(ErrorHandler(storage), capacity=3, batch_size=1, timeout=0.1)
+        self.log.addHandler(log_handler)
+        self.log.error("stuck 0")
+        while log_handler._queue.qsize():
+            time.sleep(0.01)  # until the worker is blocked delivering it
+        for i in range(1, 10):
+            self.log.error("stuck %d", i)
+        self.log.removeHandler(log_handler)
+        try:
+            started = time.monotonic()
+            log_handler.close()
+            self.assertLess(time.monotonic() - started, 2)
+        finally:
+            storage.gate.set()
+        log_handler._thread.join(timeout=5)
+        self.assertFalse(log_handler._thread.is_alive())
+        self.assertEqual(log_handler.delivered + log_handler.dropped, 10)
+        self.assertEqual(len(storage.read_recent(100)), log_handler.delivered)
+
+    def test_logging_shutdown_does_not_hang_on_stuck_delivery(self):
+        storage = _BlockingStorage(self.csv)
+        log_handler = HoustonLogHandler(ErrorHandler(storage), batch_size=1, timeout=0.1)
+        self.log.addHandler(log_handler)
+        for i in range(3):
+            self.log.error("stuck %d", i)
+        self.log.removeHandler(log_handler)
+        # What the interpreter runs at exit: flush() and then close() per handler.
+        shutdown = threading.Thread(target=logging.shutdown, args=([weakref.ref(log_handler)],), daemon=True)
+        try:
+            shutdown.start()
+            shutdown.join(timeout=3)
+            self.assertFalse(shutdown.is_alive())
+        finally:
+            storage.gate.set()
+        log_handler._thread.join(timeout=5)
+        self.assertEqual(log_handler.delivered + log_handler.dropped, 3)
+
+    def test_delivers_to_ingest_server(self):
+        handler = ErrorHandler(Storage(self.csv))
+        loop = asyncio.new_event_loop()
+        server = IngestServer(handler, port=0)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.ports['http']}/events"
+            log_handler = HoustonLogHandler(url=url)
+            self.log.addHandler(log_handler)
+            self.log.error("over the wire")
+            log_handler.flush()
+        finally:
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result(timeout=5)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.assertEqual(log_handler.failed, 0)
+        self.assertEqual([r["message"] for r in handler.storage.read_recent(10)], ["over the wire"])
+
+if __name__ == "__main__":
+    unittest.main()
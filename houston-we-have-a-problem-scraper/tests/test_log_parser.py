@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+from src.detectors.log_parser import parse_logs
+
+SAMPLE_LINES = [
+    "[2025-11-10 09:00:01] [INFO] [auth-service] EVT0001: User login succeeded | user_id=123",
+    "",
+    "plain text line that does not match",
+    "[2025-11-10T09:05:14] [WARN] [billing-service] WARN2001: Payment gateway response slow",
+    "   ",
+    "[not a timestamp] [ERROR] [billing-service] ERR3001: Payment authorization failed | user_id=456",
+    "[broken line without closing bracket",
+]
+
+class TestParseLogs(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for i in range(50):
+                for line in SAMPLE_LINES:
+                    f.write(line.replace("user_id=", f"user_id={i}") + "\n")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_parallel_matches_serial(self):
+        serial = parse_logs(self.path)
+        parallel = parse_logs(self.path, workers=3, chunk_size=512)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(serial[-1]["lineNumber"], 50 * len(SAMPLE_LINES))
+
+    def test_unmatched_line_is_generic(self):
+        entries = parse_logs(self.path)
+        generic = [e for e in entries if e["lineNumber"] == 3][0]
+        self.assertEqual(generic["errorCode"], "GENERIC")
+        self.assertEqual(generic["rawLine"], SAMPLE_LINES[2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import re
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from src.logger.handler import ErrorHandler
+from src.logger.storage import Storage
+from src.main import ingest_from_dir
+from src.utils.metrics import METRICS, MetricsRegistry
+
+def _event(severity):
+    return {
+        "timestamp": "2025-11-10T16:05:00Z", "severity": severity, "errorType": "E", "message": "m",
+        "sourceFile": "a.py", "lineNumber": 1, "environment": "dev", "device": "d",
+        "resolved": False, "stackTrace": "",
+    }
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_prometheus_text_and_json(self):
+        registry = MetricsRegistry()
+        sent = registry.counter("sends_total", "Sends", ("channel",))
+        depth = registry.gauge("depth", "Queue depth")
+        latency = registry.histogram("write_seconds", "Writes", buckets=(0.01, 0.1))
+        self.assertIs(registry.counter("sends_total", "Sends", ("channel",)), sent)
+        sent.labels("email").inc()
+        sent.labels("email").inc(2)
+        depth.set(4)
+        for v in (0.005, 0.05, 0.5):
+            latency.observe(v)
+
+        text = registry.render_prometheus()
+        self.assertIn("# TYPE sends_total counter\nsends_total{channel=\"email\"} 3\n", text)
+        self.assertIn("depth 4\n", text)
+        self.assertIn('write_seconds_bucket{le="0.01"} 1\n', text)
+        self.assertIn('write_seconds_bucket{le="0.1"} 2\n', text)
+        self.assertIn('write_seconds_bucket{le="+Inf"} 3\n', text)
+        self.assertIn("write_seconds_count 3\n", text)
+        data = registry.to_dict()
+        self.assertEqual(data["sends_total"]["samples"], [{"labels": {"channel": "email"}, "value": 3}])
+        with self.assertRaises(ValueError):
+            registry.gauge("sends_total", "Sends")
+
+    def test_scrape_endpoint(self):
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits").inc()
+        server = registry.serve(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as resp:
+                self.assertIn("hits_total 1", resp.read().decode("utf-8"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+class TestIngestMetrics(unittest.TestCase):
+    def test_handler_and_storage_report(self):
+        events = METRICS.counter("houston_events_ingested_total", "", ("severity",)).labels("warning")
+        writes = METRICS.histogram("houston_storage_write_seconds", "", ("backend",)).labels("csv")
+        before_events, before_writes = events.value, writes.count
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = ErrorHandler(Storage(Path(tmp) / "history.csv"))
+            handler.ingest(_event("warning"))
+            handler.ingest_batch([dict(_event("warning")) for _ in range(3)])
+            METRICS.dump_json(Path(tmp) / "metrics.json")
+            dumped = json.loads((Path(tmp) / "metrics.json").read_text(encoding="utf-8"))
+        self.assertEqual(events.value - before_events, 4)
+        self.assertEqual(writes.count - before_writes, 2)
+        self.assertIn("houston_normalize_seconds", dumped)
+
+    def test_normalize_time_reported_for_file_ingest(self):
+        def scraped():
+            text = METRICS.render_prometheus()
+            return int(re.search(r"^houston_normalize_seconds_count (\d+)$", text, re.M).group(1))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs = Path(tmp) / "logs"
+            inputs.mkdir()
+            (inputs / "a.json").write_text(json.dumps([_event("error"), _event("info")]))
+            (inputs / "b.jsonl").write_text(json.dumps(_event("warning")) + "\n")
+            handler = ErrorHandler(Storage(Path(tmp) / "history.csv"))
+            before = scraped()
+            self.assertEqual(ingest_from_dir(handler, inputs), 3)
+        self.assertEqual(scraped() - before, 3)
+
+if __name__ == "__main__":
+    unittest.main()
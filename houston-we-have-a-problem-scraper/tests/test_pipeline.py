@@ -0,0 +1,87 @@
+import csv
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.detectors.anomaly_scanner import scan_anomalies
+from src.detectors.error_classifier import classify_errors
+from src.detectors.log_parser import parse_logs
+from src.detectors.pipeline import run_detection
+from src.main import load_settings, run_log_detection
+
+SAMPLE_LOG = Path(__file__).resolve().parent.parent / "data" / "sample_logs.txt"
+
+class TestDetectionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _expected(self):
+        return scan_anomalies(classify_errors(parse_logs(str(SAMPLE_LOG))), threshold=2)
+
+    def test_streaming_matches_list_stages(self):
+        for spill in (False, True):
+            out = Path(self.tmp.name) / f"report_{spill}.json"
+            count = run_detection(str(SAMPLE_LOG), out, anomaly_threshold=2, spill=spill)
+            with open(out, encoding="utf-8") as f:
+                issues = json.load(f)
+            self.assertEqual(issues, self._expected())
+            self.assertEqual(count, len(issues))
+
+    def test_csv_written_in_same_pass(self):
+        json_path = Path(self.tmp.name) / "r.json"
+        csv_path = Path(self.tmp.name) / "r.csv"
+        run_detection(str(SAMPLE_LOG), json_path, csv_path, anomaly_threshold=2)
+        with open(csv_path, encoding="utf-8") as f:
+            rows = f.read().splitlines()
+        self.assertEqual(len(rows) - 1, len(self._expected()))
+
+    def test_severity_keywords_from_config(self):
+        tmp = Path(self.tmp.name)
+        log = tmp / "app.log"
+        log.write_text(
+            "[2025-11-10 09:00:01] [NOTICE] [disk] EVT1: Disk full on /var\n"
+            "[2025-11-10 09:00:02] [NOTICE] [api] EVT2: Request throttled\n"
+            "[2025-11-10 09:00:03] [NOTICE] [api] EVT3: Request served\n",
+            encoding="utf-8",
+        )
+        settings = tmp / "settings.json"
+        settings.write_text(json.dumps({
+            "log_file": str(log),
+            "output": {"json": str(tmp / "results.json")},
+            "anomaly_threshold": 99,
+            "severity_keywords": {"critical": ["disk full"], "warning": ["throttled"]},
+        }), encoding="utf-8")
+        self.assertEqual(run_log_detection(load_settings(settings)), 3)
+        with open(tmp / "results.json", encoding="utf-8") as f:
+            issues = json.load(f)
+        self.assertEqual([i["severity"] for i in issues], ["critical", "warning", "info"])
+
+    def test_output_options_from_config(self):
+        tmp = Path(self.tmp.name)
+        settings = tmp / "settings.json"
+        settings.write_text(json.dumps({
+            "log_file": str(SAMPLE_LOG),
+            "anomaly_threshold": 2,
+            "output": {
+                "json": str(tmp / "results.ndjson"),
+                "format": "ndjson",
+                "compress": True,
+                "export": {"output_dir": str(tmp / "exports"), "export_filename": "issues.json", "export_csv": True},
+            },
+        }), encoding="utf-8")
+        count = run_log_detection(load_settings(settings))
+        with gzip.open(tmp / "results.ndjson.gz", "rt", encoding="utf-8") as f:
+            issues = [json.loads(line) for line in f]
+        self.assertEqual(len(issues), count)
+        self.assertEqual(issues, self._expected())
+        with open(tmp / "exports" / "issues.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), issues)
+        with open(tmp / "exports" / "issues.csv", newline="", encoding="utf-8") as f:
+            self.assertEqual(len(list(csv.DictReader(f))), count)
+
+if __name__ == "__main__":
+    unittest.main()
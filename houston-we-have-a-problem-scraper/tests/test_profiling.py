@@ -0,0 +1,32 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.utils.profiling import Profiler
+
+def _busy(n):
+    return sorted(str(i) * 3 for i in range(n))
+
+class TestProfiler(unittest.TestCase):
+    def test_stages_and_outputs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "prof"
+            profiler = Profiler(out, top_n=5, base=Path(__file__).parent.parent).start()
+            kept = _busy(20000)
+            profiler.stage("ingest")
+            _busy(5000)
+            profiler.stage("report")
+            self.assertEqual(profiler.stop(), out)
+
+            self.assertEqual(sorted(p.name for p in out.iterdir()),
+                             ["hot_functions.json", "hot_functions.txt", "memory.json", "profile.pstats"])
+            memory = json.loads((out / "memory.json").read_text(encoding="utf-8"))
+            self.assertEqual([s["stage"] for s in memory], ["ingest", "report"])
+            self.assertGreater(memory[0]["peak_bytes"], 20000 * 3)
+            self.assertTrue(any(s["site"].startswith("tests/test_profiling.py:") for s in memory[0]["growth_sites"]))
+            hot = json.loads((out / "hot_functions.json").read_text(encoding="utf-8"))
+            self.assertTrue(any("tests/test_profiling.py" in r["function"] and "_busy" in r["function"] for r in hot["cumulative"]))
+            self.assertEqual(len(kept), 20000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.analyzers.trend_reporter import rollup_trends, write_trend_csv
+from src.logger.rollups import RollupStore
+from src.logger.storage import Storage
+
+def _event(ts, severity):
+    return {
+        "timestamp": ts, "severity": severity, "errorType": "E", "message": "m",
+        "sourceFile": "a.py", "lineNumber": 1, "environment": "dev", "device": "d",
+        "resolved": False, "stackTrace": "",
+    }
+
+class TestRollups(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.csv = self.dir / "history.csv"
+        self.rollup_path = self.dir / "rollups.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _storage(self, **kwargs):
+        return Storage(self.csv, rollups=RollupStore(self.rollup_path, **kwargs))
+
+    def test_incremental_counts_survive_reopen(self):
+        storage = self._storage(hour_retention_days=100000)
+        storage.write_event(_event("2025-11-10T16:05:12Z", "error"))
+        storage.write_event(_event("2025-11-10T16:59:00Z", "error"))
+        storage.write_event(_event("2025-11-11T01:00:00Z", "critical"))
+        storage.flush()
+
+        reopened = self._storage(hour_retention_days=100000)
+        self.assertEqual(
+            rollup_trends(reopened.rollups),
+            [
+                {"date": "2025-11-10", "severity": "error", "count": 2},
+                {"date": "2025-11-11", "severity": "critical", "count": 1},
+            ],
+        )
+        self.assertEqual(reopened.rollups.counts["hour"]["2025-11-10T16"], {"error": 2})
+        reopened.flush()
+        self.assertNotIn("2025-11-10T16:05", reopened.rollups.counts["minute"])  # past retention
+
+    def test_unflushed_rows_are_recovered_once(self):
+        storage = self._storage()
+        storage.write_event(_event("2025-11-10T16:05:12Z", "error"))
+        storage.flush()
+        storage.write_event(_event("2025-11-10T17:00:00Z", "warning"))  # never flushed
+
+        for _ in range(2):
+            reopened = self._storage()
+            reopened.flush()
+        self.assertEqual(reopened.rollups.counts["day"]["2025-11-10"], {"error": 1, "warning": 1})
+
+    def test_trend_csv_is_replaced(self):
+        path = self.dir / "trends.csv"
+        rows = [{"date": "2025-11-10", "severity": "error", "count": 2}]
+        write_trend_csv(path, rows)
+        write_trend_csv(path, rows)
+        self.assertEqual(path.read_text().splitlines(), ["date,severity,count", "2025-11-10,error,2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,5 +15,22 @@ class TestValidationRules(unittest.TestCase):
         issues = self.rules.check(data)
         self.assertTrue(any("forbidden" in i["errorMessage"] for i in issues))
 
+    def test_words_are_literal_and_report_positions(self):
+        rules = ValidationRules({"rules": {"forbidden_words": ["a.c", "Not Found", "found"]}})
+        issues = rules.check({"title": "t", "content": "abc page not found; a.c"})
+        by_word = {i["errorMessage"]: i["context"] for i in issues}
+        self.assertEqual(
+            set(by_word),
+            {"Found forbidden word: a.c", "Found forbidden word: Not Found", "Found forbidden word: found"},
+        )
+        self.assertEqual(by_word["Found forbidden word: a.c"]["positions"], [(20, 23)])
+        self.assertEqual(by_word["Found forbidden word: found"]["positions"], [(13, 18)])
+
+    def test_regex_rules(self):
+        rules = ValidationRules({"rules": {"forbidden_patterns": [r"err\d+"]}})
+        issues = rules.check({"title": "t", "content": "ERR42 and err7"})
+        self.assertEqual(issues[0]["context"]["matches"], 2)
+        self.assertEqual(issues[0]["context"]["positions"], [(0, 5), (10, 14)])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from pathlib import Path
+from src.analyzers.pattern_detector import severity_breakdown
+from src.logger.handler import ErrorHandler
+from src.logger.rollups import RollupStore
+from src.logger.sampler import AdaptiveSampler
+from src.logger.storage import Storage
+
+def _event(severity, i=0):
+    return {
+        "timestamp": "2025-11-10T16:05:00Z", "severity": severity, "errorType": "E",
+        "message": f"m {i}", "sourceFile": "a.py", "lineNumber": 1, "environment": "dev",
+        "device": "d", "resolved": False, "stackTrace": "",
+    }
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestAdaptiveSampler(unittest.TestCase):
+    def test_floods_are_thinned_to_budget_with_exact_weights(self):
+        clock = _Clock()
+        sampler = AdaptiveSampler({"info": 100}, window_seconds=1.0, clock=clock)
+        kept = []
+        for second in range(5):
+            for i in range(1000):
+                clock.now = second + i / 1000
+                kept.append(sampler.offer(_event("info", i)))
+                kept.append(sampler.offer(_event("critical", i)) if i % 100 == 0 else None)
+        kept = [e for e in kept if e is not None] + sampler.flush()
+
+        info = [e for e in kept if e["severity"] == "info"]
+        self.assertAlmostEqual(sampler.keep_ratio("info"), 0.1, places=2)
+        # First window unsampled, then ~100/s.
+        self.assertLess(len(info), 1000 + 4 * 150)
+        self.assertEqual(sum(e.get("occurrences", 1) for e in info), 5000)
+        self.assertEqual(len([e for e in kept if e["severity"] == "critical"]), 50)
+        self.assertEqual(sampler.seen, {"info": 5000, "critical": 50})
+
+    def test_under_budget_keeps_everything(self):
+        clock = _Clock()
+        sampler = AdaptiveSampler({"info": 100}, clock=clock)
+        for i in range(300):
+            clock.now = i / 50
+            self.assertIsNotNone(sampler.offer(_event("info", i)))
+        self.assertEqual(sampler.flush(), [])
+
+class TestHandlerSampling(unittest.TestCase):
+    def test_true_volume_reaches_thresholds_and_trends(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            clock = _Clock()
+            storage = Storage(tmp / "history.csv", rollups=RollupStore(tmp / "rollups.json", hour_retention_days=100000))
+            handler = ErrorHandler(
+                storage, thresholds={"info": 1000},
+                sampler=AdaptiveSampler({"info": 10}, window_seconds=1.0, clock=clock),
+            )
+            alerts = []
+            handler._emit_alert = lambda severity, ev: alerts.append(severity)
+            for i in range(3000):
+                clock.now = i / 1000
+                handler.ingest(_event("info", i))
+            handler.flush()
+
+            self.assertEqual(alerts, ["info"] * 3)
+            rows = storage.read_recent(3000)
+            self.assertLess(len(rows), 1100)
+            self.assertEqual(severity_breakdown(rows), {"info": 3000})
+            self.assertEqual(storage.rollups.rows("day"), [{"date": "2025-11-10", "severity": "info", "count": 3000}])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import socket
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from src.logger import server as server_module
+from src.logger.dedup import Deduplicator
+from src.logger.handler import ErrorHandler
+from src.logger.server import IngestServer, decode_events
+from src.logger.storage import Storage
+
+def _event(message):
+    return {
+        "timestamp": "2025-11-10T16:05:12Z", "errorType": "E", "message": message,
+        "stackTrace": "", "severity": "error", "sourceFile": "a.py", "lineNumber": 1,
+        "environment": "dev", "device": "d", "resolved": False,
+    }
+
+async def _post(port, body, headers=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"POST /events HTTP/1.1\r\nHost: x\r\nConnection: close\r\n{headers}"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+class TestIngestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / "history.csv"
+        self.handler = ErrorHandler(Storage(self.csv))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bad_event_only_rejects_itself(self):
+        numeric = dict(_event("epoch"), timestamp=1731254712)
+        body = "\n".join(json.dumps(e) for e in (_event("one"), numeric, _event("two"))).encode()
+        events, errors = decode_events(body)
+        self.assertEqual([e["message"] for e in events], ["one", "two"])
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("event 1:"))
+
+    def test_http_single_and_ndjson_batch(self):
+        async def scenario():
+            server = IngestServer(self.handler, port=0, tcp_port=0, max_body_bytes=4096)
+            await server.start()
+            port = server.ports["http"]
+            single = await _post(port, json.dumps(_event("one")).encode())
+            ndjson = "\n".join(json.dumps(_event(f"batch {i}")) for i in range(3))
+            batch = await _post(port, (ndjson + "\n{broken").encode())
+            invalid = await _post(port, b'{"message": "no fields"}')
+            too_big = await _post(port, b"x" * 5000)
+
+            _, writer = await asyncio.open_connection("127.0.0.1", server.ports["tcp"])
+            writer.write((json.dumps(_event("tcp")) + "\n").encode())
+            await writer.drain()
+            writer.close()
+            await asyncio.sleep(0.1)
+            await server.stop()
+            return single, batch, invalid, too_big, server.stats
+
+        single, batch, invalid, too_big, stats = asyncio.run(scenario())
+        self.assertEqual(single, (202, {"accepted": 1, "rejected": 0, "errors": []}))
+        self.assertEqual(batch[0], 202)
+        self.assertEqual((batch[1]["accepted"], batch[1]["rejected"]), (3, 1))
+        self.assertEqual(invalid[0], 400)
+        self.assertEqual(too_big[0], 413)
+        self.assertEqual(stats["written"], 5)
+
+        messages = [r["message"] for r in self.handler.storage.read_recent(10)]
+        self.assertEqual(messages, ["one", "batch 0", "batch 1", "batch 2", "tcp"])
+
+    def test_non_utf8_line_only_rejects_itself(self):
+        async def scenario():
+            server = IngestServer(self.handler, port=0, tcp_port=0)
+            await server.start()
+            _, writer = await asyncio.open_connection("127.0.0.1", server.ports["tcp"])
+            writer.write(
+                (json.dumps(_event("before")) + "\n").encode() + b"\xff\xfe bad\n"
+                + (json.dumps(_event("after")) + "\n").encode()
+            )
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            writer.write((json.dumps(_event("later")) + "\n").encode())
+            await writer.drain()
+            writer.close()
+            await asyncio.sleep(0.1)
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.ports["http"])
+            writer.write(b"POST /events HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n")
+            await writer.drain()
+            negative = await reader.read()
+            writer.close()
+            await server.stop()
+            return negative, server.stats
+
+        negative, stats = asyncio.run(scenario())
+        self.assertTrue(negative.startswith(b"HTTP/1.1 400"))
+        self.assertEqual(stats["rejected"], 1)
+        messages = [r["message"] for r in self.handler.storage.read_recent(10)]
+        self.assertEqual(messages, ["before", "after", "later"])
+
+    def test_idle_writer_stores_expired_rows(self):
+        handler = ErrorHandler(Storage(self.csv), dedup=Deduplicator(window_seconds=0.05))
+
+        async def scenario():
+            server = IngestServer(handler, port=0)
+            await server.start()
+            body = "\n".join(json.dumps(_event("same")) for _ in range(3)).encode()
+            await _post(server.ports["http"], body)
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                rows = await asyncio.get_running_loop().run_in_executor(server._pool, handler.storage.read_recent, 10)
+                if rows:
+                    break
+            await server.stop()
+            return rows
+
+        with mock.patch.object(server_module, "IDLE_SECONDS", 0.02):
+            rows = asyncio.run(scenario())
+        self.assertEqual([(r["message"], r["occurrences"]) for r in rows], [("same", "3")])
+
+    def test_udp_drops_when_queue_full(self):
+        async def scenario():
+            server = IngestServer(self.handler, port=0, udp_port=0, queue_batches=1)
+            await server.start()
+            # Occupy the single writer thread so the queue cannot drain.
+            gate = asyncio.Event()
+            server._pool.submit(lambda: asyncio.run_coroutine_threadsafe(gate.wait(), loop).result())
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            for i in range(5):
+                sock.sendto(json.dumps(_event(f"udp {i}")).encode(), ("127.0.0.1", server.ports["udp"]))
+            sock.close()
+            await asyncio.sleep(0.1)
+            gate.set()
+            await server.stop()
+            return server.stats
+
+        loop = asyncio.new_event_loop()
+        try:
+            stats = loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+        self.assertEqual(stats["accepted"] + stats["dropped"], 5)
+        self.assertGreater(stats["dropped"], 0)
+        self.assertEqual(stats["written"], stats["accepted"])
+
+if __name__ == "__main__":
+    unittest.main()
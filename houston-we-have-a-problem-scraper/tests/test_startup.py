@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import sys
+import src.main as m
+m.build_handler(m.load_settings(m.Path(sys.argv[1])))
+print(" ".join(sys.modules))
+"""
+
+class TestLazyStartup(unittest.TestCase):
+    def test_disabled_plugins_are_not_imported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = json.loads((ROOT_DIR / "src" / "config" / "settings.json").read_text())
+            cfg.update(archive_csv=f"{tmp}/history.csv", jsonl_path=f"{tmp}/errors.jsonl")
+            cfg["rollups"]["path"] = f"{tmp}/rollups.json"
+            config = Path(tmp) / "settings.json"
+            config.write_text(json.dumps(cfg))
+            out = subprocess.run(
+                [sys.executable, "-c", PROBE, str(config)],
+                cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+            ).stdout.split()
+        for module in ("requests", "smtplib", "dateutil", "src.analyzers.pattern_detector", "src.detectors.pipeline", "src.logger.server", "src.utils.profiling"):
+            self.assertNotIn(module, out)
+
+if __name__ == "__main__":
+    unittest.main()
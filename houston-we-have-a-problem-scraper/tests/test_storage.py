@@ -0,0 +1,67 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+from src.logger.rollups import RollupStore
+from src.logger.storage import BASE_COLUMNS, CSV_HEADER, Storage
+
+def _event(i):
+    return {
+        "timestamp": f"2025-11-10T16:05:{i % 60:02d}Z", "severity": "error", "errorType": "E",
+        "message": f"failed job {i} " + "x" * (i * 37 % 300), "sourceFile": "a.py", "lineNumber": i,
+        "environment": "dev", "device": "d", "resolved": False, "stackTrace": "",
+    }
+
+class TestReadRecent(unittest.TestCase):
+    def test_tail_never_returns_a_cut_row(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = Storage(Path(tmp) / "history.csv")
+            storage.write_many([_event(i) for i in range(500)])
+            for limit in range(1, 60):
+                rows = storage.read_recent(limit)
+                self.assertEqual([int(r["lineNumber"]) for r in rows], list(range(500 - limit, 500)))
+                self.assertTrue(all(len(r) == len(CSV_HEADER) for r in rows))
+
+class TestOldArchive(unittest.TestCase):
+    def test_pre_dedup_header_is_upgraded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "history.csv"
+            rollups_path = Path(tmp) / "rollups.json"
+            storage = Storage(csv_path, rollups=RollupStore(rollups_path))
+            storage.write_many([_event(i) for i in range(3)])
+            storage.flush()
+            # Rewrite as an archive from before dedup: 10-column header and rows.
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                rows = [r[:BASE_COLUMNS] for r in csv.reader(f)]
+            with open(csv_path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows(rows)
+            old = RollupStore(rollups_path)
+            old.flush(watermark=csv_path.stat().st_size)
+
+            storage = Storage(csv_path, rollups=RollupStore(rollups_path))
+            storage.write_many([_event(3)])
+            storage.flush()
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                records = list(csv.DictReader(f))
+            self.assertEqual(len(records), 4)
+            self.assertTrue(all(None not in r for r in records))
+            self.assertEqual([r["occurrences"] for r in records], [None, None, None, "1"])
+            self.assertEqual(RollupStore(rollups_path).rows("day"), [{"date": "2025-11-10", "severity": "error", "count": 4}])
+            self.assertEqual(len(storage.read_recent(10)), 4)
+            # Already upgraded: opening again leaves the file alone.
+            size = csv_path.stat().st_size
+            Storage(csv_path)
+            self.assertEqual(csv_path.stat().st_size, size)
+
+    def test_bare_pre_dedup_header(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "history.csv"
+            csv_path.write_text(",".join(CSV_HEADER[:BASE_COLUMNS]), encoding="utf-8")
+            storage = Storage(csv_path)
+            storage.write_many([_event(0)])
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                records = list(csv.DictReader(f))
+            self.assertEqual([r["lineNumber"] for r in records], ["0"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import csv
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.outputs.issue_exporter import IssueExporter
+from src.outputs.report_generator import REPORT_FIELDS, generate_report
+from src.outputs.stream_writer import StreamWriter
+
+def _issues(n):
+    for i in range(n):
+        yield {"timestamp": f"2025-11-10T16:05:{i % 60:02d}Z", "source": "svc", "errorCode": f"E{i}",
+               "errorMessage": f"failure {i}", "severity": "error", "occurrences": 1, "is_anomaly": False}
+
+class TestStreamWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_matches_json_dump_and_csv_from_same_pass(self):
+        json_path, csv_path = self.dir / "r.json", self.dir / "r.csv"
+        self.assertEqual(generate_report(_issues(3), json_path, csv_path), 3)
+        self.assertEqual(json_path.read_text(encoding="utf-8"), json.dumps(list(_issues(3)), indent=2))
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            self.assertEqual([r["errorCode"] for r in csv.DictReader(f)], ["E0", "E1", "E2"])
+        generate_report(iter(()), json_path)
+        self.assertEqual(json.loads(json_path.read_text()), [])
+
+    def test_split_parts_are_each_valid_and_compressed(self):
+        path = self.dir / "r.ndjson"
+        with StreamWriter(path, "ndjson", compress=True, max_bytes=300) as out:
+            for issue in _issues(10):
+                out.write(issue)
+        parts = sorted(self.dir.glob("r.*.ndjson.gz"))
+        self.assertGreater(len(parts), 1)
+        rows = [json.loads(line) for p in parts for line in gzip.open(p, "rt", encoding="utf-8")]
+        self.assertEqual(rows, list(_issues(10)))
+
+        # A later export that fits in one part replaces the numbered parts.
+        StreamWriter(path, "ndjson", compress=True, max_bytes=300).close()
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["r.ndjson.gz"])
+
+    def test_max_bytes_counts_utf8_bytes(self):
+        path = self.dir / "r.ndjson"
+        with StreamWriter(path, "ndjson", max_bytes=300) as out:
+            for i in range(6):
+                out.write({"message": "\u00e9" * 100, "i": i})
+        for part in sorted(self.dir.glob("r.*.ndjson")):
+            lines = part.read_bytes().splitlines(keepends=True)
+            # A part rolls over once it holds max_bytes, so only its last record may cross it.
+            self.assertLess(sum(len(line) for line in lines[:-1]), 300)
+
+    def test_failed_export_keeps_previous_file(self):
+        json_path = self.dir / "r.json"
+        generate_report(_issues(2), json_path)
+        before = json_path.read_text()
+
+        def broken():
+            yield from _issues(5)
+            raise RuntimeError("source failed")
+
+        with self.assertRaises(RuntimeError):
+            generate_report(broken(), json_path)
+        self.assertEqual(json_path.read_text(), before)
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["r.json"])
+
+    def test_issue_exporter_streams_json_and_csv(self):
+        exporter = IssueExporter({"output_dir": str(self.dir), "export_csv": True, "export_max_bytes": 400})
+        written = exporter.export(_issues(12))
+        json_parts = [p for p in written if p.suffix == ".json"]
+        self.assertGreater(len(json_parts), 1)
+        issues = [i for p in json_parts for i in json.loads(p.read_text())]
+        self.assertEqual(issues, list(_issues(12)))
+        csv_rows = [r for p in written if p.suffix == ".csv" for r in csv.DictReader(open(p, newline=""))]
+        self.assertEqual(len(csv_rows), 12)
+        self.assertEqual(list(csv_rows[0]), REPORT_FIELDS)
+
+if __name__ == "__main__":
+    unittest.main()
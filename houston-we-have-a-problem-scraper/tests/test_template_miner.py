@@ -0,0 +1,34 @@
+import unittest
+from src.analyzers.pattern_detector import top_patterns
+from src.analyzers.template_miner import TemplateMiner, mask_message
+
+class TestTemplateMiner(unittest.TestCase):
+    def test_masking(self):
+        self.assertEqual(
+            mask_message("id=42 from 10.0.0.1:80 ptr 0x1f req 550e8400-e29b-41d4-a716-446655440000 v2"),
+            "id=<NUM> from <IP> ptr <HEX> req <UUID> v2",
+        )
+
+    def test_variable_messages_share_template(self):
+        miner = TemplateMiner()
+        a = miner.add("Payment authorization failed | user_id=456")
+        b = miner.add("Payment authorization failed | user_id=789")
+        c = miner.add("Failed to acquire connection from pool")
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertEqual(miner.template(a), "Payment authorization failed | user_id=<NUM>")
+
+    def test_bounded_clusters(self):
+        miner = TemplateMiner(max_clusters=5, max_examples=2)
+        for i in range(50):
+            miner.add(f"unique{chr(65 + i % 26)}{chr(65 + i // 26)} event")
+        self.assertEqual(len(miner), 5)
+        self.assertTrue(all(len(t["examples"]) <= 2 for t in miner.top(5)))
+
+    def test_top_patterns_groups_by_template(self):
+        events = [{"errorType": "E", "message": f"timeout after {i} ms", "sourceFile": "a.py", "lineNumber": 1} for i in range(10)]
+        patterns = top_patterns(events)
+        self.assertEqual(patterns["message"], [("timeout after <NUM> ms", 10)])
+
+if __name__ == "__main__":
+    unittest.main()
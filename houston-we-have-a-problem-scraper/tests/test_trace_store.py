@@ -0,0 +1,87 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.logger.columnar import ColumnarStorage
+from src.logger.storage import Storage
+from src.logger.trace_store import TraceStore, is_trace_ref
+
+TRACE = "Traceback (most recent call last):\n" + "".join(f'  File "app/jobs.py", line {i}, in run\n' for i in range(40))
+
+def _event(i, trace=TRACE):
+    return {
+        "timestamp": f"2025-11-10T16:05:{i % 60:02d}Z", "severity": "error", "errorType": "E",
+        "message": f"failed {i}", "sourceFile": "a.py", "lineNumber": i, "environment": "dev",
+        "device": "d", "resolved": False, "stackTrace": trace,
+    }
+
+class TestTraceStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_is_content_addressed_and_compressed(self):
+        store = TraceStore(self.dir / "traces.pack")
+        ref = store.put(TRACE)
+        self.assertTrue(is_trace_ref(ref))
+        self.assertEqual(store.put(TRACE), ref)
+        self.assertEqual(store.put(""), "")
+        self.assertEqual(store.stats["stored"], 1)
+        self.assertLess(store.stats["bytes_stored"], store.stats["bytes_in"] / 3)
+        store.close()
+
+        reopened = TraceStore(self.dir / "traces.pack")
+        self.assertEqual(reopened.get(ref), TRACE)
+        self.assertEqual(reopened.get("raw trace from an old row"), "raw trace from an old row")
+
+    def test_reference_like_traces_are_stored(self):
+        store = TraceStore(self.dir / "traces.pack")
+        for value in ("trace:not-hex", "trace:" + "ab" * 16):
+            ref = store.put(value)
+            self.assertNotEqual(ref, value)
+            self.assertEqual(store.get(ref), value)
+        self.assertEqual(store.get("trace:not-hex"), "trace:not-hex")
+        with self.assertLogs("src.logger.trace_store", "WARNING"):
+            self.assertEqual(store.get("trace:" + "cd" * 16), "trace:" + "cd" * 16)
+
+        storage = Storage(self.dir / "history.csv", traces=store)
+        storage.write_event(_event(1, trace="trace:" + "ef" * 16))
+        row = storage.read_recent(1)[0]
+        self.assertEqual(storage.stack_trace(row), "trace:" + "ef" * 16)
+
+    def test_torn_tail_is_cut_before_next_write(self):
+        path = self.dir / "traces.pack"
+        store = TraceStore(path)
+        first = store.put("first trace")
+        store.put("second trace")
+        store.close()
+        path.write_bytes(path.read_bytes()[:-3])
+
+        store = TraceStore(path)
+        third = store.put("third trace")
+        store.close()
+        reopened = TraceStore(path)
+        self.assertEqual([reopened.get(first), reopened.get(third)], ["first trace", "third trace"])
+        self.assertEqual(len(reopened.index), 2)
+
+    def test_storage_rows_reference_traces(self):
+        for cls in (Storage, ColumnarStorage):
+            with self.subTest(backend=cls.__name__):
+                base = self.dir / cls.__name__
+                storage = cls(base / "history.csv", jsonl_path=base / "events.jsonl", traces=TraceStore(base / "traces.pack"))
+                storage.write_many([_event(i) for i in range(20)])
+                storage.write_event(_event(20, trace=""))
+                storage.flush()
+                rows = storage.read_recent(5)
+                self.assertTrue(all(is_trace_ref(r["stackTrace"]) for r in rows[:-1]))
+                self.assertEqual(rows[-1]["stackTrace"], "")
+                self.assertEqual(storage.stack_trace(rows[0]), TRACE)
+                self.assertLess(storage.archive_path.stat().st_size, len(TRACE) * 2)
+                lines = (base / "events.jsonl").read_text(encoding="utf-8").splitlines()
+                self.assertTrue(is_trace_ref(json.loads(lines[0])["stackTrace"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
+import argparse
 import json
 import logging
 import sys
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 # Ensure the src directory is on sys.path so implicit namespace packages work
 CURRENT_FILE = Path(__file__).resolve()
@@ -40,13 +41,21 @@ def load_config(path: Path) -> Dict[str, Any]:
     logging.info("Configuration loaded from %s", path)
     return config
 
-def run_pipeline(config: Dict[str, Any], data_path: Path) -> Path:
+def _no_stage(name: str) -> None:
+    """Stage marker used when profiling is off."""
+
+def run_pipeline(
+    config: Dict[str, Any],
+    data_path: Path,
+    on_stage: Callable[[str], None] = _no_stage,
+) -> Path:
     logger = logging.getLogger("pipeline")
 
     # 1. Ingest telemetry data
     logger.info("Reading telemetry data from %s", data_path)
     raw_events = read_telemetry_file(data_path)
     logger.info("Loaded %d raw telemetry records", len(raw_events))
+    on_stage("read")
 
     if not raw_events:
         logger.warning("No telemetry records found. Exiting.")
@@ -56,10 +65,12 @@ def run_pipeline(config: Dict[str, Any], data_path: Path) -> Path:
     logger.info("Parsing and normalizing telemetry events")
     parsed_events: List[ErrorEvent] = parse_events(raw_events, config)
     logger.info("Parsed %d events successfully", len(parsed_events))
+    on_stage("parse")
 
     # 3. Aggregate and analyze patterns
     logger.info("Aggregating error statistics")
     summary = aggregate_events(parsed_events)
+    on_stage("aggregate")
 
     # 4. Generate report
     output_dir = PROJECT_ROOT / "data"
@@ -72,6 +83,7 @@ def run_pipeline(config: Dict[str, Any], data_path: Path) -> Path:
     with normalized_path.open("w", encoding="utf-8") as f:
         json.dump([asdict(e) for e in parsed_events], f, default=str, indent=2)
     logger.info("Normalized events written to %s", normalized_path)
+    on_stage("report")
 
     # 6. Evaluate alerting thresholds
     alerting_cfg = config.get("alerting", {})
@@ -104,4 +116,47 @@ def main(argv: List[str] | None = None) -> int:
         config = load_config(CONFIG_PATH)
     except Exception as exc:
         logger.exception("Failed to load configuration: %s", exc)
-        return 1
\ No newline at end of file
+        return 1
+
+    args = parse_args(argv)
+    data_path = Path(args.data) if args.data else PROJECT_ROOT / config.get("ingestion", {}).get("source", DEFAULT_DATA_PATH)
+
+    profiler = None
+    if args.profile:
+        from profiling import PipelineProfiler  # type: ignore
+
+        profiler = PipelineProfiler(args.profile, PROJECT_ROOT, top_n=args.profile_top).start()
+
+    try:
+        report_path = run_pipeline(config, data_path, profiler.stage if profiler else _no_stage)
+    except Exception as exc:
+        logger.exception("Pipeline failed: %s", exc)
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.finish()
+
+    logger.info("Report written to %s", report_path)
+    return 0
+
+def _project_path(value: str) -> Path:
+    """Resolve a relative command-line path against PROJECT_ROOT, like the other data paths."""
+    path = Path(value)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Houston telemetry error report")
+    parser.add_argument("--data", help="Telemetry file to read (default: ingestion.source from the config)")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=_project_path,
+        const=PROJECT_ROOT / "data" / "profile",
+        metavar="DIR",
+        help="Profile the run (cProfile + tracemalloc per stage) and write the results to DIR",
+    )
+    parser.add_argument("--profile-top", type=int, default=25, help="Entries listed per profile section")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    sys.exit(main())
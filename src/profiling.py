@@ -0,0 +1,117 @@
+import cProfile
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("profiling")
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+class PipelineProfiler:
+    """
+    Profiles one pipeline run with cProfile and tracemalloc.
+
+    Call `stage(name)` at each stage boundary (read, parse, aggregate,
+    report) and `finish()` at the end. Written to `out_dir`, under fixed
+    names so two runs can be diffed: profile.pstats, hot_functions.json
+    and hot_functions.txt (top `top_n` by own and cumulative time), and
+    memory.json (per stage: seconds, current/peak traced bytes, largest
+    allocation sites and the sites that grew most during the stage).
+    Paths are shown relative to `root` where possible.
+    """
+
+    def __init__(self, out_dir: Path, root: Path, top_n: int = 25) -> None:
+        self.out_dir = out_dir
+        self.root = root.resolve()
+        self.top_n = top_n
+        self.stages: List[Dict[str, Any]] = []
+        self._profile = cProfile.Profile()
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._mark = 0.0
+
+    def _relative(self, path: str) -> str:
+        try:
+            return str(Path(path).resolve().relative_to(self.root))
+        except ValueError:
+            return path
+
+    def start(self) -> "PipelineProfiler":
+        tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        self._mark = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def stage(self, name: str) -> None:
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._mark
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+        def site(stat: Any) -> str:
+            frame = stat.traceback[0]
+            return f"{self._relative(frame.filename)}:{frame.lineno}"
+
+        self.stages.append(
+            {
+                "stage": name,
+                "seconds": round(elapsed, 6),
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_sites": [
+                    {"site": site(s), "bytes": s.size, "blocks": s.count}
+                    for s in snapshot.statistics("lineno")[: self.top_n]
+                ],
+                "growth_sites": [
+                    {"site": site(s), "bytes": s.size_diff, "blocks": s.count_diff}
+                    for s in snapshot.compare_to(self._snapshot, "lineno")[: self.top_n]
+                    if s.size_diff > 0
+                ],
+            }
+        )
+        logger.info("Stage %s: %.3fs, peak %.1f KiB traced", name, elapsed, peak / 1024)
+        self._snapshot = snapshot
+        tracemalloc.reset_peak()
+        self._mark = time.perf_counter()
+        self._profile.enable()
+
+    def finish(self) -> Path:
+        self._profile.disable()
+        tracemalloc.stop()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._profile.dump_stats(str(self.out_dir / "profile.pstats"))
+
+        rows = [
+            {
+                "function": f"{self._relative(path)}:{line}({func})",
+                "calls": calls,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+            for (path, line, func), (_, calls, own, cumulative, _) in pstats.Stats(self._profile).stats.items()
+        ]
+        hot = {
+            "own": sorted(rows, key=lambda r: (-r["own_seconds"], r["function"]))[: self.top_n],
+            "cumulative": sorted(rows, key=lambda r: (-r["cumulative_seconds"], r["function"]))[: self.top_n],
+        }
+        with (self.out_dir / "hot_functions.json").open("w", encoding="utf-8") as f:
+            json.dump(hot, f, indent=2)
+        with (self.out_dir / "hot_functions.txt").open("w", encoding="utf-8") as f:
+            for title, key in (("By own time", "own_seconds"), ("By cumulative time", "cumulative_seconds")):
+                f.write(f"{title}:\n")
+                for r in hot["own" if key == "own_seconds" else "cumulative"]:
+                    f.write(f"  {r[key]:10.4f}s {r['calls']:>9} {r['function']}\n")
+                f.write("\n")
+        with (self.out_dir / "memory.json").open("w", encoding="utf-8") as f:
+            json.dump(self.stages, f, indent=2)
+        logger.info("Profile written to %s", self.out_dir)
+        return self.out_dir
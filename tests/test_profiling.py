@@ -0,0 +1,43 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from main import PROJECT_ROOT, parse_args  # noqa: E402
+from profiling import PipelineProfiler  # noqa: E402
+
+def _busy(n):
+    return sorted(str(i) * 3 for i in range(n))
+
+class TestPipelineProfiler(unittest.TestCase):
+    def test_stages_and_outputs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "prof"
+            profiler = PipelineProfiler(out, Path(__file__).parent.parent, top_n=5).start()
+            kept = _busy(20000)
+            profiler.stage("parse")
+            _busy(5000)
+            profiler.stage("report")
+            self.assertEqual(profiler.finish(), out)
+
+            self.assertEqual(sorted(p.name for p in out.iterdir()),
+                             ["hot_functions.json", "hot_functions.txt", "memory.json", "profile.pstats"])
+            memory = json.loads((out / "memory.json").read_text(encoding="utf-8"))
+            self.assertEqual([s["stage"] for s in memory], ["parse", "report"])
+            self.assertGreater(memory[0]["peak_bytes"], 20000 * 3)
+            self.assertTrue(any(s["site"].startswith("tests/test_profiling.py:") for s in memory[0]["growth_sites"]))
+            hot = json.loads((out / "hot_functions.json").read_text(encoding="utf-8"))
+            self.assertTrue(any("tests/test_profiling.py" in r["function"] and "_busy" in r["function"] for r in hot["cumulative"]))
+            self.assertEqual(len(kept), 20000)
+
+    def test_profile_dir_resolves_against_project_root(self):
+        self.assertEqual(parse_args(["--profile", "out/prof"]).profile, PROJECT_ROOT / "out" / "prof")
+        self.assertEqual(parse_args(["--profile"]).profile, PROJECT_ROOT / "data" / "profile")
+        self.assertEqual(parse_args(["--profile", "/tmp/prof"]).profile, Path("/tmp/prof"))
+        self.assertIsNone(parse_args([]).profile)
+
+if __name__ == "__main__":
+    unittest.main()